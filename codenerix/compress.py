@@ -0,0 +1,249 @@
+#
+# django-codenerix
+#
+# Codenerix GNU
+#
+# Project URL : http://www.codenerix.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compression of the JSON answers and exports of the Gen* views
+
+    CODENERIX_COMPRESS = True                           # Default for the views ('compress' attribute)
+    CODENERIX_COMPRESS_LEVEL = {"gzip": 6, "br": 4}     # Level for every encoding or by encoding ('compress_level')
+    CODENERIX_COMPRESS_MIN_SIZE = 1024                  # Smaller answers are sent as they are ('compress_min_size')
+    CODENERIX_COMPRESS_ENCODINGS = ["zstd", "br", "gzip"]   # Encodings offered, preferred first
+
+The encoding is negotiated with the Accept-Encoding header of the request,
+"br" needs the 'brotli' package and "zstd" the 'zstandard' one (or Python
+3.14), encodings whose library is missing are not offered. Streaming
+answers are compressed as they go, every chunk is flushed so the client
+gets it right away.
+"""
+
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # type: ignore
+
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None  # type: ignore
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore
+
+# Content types worth compressing (xlsx files are zip files already)
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/jsonl",
+    "application/bson",
+    "text/csv",
+)
+
+
+class GzipCompressor:
+    encoding = "gzip"
+    available = True
+    levels = (1, 9)
+    default_level = 6
+
+    def __init__(self, level):
+        self.__compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data):
+        return self.__compressor.compress(data)
+
+    def flush(self):
+        return self.__compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self.__compressor.flush()
+
+
+class BrotliCompressor:
+    encoding = "br"
+    available = brotli is not None
+    levels = (0, 11)
+    default_level = 4
+
+    def __init__(self, level):
+        self.__compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self.__compressor.process(data)
+
+    def flush(self):
+        return self.__compressor.flush()
+
+    def finish(self):
+        return self.__compressor.finish()
+
+
+class ZstdCompressor:
+    encoding = "zstd"
+    available = zstd is not None or zstandard is not None
+    levels = (1, 19)
+    default_level = 3
+
+    def __init__(self, level):
+        if zstd is not None:
+            self.__compressor = zstd.ZstdCompressor(level=level)
+        else:
+            self.__compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self.__compressor.compress(data)
+
+    def flush(self):
+        if zstd is not None:
+            return self.__compressor.flush(zstd.ZstdCompressor.FLUSH_BLOCK)
+        return self.__compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self.__compressor.flush()
+
+
+COMPRESSORS = {
+    compressor.encoding: compressor
+    for compressor in (GzipCompressor, BrotliCompressor, ZstdCompressor)
+}
+
+
+def get_encodings():
+    """
+    Encodings offered to the clients (their library is installed),
+    preferred first
+    """
+    encodings = getattr(settings, "CODENERIX_COMPRESS_ENCODINGS", ("zstd", "br", "gzip"))
+    return [
+        encoding
+        for encoding in encodings
+        if encoding in COMPRESSORS and COMPRESSORS[encoding].available
+    ]
+
+
+def choose_encoding(accept_encoding, encodings=None):
+    """
+    Return the encoding from 'encodings' (all the available ones by
+    default) the client prefers according to 'accept_encoding' (the value
+    of an Accept-Encoding header), None when it accepts none of them
+    """
+    if encodings is None:
+        encodings = get_encodings()
+
+    # Quality of every encoding in the header
+    qualities = {}
+    for item in accept_encoding.split(","):
+        (coding, _, params) = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        (key, _, value) = params.partition("=")
+        if key.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        qualities[coding] = quality
+
+    # Highest quality wins, the order of 'encodings' breaks the ties
+    best = None
+    best_quality = 0.0
+    for encoding in encodings:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best = encoding
+            best_quality = quality
+    return best
+
+
+def get_compressor(encoding, level=None):
+    """
+    Return a new compressor for 'encoding', 'level' can be a number (fitted
+    into the range of levels of the encoding) or a dictionary by encoding
+    """
+    cls = COMPRESSORS[encoding]
+    if isinstance(level, dict):
+        level = level.get(encoding, None)
+    if level is None:
+        level = cls.default_level
+    (low, high) = cls.levels
+    return cls(min(max(level, low), high))
+
+
+def compress_response(request, response, level=None, min_size=1024):
+    """
+    Compress 'response' with the encoding negotiated with 'request' when it
+    is a JSON answer or an export of 'min_size' bytes or more (streaming
+    answers are always compressed), otherwise it is left as it is
+    """
+    if (
+        response.status_code != 200
+        or response.has_header("Content-Encoding")
+        or not response.get("Content-Type", "").startswith(COMPRESSIBLE_TYPES)
+    ):
+        return response
+    if not response.streaming and len(response.content) < min_size:
+        return response
+
+    # The answer changes with the encodings the client accepts
+    patch_vary_headers(response, ("Accept-Encoding",))
+    encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+    if encoding is None:
+        return response
+
+    compressor = get_compressor(encoding, level)
+    if response.streaming:
+        content = response.streaming_content
+        if response.is_async:
+
+            async def acompressed():
+                async for chunk in content:
+                    yield compressor.compress(chunk) + compressor.flush()
+                yield compressor.finish()
+
+            response.streaming_content = acompressed()
+        else:
+
+            def compressed():
+                for chunk in content:
+                    yield compressor.compress(chunk) + compressor.flush()
+                yield compressor.finish()
+
+            response.streaming_content = compressed()
+        # The compressed size is unknown until everything has been sent
+        del response.headers["Content-Length"]
+    else:
+        content = compressor.compress(response.content) + compressor.finish()
+        if len(content) >= len(response.content):
+            return response
+        response.content = content
+        response.headers["Content-Length"] = str(len(content))
+
+    # The compressed answer is not byte to byte the same, strong ETags become weak
+    etag = response.get("ETag")
+    if etag and etag.startswith('"'):
+        response.headers["ETag"] = "W/" + etag
+    response.headers["Content-Encoding"] = encoding
+    return response
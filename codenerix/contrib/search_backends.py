@@ -0,0 +1,335 @@
+#
+# django-codenerix
+#
+# Codenerix GNU
+#
+# Project URL : http://www.codenerix.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Search backends for GenList free-text search
+
+A GenList with 'search_backend' set delegates the words written by the user
+to one of these backends instead of building 'icontains' Q-objects for every
+word and field:
+
+    class CustomerList(GenList):
+        model = Customer
+        search_backend = "fulltext"     # PostgreSQL or SQLite depending on the database
+        search_fields = ["name", "surname", "email"]
+
+Backends working with an index (PostgreSQL GIN over a SearchVector, SQLite
+FTS5 virtual table) get it built and refreshed with the 'search_index'
+management command.
+"""
+
+import hashlib
+import logging
+import re
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import connections, models
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from codenerix.helpers import qobject_builder_string_search
+
+logger = logging.getLogger(__name__)
+
+SEARCH_BACKENDS = {
+    "icontains": "codenerix.contrib.search_backends.IcontainsSearchBackend",
+    "postgresql": "codenerix.contrib.search_backends.PostgreSQLSearchBackend",
+    "sqlite": "codenerix.contrib.search_backends.SQLiteSearchBackend",
+}
+
+
+def get_search_backend(backend, model, fields, using="default"):
+    """
+    Return an instance of the search backend, 'backend' can be a class, a
+    dotted path to a class, a key from SEARCH_BACKENDS or 'fulltext' (the
+    full-text backend for the database engine, 'icontains' if there is none)
+    """
+    if backend == "fulltext":
+        vendor = connections[using].vendor
+        if vendor in SEARCH_BACKENDS:
+            backend = vendor
+        else:
+            backend = "icontains"
+    if isinstance(backend, str):
+        backend = import_string(SEARCH_BACKENDS.get(backend, backend))
+    return backend(model, fields, using)
+
+
+def search_terms(word):
+    """
+    Split a word written by the user in the terms an index knows about
+    (letters and numbers only, so it is safe to build index queries)
+    """
+    return re.findall(r"\w+", word)
+
+
+class SearchBackend:
+    """
+    Base class for search backends. A backend knows how to filter a queryset
+    of 'model' with the words written by the user searching in 'fields'
+    (a word starting with '-' must not be found). Backends using an index
+    must implement build_index(), refresh_index() and drop_index()
+    """
+
+    # Only local fields can be indexed
+    local_fields = False
+
+    def __init__(self, model, fields, using="default"):
+        self.model = model
+        self.fields = list(fields)
+        self.using = using
+        if not self.fields:
+            raise ImproperlyConfigured(
+                f"Search backend {self.__class__.__name__} for model "
+                f"'{model._meta.label}' requires a list of fields",
+            )
+        if self.local_fields:
+            for name in self.fields:
+                try:
+                    field = model._meta.get_field(name)
+                except FieldDoesNotExist as e:
+                    raise ImproperlyConfigured(
+                        f"Search backend {self.__class__.__name__} can not use field "
+                        f"'{name}' from model '{model._meta.label}' (it is not a local field)",
+                    ) from e
+                if field.is_relation or not field.concrete:
+                    raise ImproperlyConfigured(
+                        f"Search backend {self.__class__.__name__} can not use field "
+                        f"'{name}' from model '{model._meta.label}' (it is not a local column)",
+                    )
+
+    @property
+    def index_name(self):
+        """
+        Name of the index for this model and fields
+        """
+        signature = hashlib.sha1(
+            "|".join(self.fields).encode(),
+            usedforsecurity=False,
+        ).hexdigest()[:8]
+        return f"{self.model._meta.db_table[:40]}_cnxs_{signature}"
+
+    def filter(self, queryset, words):
+        raise NotImplementedError
+
+    def build_index(self):
+        pass
+
+    def refresh_index(self):
+        pass
+
+    def drop_index(self):
+        pass
+
+
+class IcontainsSearchBackend(SearchBackend):
+    """
+    Default behaviour: every word must be found inside any of the fields
+    """
+
+    def filter(self, queryset, words):
+        qobjects = qobject_builder_string_search(self.fields, " ".join(words))
+        if qobjects:
+            queryset = queryset.filter(qobjects)
+        return queryset
+
+
+class PostgreSQLSearchBackend(SearchBackend):
+    """
+    PostgreSQL full-text search with a GIN index over a SearchVector of the
+    fields, every word is looked for as a prefix
+    """
+
+    local_fields = True
+    config = "simple"
+
+    def vector(self):
+        from django.contrib.postgres.search import SearchVector
+
+        return SearchVector(*self.fields, config=self.config)
+
+    def filter(self, queryset, words):
+        from django.contrib.postgres.search import SearchQuery
+
+        tokens = []
+        for word in words:
+            negative = word.startswith("-")
+            terms = [f"{term}:*" for term in search_terms(word)]
+            if terms:
+                query = " & ".join(terms)
+                if negative:
+                    tokens.append(f"!({query})")
+                else:
+                    tokens.append(f"({query})")
+
+        if tokens:
+            queryset = queryset.alias(codenerix_search=self.vector()).filter(
+                codenerix_search=SearchQuery(
+                    " & ".join(tokens),
+                    search_type="raw",
+                    config=self.config,
+                ),
+            )
+        return queryset
+
+    def __exists(self):
+        connection = connections[self.using]
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor,
+                self.model._meta.db_table,
+            )
+        return self.index_name in constraints
+
+    def __index(self):
+        from django.contrib.postgres.indexes import GinIndex
+
+        return GinIndex(self.vector(), name=self.index_name)
+
+    def build_index(self):
+        if not self.__exists():
+            with connections[self.using].schema_editor() as schema_editor:
+                schema_editor.add_index(self.model, self.__index())
+
+    def refresh_index(self):
+        connection = connections[self.using]
+        with connection.cursor() as cursor:
+            cursor.execute(f"REINDEX INDEX {connection.ops.quote_name(self.index_name)}")
+
+    def drop_index(self):
+        if self.__exists():
+            with connections[self.using].schema_editor() as schema_editor:
+                schema_editor.remove_index(self.model, self.__index())
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """
+    SQLite full-text search with an external content FTS5 virtual table kept
+    up to date with triggers, every word is looked for as a prefix. The rows
+    of the index are the primary keys of the model so they must be integers,
+    until 'search_index' builds the index the words are searched with
+    'icontains'
+    """
+
+    local_fields = True
+    tokenizer = "unicode61 remove_diacritics 2"
+
+    # Indexes known to exist (database alias, index name)
+    __ready: set[tuple[str, str]] = set()
+
+    def __init__(self, model, fields, using="default"):
+        super().__init__(model, fields, using)
+        pk = model._meta.pk
+        while pk.is_relation:
+            # Multi-table inheritance, the key comes from the parent
+            pk = pk.target_field
+        if not isinstance(pk, models.IntegerField):
+            raise ImproperlyConfigured(
+                f"Search backend {self.__class__.__name__} requires an integer primary key "
+                f"and model '{model._meta.label}' has a {pk.__class__.__name__}",
+            )
+
+    def __match(self, terms, join):
+        return f" {join} ".join(f'"{term}"*' for term in terms)
+
+    def __rowids(self, match):
+        quote_name = connections[self.using].ops.quote_name
+        table = quote_name(self.index_name)
+        return RawSQL(f"SELECT rowid FROM {table} WHERE {table} MATCH %s", [match])  # noqa: S608
+
+    def __exists(self):
+        key = (self.using, self.index_name)
+        if key not in SQLiteSearchBackend.__ready:
+            connection = connections[self.using]
+            with connection.cursor() as cursor:
+                if self.index_name not in connection.introspection.table_names(cursor):
+                    return False
+            SQLiteSearchBackend.__ready.add(key)
+        return True
+
+    def filter(self, queryset, words):
+        if not self.__exists():
+            logger.warning(
+                f"Search index for model '{self.model._meta.label}' does not exist, "
+                "searching with 'icontains' (run the 'search_index' command)",
+            )
+            return IcontainsSearchBackend(self.model, self.fields, self.using).filter(
+                queryset,
+                words,
+            )
+
+        positive = []
+        negative = []
+        for word in words:
+            terms = search_terms(word)
+            if terms:
+                if word.startswith("-"):
+                    negative.append(f"({self.__match(terms, 'AND')})")
+                else:
+                    positive.append(self.__match(terms, "AND"))
+
+        if positive:
+            queryset = queryset.filter(pk__in=self.__rowids(" AND ".join(positive)))
+        if negative:
+            queryset = queryset.exclude(pk__in=self.__rowids(" OR ".join(negative)))
+        return queryset
+
+    def __statements(self):
+        quote_name = connections[self.using].ops.quote_name
+        table = quote_name(self.model._meta.db_table)
+        index = quote_name(self.index_name)
+        pk = quote_name(self.model._meta.pk.column)
+        columns = [quote_name(self.model._meta.get_field(name).column) for name in self.fields]
+        new = ", ".join(f"new.{column}" for column in columns)
+        old = ", ".join(f"old.{column}" for column in columns)
+        columns = ", ".join(columns)
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING fts5("
+            f"{columns}, content={table}, content_rowid={pk}, tokenize='{self.tokenizer}')",
+            f"CREATE TRIGGER IF NOT EXISTS {quote_name(self.index_name + '_ai')} "
+            f"AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {index}(rowid, {columns}) VALUES (new.{pk}, {new}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {quote_name(self.index_name + '_ad')} "
+            f"AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {index}({index}, rowid, {columns}) "
+            f"VALUES ('delete', old.{pk}, {old}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {quote_name(self.index_name + '_au')} "
+            f"AFTER UPDATE ON {table} BEGIN "
+            f"INSERT INTO {index}({index}, rowid, {columns}) "
+            f"VALUES ('delete', old.{pk}, {old}); "
+            f"INSERT INTO {index}(rowid, {columns}) VALUES (new.{pk}, {new}); END",
+        ]
+
+    def build_index(self):
+        with connections[self.using].cursor() as cursor:
+            for statement in self.__statements():
+                cursor.execute(statement)
+
+    def refresh_index(self):
+        index = connections[self.using].ops.quote_name(self.index_name)
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f"INSERT INTO {index}({index}) VALUES ('rebuild')")  # noqa: S608
+
+    def drop_index(self):
+        SQLiteSearchBackend.__ready.discard((self.using, self.index_name))
+        quote_name = connections[self.using].ops.quote_name
+        with connections[self.using].cursor() as cursor:
+            for suffix in ("_ai", "_ad", "_au"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {quote_name(self.index_name + suffix)}")
+            cursor.execute(f"DROP TABLE IF EXISTS {quote_name(self.index_name)}")
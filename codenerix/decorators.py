@@ -39,3 +39,32 @@ def restrict_access_to_groups(groups: list, raise_exception: bool = False):
         return False
 
     return user_passes_test(in_groups)
+
+
+def bulk_method(bulk: str):
+    """
+    Decorator for model methods shown as columns of a GenList, 'bulk' is
+    the name of a classmethod of the model that gets the objects of the
+    page and the request and returns a dictionary pk -> value, GenList
+    calls it once per page (or chunk when streaming) instead of calling
+    the method for every row. Columns reaching the method through a
+    relation ('customer__balance') keep calling it for every row
+
+    Usage:
+
+    class Invoice(CodenerixModel):
+        @bulk_method("totals")
+        def total(self):
+            return self.lines.aggregate(total=Sum("price"))["total"]
+
+        @classmethod
+        def totals(cls, objects, request):
+            lines = InvoiceLine.objects.filter(invoice__in=objects)
+            return dict(lines.values_list("invoice").annotate(Sum("price")))
+    """
+
+    def decorator(method):
+        method.codenerix_bulk = bulk
+        return method
+
+    return decorator
@@ -0,0 +1,168 @@
+#
+# django-codenerix
+#
+# Codenerix GNU
+#
+# Project URL : http://www.codenerix.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+JSON encoders for the answers of the Gen* views
+
+    CODENERIX_JSON_ENCODER = "django"   # "django", "orjson", "msgspec", "auto" or a dotted path
+
+"django" is json.dumps() with DjangoJSONEncoder, "orjson" and "msgspec" use
+those libraries (when they are installed) and "auto" the fastest of them
+available. The fast encoders handle datetime, Decimal, UUID and lazy
+translation strings with the same values DjangoJSONEncoder gives and
+anything they can not encode is encoded by the
+"django" one, so its errors (and the diagnostics from trace_json_error())
+do not change.
+"""
+
+import datetime
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None  # type: ignore
+
+JSON_ENCODERS = {
+    "django": "codenerix.encoders.DjangoEncoder",
+    "orjson": "codenerix.encoders.OrjsonEncoder",
+    "msgspec": "codenerix.encoders.MsgspecEncoder",
+}
+
+# Encoders already built by setting value
+_encoders: dict = {}
+
+
+class DjangoEncoder:
+    """
+    json.dumps() with DjangoJSONEncoder, what the views always used
+    """
+
+    available = True
+
+    def __init__(self):
+        self.default = DjangoJSONEncoder().default
+
+    def dumps(self, data):
+        """
+        Return 'data' as a JSON string
+        """
+        return json.dumps(data, cls=DjangoJSONEncoder)
+
+    def encode(self, data):
+        """
+        Return 'data' as JSON encoded in UTF-8
+        """
+        return json.dumps(data, cls=DjangoJSONEncoder).encode("utf-8")
+
+
+class OrjsonEncoder(DjangoEncoder):
+    """
+    orjson, datetimes go through DjangoJSONEncoder so they keep its format
+    (milliseconds and 'Z' for UTC)
+    """
+
+    available = orjson is not None
+
+    def __init__(self):
+        super().__init__()
+        if orjson is not None:
+            self.options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def encode(self, data):
+        try:
+            return orjson.dumps(data, default=self.default, option=self.options)
+        except TypeError:
+            return super().encode(data)
+
+    def dumps(self, data):
+        return self.encode(data).decode("utf-8")
+
+
+class MsgspecEncoder(DjangoEncoder):
+    """
+    msgspec, Decimal are encoded as strings like DjangoJSONEncoder does,
+    datetimes, times and durations go through DjangoJSONEncoder before
+    encoding since msgspec always writes its own format for them
+    """
+
+    available = msgspec is not None
+
+    def __init__(self):
+        super().__init__()
+        if msgspec is not None:
+            self.encoder = msgspec.json.Encoder(enc_hook=self.default, decimal_format="string")
+
+    def encode(self, data):
+        try:
+            return self.encoder.encode(self.__prepare(data))
+        except (TypeError, ValueError):
+            return super().encode(data)
+
+    def __prepare(self, data):
+        if isinstance(data, dict):
+            return {key: self.__prepare(value) for (key, value) in data.items()}
+        if isinstance(data, (list, tuple)):
+            return [self.__prepare(value) for value in data]
+        if isinstance(data, (datetime.datetime, datetime.time, datetime.timedelta)):
+            return self.default(data)
+        return data
+
+    def dumps(self, data):
+        return self.encode(data).decode("utf-8")
+
+
+def get_json_encoder(name=None):
+    """
+    Return the encoder selected with CODENERIX_JSON_ENCODER (or 'name'),
+    the "django" one when the library of the selected one is not installed
+    """
+    if name is None:
+        name = getattr(settings, "CODENERIX_JSON_ENCODER", "django")
+    encoder = _encoders.get(name, None)
+    if encoder is None:
+        if name == "auto":
+            candidates = ["orjson", "msgspec"]
+        else:
+            candidates = [name]
+        for candidate in candidates:
+            cls = import_string(JSON_ENCODERS.get(candidate, candidate))
+            if cls.available:
+                encoder = cls()
+                break
+        else:
+            encoder = DjangoEncoder()
+        _encoders[name] = encoder
+    return encoder
+
+
+def json_dumps(data):
+    """
+    Return 'data' as a JSON string with the selected encoder
+    """
+    return get_json_encoder().dumps(data)
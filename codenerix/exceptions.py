@@ -21,3 +21,11 @@
 # Exceptions classes
 class CodenerixException(Exception):
     pass
+
+
+class QueryBudgetExceeded(CodenerixException):
+    pass
+
+
+class ExportBudgetExceeded(CodenerixException):
+    pass
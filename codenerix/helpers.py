@@ -18,10 +18,12 @@
 # limitations under the License.
 
 import decimal
+import hashlib
 import importlib
 import io
 import json
 from dataclasses import dataclass, field
+from functools import partial
 from typing import Any, Literal, cast, overload
 
 try:
@@ -34,30 +36,34 @@ import os
 import random
 import time
 import zipfile
-from datetime import date, datetime
+from datetime import date, datetime, time as datetime_time, timezone
 from uuid import UUID
 from xml.dom import minidom
 from xml.parsers.expat import ExpatError
 
+from asgiref.sync import sync_to_async
 from dateutil.tz import tzutc
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser, User
 from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.serializers.json import DjangoJSONEncoder
 
 # Django
-from django.db.models import Q
+from django.db import DatabaseError, connections
+from django.db.models import Count, Max, Model, Q, QuerySet
 from django.http import HttpResponseRedirect, QueryDict
 from django.shortcuts import render
 from django.template import TemplateDoesNotExist
 from django.template.loader import get_template as django_get_template
-from django.urls import reverse_lazy
-from django.utils import dateparse
+from django.urls import get_urlconf, resolve, reverse_lazy
+from django.utils import dateparse, formats
+from django.utils.cache import patch_cache_control
 from django.utils.encoding import smart_str
-from django.utils.http import urlsafe_base64_encode
+from django.utils.http import http_date, quote_etag, urlsafe_base64_encode
 from django.utils.safestring import SafeString
-from django.utils.translation import gettext_lazy as __
+from django.utils.translation import get_language, gettext_lazy as __
 from django.views.generic.base import View
 from unidecode import unidecode
 from yattag import Doc
@@ -404,6 +410,22 @@ def get_class(func) -> type[View] | None:
     return None
 
 
+# View classes answering the endpoints resolved by get_view_class()
+VIEW_CLASSES: dict[tuple[str, str], type[View] | None] = {}
+
+
+def get_view_class(path):
+    """
+    Return the class of the view answering 'path' (None if it is not a class
+    based view), every path is resolved once per process and URLconf
+    """
+    key = (str(get_urlconf() or settings.ROOT_URLCONF), path)
+    if key not in VIEW_CLASSES:
+        func = resolve(path).func
+        VIEW_CLASSES[key] = getattr(func, "view_class", None) or get_class(func)
+    return VIEW_CLASSES[key]
+
+
 def get_client_ip(request):
     x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
     if x_forwarded_for:
@@ -421,6 +443,183 @@ def clean_memcache_item(key, item):
         cache.set(key, result)
 
 
+def model_generation(model):
+    """
+    Return the generation of a model, a counter kept in the cache that is
+    increased every time one of its registers is saved or deleted (see the
+    receivers in codenerix.models), bulk operations do not change it. It
+    starts from the time it was created, so a counter evicted from the
+    cache never gives back a generation that was already used
+    """
+    key = f"codenerix_generation_{model._meta.label_lower}"
+    generation = cache.get(key)
+    if generation is None:
+        generation = time.time_ns()
+        cache.add(key, generation, None)
+        generation = cache.get(key, generation)
+    return generation
+
+
+def model_generation_bump(model):
+    """
+    Increase the generation of a model so anything cached with the old one
+    is not used anymore
+    """
+    key = f"codenerix_generation_{model._meta.label_lower}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        # The key is not in the cache yet
+        cache.add(key, time.time_ns(), None)
+
+
+def answer_validators(updated, total, *signature):
+    """
+    Build the validators (etag, last_modified) of an answer made of 'total'
+    registers where the last one was updated at 'updated', 'signature' are
+    the other things the answer depends on (view, user, query...)
+    """
+    if updated is None:
+        last_modified = None
+    else:
+        last_modified = int(updated.timestamp())
+    etag = json.dumps([updated, total, *signature], cls=DjangoJSONEncoder, sort_keys=True)
+    etag = hashlib.sha1(etag.encode(), usedforsecurity=False).hexdigest()
+    return (etag, last_modified)
+
+
+def queryset_validators(queryset, *signature, total=None):
+    """
+    Cheap validators (etag, None) for the registers of a queryset built
+    from max('updated') and count() (see answer_validators()), None when
+    the model has no 'updated' field. When 'total' is given (the registers
+    were counted already) only max('updated') is queried. There is no
+    last_modified: max('updated') in seconds does not change when a
+    register other than the newest is deleted or when it is changed twice
+    in the same second, only the ETag (it has the count) tells
+    """
+    try:
+        queryset.model._meta.get_field("updated")
+    except FieldDoesNotExist:
+        return None
+    if total is None:
+        info = queryset.order_by().aggregate(
+            codenerix_updated=Max("updated"),
+            codenerix_total=Count("pk"),
+        )
+        total = info["codenerix_total"]
+    else:
+        info = queryset.order_by().aggregate(codenerix_updated=Max("updated"))
+    (etag, _) = answer_validators(info["codenerix_updated"], total, *signature)
+    return (etag, None)
+
+
+def set_validators(response, etag, last_modified):
+    """
+    Attach the validators to the response, the client must check them on
+    every request so it never uses a stale answer
+    """
+    response.headers["ETag"] = quote_etag(etag)
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, no_cache=True)
+
+
+def queryset_signature(queryset):
+    """
+    Return a hash identifying the SQL (with its parameters and database)
+    that the queryset will run, None if the queryset can not produce SQL
+    """
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return None
+    signature = f"{queryset.db}|{sql}|{params!r}"
+    return hashlib.sha1(signature.encode(), usedforsecurity=False).hexdigest()
+
+
+def queryset_estimate(queryset):
+    """
+    Return the number of rows the database planner expects the queryset to
+    return or None when the database engine can not tell us
+    """
+    if connections[queryset.db].vendor != "postgresql":
+        return None
+    try:
+        plan = json.loads(queryset.explain(format="json"))
+    except (DatabaseError, ValueError, TypeError):
+        return None
+    if isinstance(plan, list) and plan:
+        plan = plan[0]
+    try:
+        return int(plan["Plan"]["Plan Rows"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def queryset_count(queryset, strategy="exact", timeout=60, threshold=100000):
+    """
+    Count the rows of a queryset and return a tuple (total, exact) where:
+        - strategy 'exact': runs a COUNT(*)
+        - strategy 'cached': runs a COUNT(*) and keeps it in the cache for
+          'timeout' seconds keyed by the SQL of the queryset (a count
+          coming from the cache is not considered exact)
+        - strategy 'estimated': uses the statistics from the database planner
+          when they say there are more than 'threshold' rows, otherwise
+          falls back to 'cached'
+    """
+    if strategy == "estimated":
+        estimate = queryset_estimate(queryset)
+        if estimate is not None and estimate > threshold:
+            return (estimate, False)
+        strategy = "cached"
+
+    if strategy == "cached":
+        signature = queryset_signature(queryset)
+        if signature is None:
+            # The queryset is empty by definition
+            return (0, True)
+        key = f"codenerix_count_{signature}"
+        total = cache.get(key)
+        if total is not None:
+            return (total, False)
+        total = queryset.count()
+        cache.set(key, total, timeout)
+        return (total, True)
+    elif strategy == "exact":
+        return (queryset.count(), True)
+    else:
+        raise ValueError(f"Unknown count strategy '{strategy}'")
+
+
+async def aqueryset_count(queryset, strategy="exact", timeout=60, threshold=100000):
+    """
+    Asynchronous queryset_count(), the COUNT(*) runs with the async ORM
+    """
+    if strategy == "estimated":
+        estimate = await sync_to_async(queryset_estimate)(queryset)
+        if estimate is not None and estimate > threshold:
+            return (estimate, False)
+        strategy = "cached"
+
+    if strategy == "cached":
+        signature = queryset_signature(queryset)
+        if signature is None:
+            # The queryset is empty by definition
+            return (0, True)
+        key = f"codenerix_count_{signature}"
+        total = await cache.aget(key)
+        if total is not None:
+            return (total, False)
+        total = await queryset.acount()
+        await cache.aset(key, total, timeout)
+        return (total, True)
+    elif strategy == "exact":
+        return (await queryset.acount(), True)
+    else:
+        raise ValueError(f"Unknown count strategy '{strategy}'")
+
+
 class CodenerixEncoder:
     codenerix_numeric_dic = {
         # Basic dicts
@@ -790,6 +989,221 @@ class DateRangeFilter:
         )
 
 
+class CachedChoices:
+    """
+    Option list for 'select'/'multiselect' filters from __searchF__ that is
+    built once per language and kept in the cache for 'timeout' seconds or
+    until a register of any of 'models' is saved or deleted. The source can
+    be a queryset (options are (pk, str(obj)) and its model is watched) or
+    a callable returning a list of (value, label):
+
+        tf['provider'] = (_('Provider'), lambda x: Q(provider__pk=x), 'multiselect',
+                          CachedChoices(Provider.objects.all()))
+        tf['kind'] = (_('Kind'), lambda x: Q(kind=x), 'select',
+                      CachedChoices(lambda: [(k.pk, k.name) for k in Kind.objects.all()],
+                                    models=[Kind]))
+
+    Callables are told apart by their code and what they are bound to (the
+    variables of a closure, the instance of a method and the arguments of a
+    partial), those values must be JSON, querysets or model instances,
+    otherwise the source needs an explicit 'key'
+    """
+
+    def __init__(self, source, models=None, timeout=None, key=None):
+        self.source = source
+        self.models = list(models or [])
+        if isinstance(source, QuerySet) and source.model not in self.models:
+            self.models.append(source.model)
+        if timeout is None:
+            timeout = getattr(settings, "CODENERIX_CHOICES_CACHE_TIMEOUT", 3600)
+        self.timeout = timeout
+        self.key = key
+        self.__choices = None
+
+    def cache_key(self):
+        """
+        Key of the option list for the source, the language and the
+        generation of the models
+        """
+        if self.key:
+            name = self.key
+        elif isinstance(self.source, QuerySet):
+            name = queryset_signature(self.source)
+        else:
+            name = self.__callable_signature(self.source)
+        generations = [(m._meta.label_lower, model_generation(m)) for m in self.models]
+        signature = json.dumps([name, get_language(), generations], cls=DjangoJSONEncoder)
+        signature = hashlib.sha1(signature.encode(), usedforsecurity=False).hexdigest()
+        return f"codenerix_choices_{signature}"
+
+    def __callable_signature(self, source):
+        """
+        Identify a callable source by its code and the values bound to it
+        """
+        if isinstance(source, partial):
+            return [
+                self.__callable_signature(source.func),
+                [self.__bound_signature(value) for value in source.args],
+                {name: self.__bound_signature(value) for (name, value) in source.keywords.items()},
+            ]
+        code = getattr(source, "__code__", None)
+        if code is None:
+            raise ValueError(
+                f"CachedChoices can not tell apart sources like {source!r}, give it a 'key'"
+            )
+        bound = []
+        if getattr(source, "__self__", None) is not None:
+            bound.append(self.__bound_signature(source.__self__))
+        for cell in getattr(source, "__closure__", None) or ():
+            try:
+                value = cell.cell_contents
+            except ValueError:
+                # Empty cell
+                value = None
+            bound.append(self.__bound_signature(value))
+        return [f"{source.__module__}.{source.__qualname__}:{code.co_firstlineno}", bound]
+
+    def __bound_signature(self, value):
+        """
+        JSON for a value bound to a callable source
+        """
+        if isinstance(value, Model):
+            return [value._meta.label_lower, value.pk]
+        elif isinstance(value, QuerySet):
+            return queryset_signature(value)
+        elif isinstance(value, type) or callable(value):
+            # Functions and classes are known by their name
+            return (
+                f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', repr(value))}"
+            )
+        try:
+            json.dumps(value, cls=DjangoJSONEncoder)
+        except TypeError as e:
+            raise ValueError(
+                f"CachedChoices can not tell apart sources bound to {value!r}, give it a 'key'",
+            ) from e
+        return value
+
+    def choices(self):
+        """
+        Return the option list, from the cache when possible
+        """
+        key = self.cache_key()
+        if self.__choices is None or self.__choices[0] != key:
+            choices = cache.get(key)
+            if choices is None:
+                if isinstance(self.source, QuerySet):
+                    choices = [(obj.pk, smart_str(obj)) for obj in self.source.all()]
+                else:
+                    choices = [(value, smart_str(label)) for (value, label) in self.source()]
+                cache.set(key, choices, self.timeout)
+            self.__choices = (key, choices)
+        return self.__choices[1]
+
+    def __iter__(self):
+        return iter(self.choices())
+
+    def __len__(self):
+        return len(self.choices())
+
+    def __getitem__(self, index):
+        return self.choices()[index]
+
+
+# Formatters shared by the views, see ValueFormatter.get()
+FORMATTERS: dict[tuple[Any, ...], "ValueFormatter"] = {}
+
+
+class ValueFormatter:
+    """
+    Convert datetime, date, time and Decimal values the way the views send
+    them (strings with the input formats of 'language' and floats). With
+    'localtime' datetimes are read as UTC and written in the local time of
+    the system, with 'decimals' set to False Decimal values are kept. The
+    formats are resolved once, get the shared formatter with:
+
+        formatter = ValueFormatter.get(self.language, localtime=True)
+        value = formatter.convert(value)
+        values = formatter.convert_column(values)
+    """
+
+    def __init__(self, language, localtime=False, decimals=True):
+        self.language = language
+        self.localtime = localtime
+        self.decimals = decimals
+        self.datetime_format = formats.get_format("DATETIME_INPUT_FORMATS", lang=language)[0]
+        self.date_format = formats.get_format("DATE_INPUT_FORMATS", lang=language)[0]
+        self.time_format = formats.get_format("TIME_INPUT_FORMATS", lang=language)[0]
+        self.__converters: dict[type, Any] = {}
+
+    @classmethod
+    def get(cls, language, localtime=False, decimals=True):
+        """
+        Return the formatter shared by everybody for the language, options
+        and time zone of the system
+        """
+        key = (language, localtime, decimals, time.tzname)
+        formatter = FORMATTERS.get(key, None)
+        if formatter is None:
+            formatter = cls(language, localtime, decimals)
+            FORMATTERS[key] = formatter
+        return formatter
+
+    def format_datetime(self, value):
+        if self.localtime:
+            value = value.replace(tzinfo=timezone.utc).astimezone()
+        return value.strftime(self.datetime_format)
+
+    def format_date(self, value):
+        return value.strftime(self.date_format)
+
+    def format_time(self, value):
+        return value.strftime(self.time_format)
+
+    def converter(self, kind):
+        """
+        Return the function converting values of type 'kind' (None when
+        they are kept as they are), it is decided once per type
+        """
+        try:
+            return self.__converters[kind]
+        except KeyError:
+            pass
+        if issubclass(kind, datetime):
+            converter = self.format_datetime
+        elif issubclass(kind, date):
+            converter = self.format_date
+        elif issubclass(kind, datetime_time):
+            converter = self.format_time
+        elif issubclass(kind, decimal.Decimal) and self.decimals:
+            converter = float
+        else:
+            converter = None
+        self.__converters[kind] = converter
+        return converter
+
+    def convert(self, value):
+        converter = self.converter(type(value))
+        if converter is None:
+            return value
+        return converter(value)
+
+    def convert_column(self, values):
+        """
+        Convert a whole column, the converter is looked up once for every
+        run of values of the same type
+        """
+        result = []
+        kind = None
+        converter = None
+        for value in values:
+            if type(value) is not kind:
+                kind = type(value)
+                converter = self.converter(kind)
+            result.append(value if converter is None else converter(value))
+        return result
+
+
 def otpauth(issuer, label, secret):
     if secret and pyotp:
         return pyotp.totp.TOTP(secret).provisioning_uri(
@@ -0,0 +1,95 @@
+#
+# django-codenerix
+#
+# Codenerix GNU
+#
+# Project URL : http://www.codenerix.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from codenerix_lib.debugger import Debugger
+from django.core.management.base import BaseCommand
+from django.urls import get_resolver
+
+from codenerix.views import GenList
+
+
+def subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from subclasses(subclass)
+
+
+class Command(BaseCommand, Debugger):
+    # Show this when the user types help
+    help = "Build and refresh the indexes used by GenList search backends"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            help="Only work with these models (app_label.ModelName)",
+        )
+        parser.add_argument(
+            "--database",
+            type=str,
+            default="default",
+            help="Nominates a database to work with. Defaults to the 'default' database.",
+        )
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            default=False,
+            help="Drop the indexes instead of building them",
+        )
+
+    def handle(self, *args, **options):
+        # Get database
+        db = options["database"]
+
+        # Autoconfigure Debugger
+        self.set_name("CODENERIX")
+        self.set_debug()
+
+        # Load all views from the project
+        get_resolver().url_patterns  # noqa: B018
+
+        # Find the backends in use
+        models = [x.lower() for x in options["models"]]
+        backends = {}
+        for view in subclasses(GenList):
+            model = getattr(view, "model", None)
+            if not view.search_backend or model is None:
+                continue
+            if models and model._meta.label_lower not in models:
+                continue
+            backend = view().get_search_backend(db)
+            if backend is None:
+                continue
+            key = (backend.__class__, model, tuple(backend.fields))
+            backends[key] = backend
+
+        if not backends:
+            self.debug("No views with a search backend were found", color="yellow")
+
+        for backend in backends.values():
+            name = f"{backend.model._meta.label} [{', '.join(backend.fields)}]"
+            if options["drop"]:
+                self.debug(f"Dropping index for {name}", color="blue")
+                backend.drop_index()
+            else:
+                self.debug(f"Building index for {name}", color="blue")
+                backend.build_index()
+                self.debug(f"Refreshing index for {name}", color="cyan")
+                backend.refresh_index()
+        self.debug("Done", color="green")
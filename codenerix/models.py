@@ -27,7 +27,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.db import models
 from django.db.models import Q
-from django.db.models.signals import post_delete, pre_delete
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch.dispatcher import receiver
 from django.utils.encoding import force_str, smart_str
 from django.utils.functional import Promise
@@ -35,7 +35,7 @@ from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 from django_stubs_ext.db.models import TypedModelMeta
 
-from codenerix.helpers import daterange_filter
+from codenerix.helpers import daterange_filter, model_generation_bump
 from codenerix.middleware import get_current_user
 
 TYPE_ACTION = (
@@ -734,6 +734,23 @@ class GenLogFull(GenLog):
         log_full = True
 
 
+@receiver(post_save)
+@receiver(post_delete)
+def codenerixmodel_generation(sender, **kwargs):
+    del kwargs  # Unused
+    # Cached answers built from this model are not valid anymore
+    model_generation_bump(sender)
+
+
+@receiver(m2m_changed)
+def codenerixmodel_generation_m2m(sender, instance, action, model, **kwargs):
+    del sender, kwargs  # Unused
+    if action in ("post_add", "post_remove", "post_clear"):
+        # Both sides of the relationship changed
+        model_generation_bump(instance.__class__)
+        model_generation_bump(model)
+
+
 @receiver(post_delete)
 def codenerixmodel_delete_post(sender, instance, **kwargs):
     del kwargs  # Unused
@@ -0,0 +1,134 @@
+#
+# django-codenerix
+#
+# Codenerix GNU
+#
+# Project URL : http://www.codenerix.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Read replica routing for the Gen* views
+
+    DATABASE_ROUTERS = ["codenerix.routers.ReplicaRouter"]
+    CODENERIX_READ_REPLICAS = ["replica1", "replica2"]
+    CODENERIX_READ_REPLICA = True           # Default for the views ('read_replica' attribute)
+    CODENERIX_READ_REPLICA_STICKY = 5       # Seconds a session reads from the primary after writing
+
+Views with 'read_replica' set (GenList, GenDetail, GenForeignKey...) send
+every read they do (permissions, counts, pages, exports...) to one of the
+replicas, writes always go to the primary. When a GenCreate, GenUpdate or
+GenDelete gets a write request, that session keeps reading from the
+primary for CODENERIX_READ_REPLICA_STICKY seconds so it sees its changes.
+"""
+
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+STICKY_SESSION_KEY = "codenerix_replica_sticky"
+
+# Replica used by the reads of the current request
+_replica: ContextVar[str | None] = ContextVar("codenerix_replica", default=None)
+
+
+def get_primary():
+    return getattr(settings, "CODENERIX_READ_PRIMARY", DEFAULT_DB_ALIAS)
+
+
+def get_replicas():
+    return list(getattr(settings, "CODENERIX_READ_REPLICAS", []))
+
+
+def current_replica():
+    """
+    Return the replica the reads are sent to, None for the primary
+    """
+    return _replica.get()
+
+
+@contextmanager
+def use_replica(alias):
+    """
+    Send the reads inside the block to the replica 'alias' (None for the
+    primary)
+    """
+    token = _replica.set(alias)
+    try:
+        yield alias
+    finally:
+        _replica.reset(token)
+
+
+def choose_replica(request, read_replica=True):
+    """
+    Return the replica the request should read from or None when it must
+    read from the primary, 'read_replica' can be True (any replica from
+    CODENERIX_READ_REPLICAS), the alias of a replica or a list of them
+    """
+    if not read_replica:
+        return None
+    elif read_replica is True:
+        replicas = get_replicas()
+    elif isinstance(read_replica, str):
+        replicas = [read_replica]
+    else:
+        replicas = list(read_replica)
+    if not replicas:
+        return None
+
+    # The session wrote a moment ago, it must see its changes
+    session = getattr(request, "session", None)
+    if session is not None and session.get(STICKY_SESSION_KEY, 0) > time.time():
+        return None
+
+    return random.choice(replicas)  # noqa: S311
+
+
+def stick_to_primary(request):
+    """
+    Make the session of the request read from the primary for the next
+    CODENERIX_READ_REPLICA_STICKY seconds
+    """
+    window = getattr(settings, "CODENERIX_READ_REPLICA_STICKY", 5)
+    session = getattr(request, "session", None)
+    if window and session is not None:
+        session[STICKY_SESSION_KEY] = time.time() + window
+
+
+class ReplicaRouter:
+    """
+    Database router sending the reads to the replica chosen for the request
+    (see use_replica()) and the writes to the primary
+    """
+
+    def db_for_read(self, model, **hints):
+        return _replica.get()
+
+    def db_for_write(self, model, **hints):
+        # Registers read from a replica are saved in the primary
+        instance = hints.get("instance", None)
+        if instance is not None and instance._state.db in get_replicas():
+            return get_primary()
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same registers as the primary
+        aliases = {get_primary(), *get_replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
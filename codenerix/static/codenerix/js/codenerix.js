@@ -847,6 +847,38 @@ function modal_manager(
     };
 };
 
+// Decode the body of a list sent with the 'rows' or 'columns' layout (see
+// encode_body() in codenerix/views.py) back to a list of rows
+function body_decode(body) {
+    if ((body == undefined) || angular.isArray(body)) {
+        return body;
+    }
+    var columns = body.columns;
+    var rows = [];
+    var row, r, c;
+    if (body.format == 'rows') {
+        for (r = 0; r < body.rows.length; r++) {
+            row = {};
+            for (c = 0; c < columns.length; c++) {
+                row[columns[c]] = body.rows[r][c];
+            }
+            rows.push(row);
+        }
+    } else if (body.format == 'columns') {
+        var total = (columns.length > 0) ? body.data[0].length : 0;
+        for (r = 0; r < total; r++) {
+            row = {};
+            for (c = 0; c < columns.length; c++) {
+                row[columns[c]] = body.data[c][r];
+            }
+            rows.push(row);
+        }
+    } else {
+        return body;
+    }
+    return rows;
+}
+
 // Function to help on refresh process
 function refresh($scope, $timeout, Register, callback, internal) {
     // console.log("Refreshing "+$scope.elementid);
@@ -912,6 +944,10 @@ function refresh($scope, $timeout, Register, callback, internal) {
 
     // === SUCCESS PROCESSING ===
     var wrapper_success_callback = function() {
+        // Rows sent with a compact layout
+        if ($scope.tempdata.table != undefined) {
+            $scope.tempdata.table.body = body_decode($scope.tempdata.table.body);
+        }
         $scope.data = $scope.tempdata;
         // Callback passed as an argument
         if (callback != undefined) {
@@ -946,8 +982,16 @@ function refresh($scope, $timeout, Register, callback, internal) {
         var register_args = $scope.RegisterParams;
     }
 
-    // Attach json
-    register_args['json'] = $scope.query;
+    // Ask for the compact layout of the body (see body_decode())
+    $scope.query.body_format = 'rows';
+
+    // Attach json (keyset cursors are only valid for the next request)
+    if ($scope.query.cursor) {
+        register_args['json'] = angular.extend({}, $scope.query);
+        delete $scope.query.cursor;
+    } else {
+        register_args['json'] = $scope.query;
+    }
 
     // Call the service for the data
     $scope.tempdata = Register.query(
@@ -3155,6 +3199,16 @@ function multilist(
     };
     $scope.page_change = function(value) {
         $scope.query.page = value;
+        // Use keyset cursors when moving to the next or previous page
+        if ($scope.data && $scope.data.meta) {
+            if ($scope.data.meta.cursor_next &&
+                (value == $scope.data.meta.page_after)) {
+                $scope.query.cursor = $scope.data.meta.cursor_next;
+            } else if ($scope.data.meta.cursor_prev &&
+                (value == $scope.data.meta.page_before)) {
+                $scope.query.cursor = $scope.data.meta.cursor_prev;
+            }
+        }
         refresh($scope, $timeout, Register, callback);
     };
 
@@ -0,0 +1,14 @@
+"""Benchmark of GenList against synthetic datasets on SQLite.
+
+Books (a GenLog model) with a publisher (foreign key) and tags (many to
+many) are generated at 10k, 100k and 1M rows and the JSON list, the free-text
+search, the filters, the date drill-down and every export format are
+requested through the test client, reporting latency percentiles, queries
+and peak of memory for each of them:
+
+    python -m codenerix.tests.benchmark --rows 10000 100000 --output after.json
+    python -m codenerix.tests.benchmark --rows 10000 100000 --baseline before.json
+
+With --baseline the run fails when a scenario got slower or used more memory
+than --tolerance allows or does more queries than before.
+"""
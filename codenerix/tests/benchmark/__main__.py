@@ -0,0 +1,11 @@
+import os
+import sys
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "codenerix.tests.benchmark.settings")
+django.setup()
+
+from codenerix.tests.benchmark.runner import main  # noqa: E402
+
+sys.exit(main())
@@ -0,0 +1,111 @@
+"""Synthetic models for the GenList benchmark."""
+
+from django.db import models
+from django.db.models import Count, Q
+from django.utils.translation import gettext_lazy as _
+
+from codenerix.decorators import bulk_method
+from codenerix.helpers import CachedChoices, daterange_filter
+from codenerix.models import CodenerixModel, GenLog
+
+
+class Publisher(CodenerixModel):
+    name = models.CharField(_("Name"), max_length=64)
+    country = models.CharField(_("Country"), max_length=2)
+
+    def __str__(self):
+        return self.name
+
+    def __fields__(self, info):
+        del info  # Unused
+        fields = []
+        fields.append(("name", _("Name")))
+        fields.append(("country", _("Country")))
+        return fields
+
+
+class Tag(CodenerixModel):
+    name = models.CharField(_("Name"), max_length=32)
+
+    def __str__(self):
+        return self.name
+
+    def __fields__(self, info):
+        del info  # Unused
+        fields = []
+        fields.append(("name", _("Name")))
+        return fields
+
+
+class Book(GenLog):
+    code = models.CharField(_("Code"), max_length=16, unique=True)
+    title = models.CharField(_("Title"), max_length=128)
+    price = models.DecimalField(_("Price"), max_digits=8, decimal_places=2)
+    stock = models.IntegerField(_("Stock"))
+    available = models.BooleanField(_("Available"))
+    published = models.DateTimeField(_("Published"), db_index=True)
+    publisher = models.ForeignKey(
+        Publisher,
+        on_delete=models.CASCADE,
+        related_name="books",
+        verbose_name=_("Publisher"),
+    )
+    tags = models.ManyToManyField(Tag, blank=True, related_name="books", verbose_name=_("Tags"))
+
+    def __str__(self):
+        return self.title
+
+    @bulk_method("tag_counts")
+    def tag_count(self):
+        return self.tags.count()
+
+    @classmethod
+    def tag_counts(cls, objects, request):
+        del request  # Unused
+        books = cls.objects.filter(pk__in=[obj.pk for obj in objects])
+        return dict(books.annotate(total=Count("tags")).values_list("pk", "total"))
+
+    def __fields__(self, info):
+        del info  # Unused
+        fields = []
+        fields.append(("code", _("Code")))
+        fields.append(("title", _("Title")))
+        fields.append(("publisher__name", _("Publisher")))
+        fields.append(("publisher__country", _("Country")))
+        fields.append(("tags__name", _("Tags")))
+        fields.append(("price", _("Price")))
+        fields.append(("stock", _("Stock")))
+        fields.append(("available", _("Available")))
+        fields.append(("published", _("Published")))
+        return fields
+
+    def __searchQ__(self, info, text):  # noqa: N802
+        del info  # Unused
+        tf = {}
+        tf["code"] = Q(code__icontains=text)
+        tf["title"] = Q(title__icontains=text)
+        tf["publisher"] = Q(publisher__name__icontains=text)
+        return tf
+
+    def __searchF__(self, info):  # noqa: N802
+        del info  # Unused
+        tf = {}
+        tf["publisher"] = (
+            _("Publisher"),
+            lambda x: Q(publisher__pk=x),
+            "select",
+            CachedChoices(Publisher.objects.order_by("pk")),
+        )
+        tf["tags"] = (
+            _("Tags"),
+            lambda x: Q(tags__pk=x),
+            "multiselect",
+            CachedChoices(Tag.objects.order_by("pk")),
+        )
+        tf["available"] = (_("Available"), lambda x: Q(available=x), "checkbox")
+        tf["published"] = (
+            _("Published"),
+            lambda x: Q(**daterange_filter(x, "published")),
+            "daterange",
+        )
+        return tf
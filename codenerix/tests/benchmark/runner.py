@@ -0,0 +1,300 @@
+"""Generate the synthetic dataset, drive the scenarios and report them."""
+
+import argparse
+import datetime
+import json
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from codenerix.helpers import model_generation_bump
+from codenerix.tests.benchmark.models import Book, Publisher, Tag
+
+SIZES = (10_000, 100_000, 1_000_000)
+PUBLISHERS = 200
+TAGS = 50
+BATCH = 5000
+
+# Books are published along 3 years starting at EPOCH
+EPOCH = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+SPAN = 3 * 365 * 24 * 60
+STEP = 1_000_003
+
+WORDS = (
+    "alpha",
+    "amber",
+    "blue",
+    "cedar",
+    "delta",
+    "ember",
+    "garden",
+    "harbor",
+    "ivory",
+    "jade",
+    "lunar",
+    "maple",
+    "north",
+    "ocean",
+    "pearl",
+    "quartz",
+    "river",
+    "stone",
+    "tiger",
+    "violet",
+)
+
+# (name, url name, json query, export)
+MONTH = {"year": 2024, "month": 3}
+SCENARIOS = (
+    ("list", "benchmark_books", {"page": 1, "rowsperpage": 50}, None),
+    ("list_deep", "benchmark_books", {"page": 100, "rowsperpage": 50}, None),
+    ("list_rows", "benchmark_books", {"page": 1, "rowsperpage": 50, "body_format": "rows"}, None),
+    ("search", "benchmark_books", {"search": "garden 12"}, None),
+    ("search_fk", "benchmark_books", {"search": "publisher 7"}, None),
+    ("filter_select", "benchmark_books", {"filters": {"publisher": 3}}, None),
+    ("filter_multiselect", "benchmark_books", {"filters": {"tags": [1, 2]}}, None),
+    ("filter_checkbox", "benchmark_books", {"filters": {"available": 1}}, None),
+    ("date_year", "benchmark_books", {"year": 2024}, None),
+    ("date_month", "benchmark_books", MONTH, None),
+    ("date_day", "benchmark_books", {**MONTH, "day": 15}, None),
+    ("stream_month", "benchmark_books_stream", {**MONTH, "rowsperpage": "All"}, None),
+    ("stream_csv", "benchmark_books_stream", MONTH, "csv"),
+    ("export_xlsx", "benchmark_books", MONTH, "xlsx"),
+    ("export_csv", "benchmark_books", MONTH, "csv"),
+    ("export_json", "benchmark_books", MONTH, "json"),
+    ("export_jsonl", "benchmark_books", MONTH, "jsonl"),
+    ("export_bson", "benchmark_books", MONTH, "bson"),
+)
+
+
+def book(i, publishers):
+    """
+    Register number 'i' of the dataset, it only depends on 'i' so every
+    dataset of the same size is the same
+    """
+    return Book(
+        code=f"B{i:07d}",
+        title=f"{WORDS[i % len(WORDS)]} {WORDS[(i * 7) % len(WORDS)]} {i}",
+        price=Decimal((i * 37) % 10000) / 100,
+        stock=(i * 13) % 500,
+        available=bool(i % 3),
+        published=EPOCH + datetime.timedelta(minutes=(i * STEP) % SPAN),
+        publisher_id=publishers[(i * 31) % len(publishers)],
+    )
+
+
+def populate(rows, stdout=None):
+    """
+    Leave exactly 'rows' books in the database, the ones already there are
+    kept so growing the dataset only generates the missing registers
+    """
+    if not Publisher.objects.exists():
+        Publisher.objects.bulk_create(
+            Publisher(name=f"Publisher {i}", country=("ES", "FR", "DE", "US")[i % 4])
+            for i in range(PUBLISHERS)
+        )
+        Tag.objects.bulk_create(Tag(name=f"tag{i}") for i in range(TAGS))
+    publishers = list(Publisher.objects.order_by("pk").values_list("pk", flat=True))
+    tags = list(Tag.objects.order_by("pk").values_list("pk", flat=True))
+
+    done = Book.objects.count()
+    if done > rows:
+        Book.objects.filter(code__gte=f"B{rows:07d}").delete()
+        done = rows
+
+    through = Book.tags.through
+    for start in range(done, rows, BATCH):
+        if stdout:
+            stdout.write(f"\rGenerating books {start}/{rows}")
+            stdout.flush()
+        with transaction.atomic():
+            books = Book.objects.bulk_create(
+                book(i, publishers) for i in range(start, min(start + BATCH, rows))
+            )
+            through.objects.bulk_create(
+                through(book_id=obj.pk, tag_id=tags[(i + k * 17) % len(tags)])
+                for (i, obj) in enumerate(books, start)
+                for k in range(i % 4)
+            )
+    if stdout and done < rows:
+        stdout.write(f"\rGenerating books {rows}/{rows}\n")
+
+    # Bulk operations do not touch the generations of the models
+    for model in (Publisher, Tag, Book):
+        model_generation_bump(model)
+
+
+def percentile(values, percent):
+    """
+    Percentile of 'values' interpolating between the closest ranks
+    """
+    values = sorted(values)
+    position = (len(values) - 1) * percent / 100
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def measure(client, url, query, export=None, repeat=10, warmup=1):
+    """
+    Request 'url' 'repeat' times and return the latency percentiles (ms),
+    then once more to count the queries and the peak of memory allocated
+    while answering (bytes)
+    """
+    data = {"json": json.dumps(query)}
+    if export:
+        data["export"] = export
+
+    def fetch():
+        response = client.get(url, data)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} answered {response.status_code} to {data}")
+        return response.getvalue()
+
+    for _ in range(warmup):
+        fetch()
+
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fetch()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as ctx:
+            content = fetch()
+        (_, peak) = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies),
+        "queries": len(ctx.captured_queries),
+        "memory": peak,
+        "size": len(content),
+    }
+
+
+def run(rows, repeat=10, warmup=1, scenarios=None, stdout=None):
+    """
+    Run the scenarios (all of them by default) against a dataset of 'rows'
+    books and return one result per scenario
+    """
+    populate(rows, stdout)
+    user = get_user_model().objects.filter(username="benchmark").first()
+    if user is None:
+        user = get_user_model().objects.create_superuser("benchmark", "benchmark@example.com")
+    client = Client()
+    client.force_login(user)
+
+    results = []
+    for name, urlname, query, export in SCENARIOS:
+        if scenarios and name not in scenarios:
+            continue
+        if stdout:
+            stdout.write(f"\r{rows} rows: {name}".ljust(60))
+            stdout.flush()
+        result = {"rows": rows, "scenario": name}
+        result.update(measure(client, reverse(urlname), query, export, repeat, warmup))
+        results.append(result)
+    if stdout:
+        stdout.write("\r".ljust(61) + "\r")
+    return results
+
+
+def report(results, stdout):
+    stdout.write(
+        f"{'rows':>9} {'scenario':<20} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+        f"{'max ms':>9} {'queries':>8} {'peak MiB':>9} {'KiB':>9}\n",
+    )
+    for result in results:
+        stdout.write(
+            f"{result['rows']:>9} {result['scenario']:<20} {result['p50']:>9.1f} "
+            f"{result['p95']:>9.1f} {result['p99']:>9.1f} {result['max']:>9.1f} "
+            f"{result['queries']:>8} {result['memory'] / 2**20:>9.1f} "
+            f"{result['size'] / 2**10:>9.1f}\n",
+        )
+
+
+def regressions(results, baseline, tolerance):
+    """
+    Compare the results with the ones from 'baseline' and return the list
+    of regressions: latency (p95) or peak of memory growing more than
+    'tolerance' or more queries than before
+    """
+    previous = {(result["rows"], result["scenario"]): result for result in baseline}
+    found = []
+    for result in results:
+        before = previous.get((result["rows"], result["scenario"]))
+        if before is None:
+            continue
+        label = f"{result['rows']} rows {result['scenario']}"
+        if result["p95"] > before["p95"] * (1 + tolerance):
+            found.append(f"{label}: p95 {before['p95']:.1f} -> {result['p95']:.1f} ms")
+        if result["memory"] > before["memory"] * (1 + tolerance):
+            found.append(f"{label}: memory {before['memory']} -> {result['memory']} bytes")
+        if result["queries"] > before["queries"]:
+            found.append(f"{label}: queries {before['queries']} -> {result['queries']}")
+    return found
+
+
+def main(argv=None, stdout=sys.stdout):
+    parser = argparse.ArgumentParser(
+        prog="python -m codenerix.tests.benchmark",
+        description="Benchmark GenList against synthetic datasets on SQLite",
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=SIZES,
+        help="sizes of the datasets (default: %(default)s)",
+    )
+    parser.add_argument("--repeat", type=int, default=10, help="requests measured per scenario")
+    parser.add_argument("--warmup", type=int, default=1, help="requests before measuring")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[scenario[0] for scenario in SCENARIOS],
+        help="run only this scenario (can be repeated)",
+    )
+    parser.add_argument("--output", help="save the results in this JSON file")
+    parser.add_argument("--baseline", help="JSON file from a previous run to compare with")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="growth of latency and memory allowed against the baseline",
+    )
+    args = parser.parse_args(argv)
+
+    call_command("migrate", run_syncdb=True, verbosity=0)
+    results = []
+    for rows in sorted(args.rows):
+        results.extend(run(rows, args.repeat, args.warmup, args.scenario, stdout))
+    report(results, stdout)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            found = regressions(results, json.load(baseline), args.tolerance)
+        for regression in found:
+            stdout.write(f"REGRESSION {regression}\n")
+        if found:
+            return 1
+    return 0
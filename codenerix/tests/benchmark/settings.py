@@ -0,0 +1,38 @@
+"""Django settings for running the GenList benchmark.
+
+The test settings plus what the test client needs to reach the views (URLs,
+sessions and authentication middleware) and a SQLite database file, so the
+synthetic rows are generated once and reused by the next runs
+(CODENERIX_BENCHMARK_DB sets its path).
+"""
+
+import os
+import tempfile
+
+from codenerix.tests.settings import *  # noqa: F403
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.environ.get(
+            "CODENERIX_BENCHMARK_DB",
+            os.path.join(tempfile.gettempdir(), "codenerix-benchmark.sqlite3"),
+        ),
+    },
+}
+
+ROOT_URLCONF = "codenerix.tests.benchmark.urls"
+
+MIDDLEWARE = [
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+]
+
+ALLOWED_HOSTS = ["testserver"]
+
+# Sessions and choices live in memory, the benchmark measures the views
+SESSION_ENGINE = "django.contrib.sessions.backends.cache"
+
+# Allow rowsperpage="All" for the streaming scenario
+ALL_PAGESALLOWED = True
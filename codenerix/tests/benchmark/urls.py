@@ -0,0 +1,23 @@
+"""URLs of the GenList benchmark."""
+
+from django.urls import path
+
+from codenerix.tests.benchmark.views import (
+    AsyncBookDetail,
+    AsyncBookList,
+    AsyncPublisherForeignKey,
+    BookList,
+    BookStreamList,
+)
+
+urlpatterns = [
+    path("books", BookList.as_view(), name="benchmark_books"),
+    path("books/stream", BookStreamList.as_view(), name="benchmark_books_stream"),
+    path("books/async", AsyncBookList.as_view(), name="benchmark_books_async"),
+    path("books/<int:pk>/async", AsyncBookDetail.as_view(), name="benchmark_book_async"),
+    path(
+        "publishers/foreign/<str:search>",
+        AsyncPublisherForeignKey.as_view(),
+        name="benchmark_publishers_foreign",
+    ),
+]
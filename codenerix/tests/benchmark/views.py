@@ -0,0 +1,41 @@
+"""GenList views driven by the benchmark."""
+
+from codenerix.tests.benchmark.models import Book, Publisher
+from codenerix.views import AsyncGenDetail, AsyncGenForeignKey, AsyncGenList, GenList
+
+
+class BookList(GenList):
+    model = Book
+    default_ordering = "-published"
+    datetime_filter = "published"
+    search_filter_button = True
+    export_excel = True
+    export_csv = True
+    export_json = True
+    export_jsonl = True
+    export_bson = True
+    export_name = "books"
+
+
+class BookStreamList(BookList):
+    stream_json = True
+    stream_csv = True
+
+
+class AsyncBookList(AsyncGenList, BookList):
+    pass
+
+
+class AsyncBookDetail(AsyncGenDetail):
+    model = Book
+    json = True
+    groups = [("Book", 12, ["code", 6], ["title", 6], ["publisher", 6])]
+
+
+class AsyncPublisherForeignKey(AsyncGenForeignKey):
+    model = Publisher
+    label = "{name} ({country})"
+
+    def get_foreign(self, queryset, search, filters):
+        del filters  # Unused
+        return queryset.filter(name__icontains=search).order_by("name")
@@ -14,6 +14,12 @@ DATABASES = {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": ":memory:",
     },
+    # Read replica for the tests of codenerix.routers (same database)
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+        "TEST": {"MIRROR": "default"},
+    },
 }
 
 INSTALLED_APPS = [
@@ -25,6 +31,11 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "codenerix",
+    # Synthetic models for the GenList benchmark (codenerix/tests/benchmark)
+    "codenerix.tests.benchmark",
 ]
 
 DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
+
+# codenerix/views.py builds its partial paths from STATIC_URL at import time
+STATIC_URL = "/static/"
@@ -0,0 +1,29 @@
+"""Smoke test for the GenList benchmark (codenerix/tests/benchmark)."""
+
+import pytest
+
+
+@pytest.mark.django_db
+def test_benchmark_scenarios_answer(settings):
+    from codenerix.tests.benchmark import settings as benchmark_settings
+    from codenerix.tests.benchmark.models import Book
+    from codenerix.tests.benchmark.runner import SCENARIOS, regressions, run
+
+    settings.ROOT_URLCONF = benchmark_settings.ROOT_URLCONF
+    settings.MIDDLEWARE = benchmark_settings.MIDDLEWARE
+    settings.ALL_PAGESALLOWED = True
+
+    results = run(60, repeat=2, warmup=0)
+    assert Book.objects.count() == 60
+    assert [result["scenario"] for result in results] == [scenario[0] for scenario in SCENARIOS]
+    for result in results:
+        assert result["queries"] > 0 and result["size"] > 0, result
+        assert result["p50"] <= result["p95"] <= result["p99"] <= result["max"]
+
+    # Shrinking the dataset leaves the same registers
+    run(40, repeat=1, warmup=0, scenarios=["list"])
+    assert Book.objects.order_by("-code").first().code == "B0000039"
+
+    slower = [{**results[0], "queries": results[0]["queries"] + 1}]
+    assert regressions(slower, results, 0.25)
+    assert not regressions(results, results, 0.25)
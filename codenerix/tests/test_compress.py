@@ -0,0 +1,46 @@
+"""Tests for codenerix.compress."""
+
+
+def test_compress_response_negotiates_and_streams():
+    import gzip
+    import zlib
+
+    from django.http import HttpResponse, StreamingHttpResponse
+    from django.test import RequestFactory
+
+    from codenerix.compress import choose_encoding, compress_response
+
+    offered = ["zstd", "br", "gzip"]
+    assert choose_encoding("gzip, br", offered) == "br"
+    assert choose_encoding("gzip;q=1.0, br;q=0.5", offered) == "gzip"
+    assert choose_encoding("*;q=0.1, zstd;q=0", offered) == "br"
+    assert choose_encoding("identity", offered) is None
+
+    request = RequestFactory().get("/", headers={"accept-encoding": "gzip"})
+    content = b'{"table": {"body": [' + b'{"name": "codenerix"},' * 500 + b"{}]}}"
+    response = HttpResponse(content, content_type="application/json")
+    response["ETag"] = '"etag"'
+    response = compress_response(request, response)
+    assert response["Content-Encoding"] == "gzip"
+    assert response["ETag"] == 'W/"etag"'
+    assert "Accept-Encoding" in response["Vary"]
+    assert gzip.decompress(response.content) == content
+
+    # Small answers, other content types and clients without gzip are left alone
+    small = compress_response(request, HttpResponse(b"{}", content_type="application/json"))
+    assert not small.has_header("Content-Encoding")
+    html = compress_response(request, HttpResponse(content, content_type="text/html"))
+    assert html.content == content
+    plain = compress_response(
+        RequestFactory().get("/"),
+        HttpResponse(content, content_type="application/json"),
+    )
+    assert plain.content == content
+
+    # Every chunk of a streaming answer can be decompressed as soon as it arrives
+    chunks = [b"id,name\n", b"1,codenerix\n" * 100]
+    response = StreamingHttpResponse(iter(chunks), content_type="text/csv")
+    response = compress_response(request, response, level=1, min_size=10**9)
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    received = [decompressor.decompress(chunk) for chunk in response.streaming_content]
+    assert received[: len(chunks)] == chunks
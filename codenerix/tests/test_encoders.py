@@ -0,0 +1,49 @@
+"""Tests for codenerix.encoders."""
+
+import pytest
+
+
+def test_json_encoders_match_django_and_fall_back(settings):
+    import datetime
+    import json
+    import uuid
+    from decimal import Decimal
+
+    from django.utils.translation import gettext_lazy
+
+    from codenerix.encoders import DjangoEncoder, get_json_encoder, json_dumps
+    from codenerix.helpers import trace_json_error
+
+    data = {
+        "datetime": datetime.datetime(2024, 3, 1, 10, 30, 5, 123456, tzinfo=datetime.timezone.utc),
+        "date": datetime.date(2024, 3, 1),
+        "time": datetime.time(10, 30),
+        "duration": datetime.timedelta(hours=2),
+        "decimal": Decimal("1.50"),
+        "uuid": uuid.UUID(int=1),
+        "lazy": gettext_lazy("Name"),
+        1: ["ñ", None, True, 2.5, 2**70],
+    }
+    expected = json.loads(DjangoEncoder().dumps(data))
+    for name in ("django", "orjson", "msgspec", "auto"):
+        encoder = get_json_encoder(name)
+        assert get_json_encoder(name) is encoder
+        decoded = json.loads(encoder.dumps(data))
+        assert decoded == expected
+        assert json.loads(encoder.encode(data)) == decoded
+
+        # Without the big integer msgspec encodes it all by itself
+        moments = {key: [data[key]] for key in ("datetime", "time", "duration")}
+        assert json.loads(encoder.dumps(moments)) == json.loads(DjangoEncoder().dumps(moments))
+    settings.CODENERIX_JSON_ENCODER = "orjson"
+    assert json.loads(json_dumps(data)) == expected
+
+    # What no encoder knows about fails like it always did
+    with pytest.raises(TypeError):
+        json_dumps({"table": {"body": [{"tags": {1, 2}}]}})
+    assert trace_json_error({"table": {"body": [{"tags": {1, 2}}]}}) == [
+        "table",
+        "body",
+        "0",
+        "tags",
+    ]
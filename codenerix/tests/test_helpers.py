@@ -0,0 +1,162 @@
+"""Tests for codenerix.helpers."""
+
+import pytest
+
+
+@pytest.mark.django_db
+def test_queryset_count_strategies():
+    from django.core.cache import cache
+
+    from codenerix.helpers import queryset_count
+    from codenerix.models import Log
+
+    cache.clear()
+    Log.objects.bulk_create([Log(object_repr=f"r{i}", action_flag=1) for i in range(5)])
+    queryset = Log.objects.filter(object_repr__startswith="r")
+
+    assert queryset_count(queryset) == (5, True)
+    # The first cached count is exact, the next ones come from the cache
+    assert queryset_count(queryset, "cached") == (5, True)
+    Log.objects.create(object_repr="r5", action_flag=1)
+    assert queryset_count(queryset, "cached") == (5, False)
+    # SQLite has no planner statistics so the estimation falls back to the cache
+    assert queryset_count(queryset, "estimated", threshold=0) == (5, False)
+    assert queryset_count(Log.objects.none(), "cached") == (0, True)
+    with pytest.raises(ValueError):
+        queryset_count(queryset, "unknown")
+
+
+@pytest.mark.django_db
+def test_model_generation_changes_on_save_and_delete():
+    from codenerix.helpers import model_generation
+    from codenerix.models import Log
+
+    generation = model_generation(Log)
+    assert model_generation(Log) == generation
+    log = Log.objects.create(object_repr="r", action_flag=1)
+    assert model_generation(Log) > generation
+    generation = model_generation(Log)
+    log.delete()
+    assert model_generation(Log) > generation
+
+    # A counter evicted from the cache does not start again from a used value
+    from django.core.cache import cache
+
+    generation = model_generation(Log)
+    cache.delete(f"codenerix_generation_{Log._meta.label_lower}")
+    assert model_generation(Log) > generation
+
+
+def test_answer_validators_and_conditional_response():
+    import datetime
+
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+    from django.utils.cache import get_conditional_response
+
+    from codenerix.helpers import answer_validators, set_validators
+
+    updated = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    (etag, last_modified) = answer_validators(updated, 3, "view", {"page": 1})
+    assert answer_validators(updated, 3, "view", {"page": 1}) == (etag, last_modified)
+    assert answer_validators(updated, 4, "view", {"page": 1})[0] != etag
+    assert answer_validators(None, 0, "view")[1] is None
+
+    response = HttpResponse()
+    set_validators(response, etag, last_modified)
+    assert "no-cache" in response.headers["Cache-Control"]
+    request = RequestFactory().get("/", headers={"if-none-match": response.headers["ETag"]})
+    assert get_conditional_response(request, etag=response.headers["ETag"]).status_code == 304
+
+
+@pytest.mark.django_db
+def test_aqueryset_count_matches_queryset_count():
+    from asgiref.sync import async_to_sync
+    from django.core.cache import cache
+
+    from codenerix.helpers import aqueryset_count, queryset_count
+    from codenerix.models import Log
+
+    cache.clear()
+    Log.objects.bulk_create([Log(object_repr=f"a{i}", action_flag=1) for i in range(3)])
+    queryset = Log.objects.filter(object_repr__startswith="a")
+    for strategy in ("exact", "cached", "estimated"):
+        cache.clear()
+        expected = queryset_count(queryset, strategy)
+        cache.clear()
+        assert async_to_sync(aqueryset_count)(queryset, strategy) == expected
+
+
+@pytest.mark.django_db
+def test_cached_choices_refresh_on_model_changes():
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from codenerix.helpers import CachedChoices
+    from codenerix.models import Log
+
+    cache.clear()
+    first = Log.objects.create(object_repr="first", action_flag=1)
+    choices = CachedChoices(Log.objects.order_by("pk").only("pk", "object_repr"))
+    assert len(choices) == 1
+    with CaptureQueriesContext(connection) as ctx:
+        assert len(CachedChoices(choices.source)) == 1
+    assert not ctx.captured_queries
+    log = Log.objects.create(object_repr="second", action_flag=1)
+    assert [pk for (pk, _) in choices] == [first.pk, log.pk]
+    assert choices[1][0] == log.pk
+
+
+def test_value_formatter_converts_once_per_type():
+    import datetime
+    from decimal import Decimal
+
+    from django.utils import formats
+
+    from codenerix.helpers import ValueFormatter
+
+    formatter = ValueFormatter.get("en")
+    assert ValueFormatter.get("en") is formatter
+    assert ValueFormatter.get("en", localtime=True) is not formatter
+    stamp = datetime.datetime(2024, 3, 1, 10, 30)
+    expected = stamp.strftime(formats.get_format("DATETIME_INPUT_FORMATS", lang="en")[0])
+    assert formatter.convert(stamp) == expected
+    assert formatter.convert(stamp.date()) == stamp.date().strftime(formatter.date_format)
+    assert formatter.convert(Decimal("1.50")) == 1.5
+    assert ValueFormatter.get("en", decimals=False).convert(Decimal("1.50")) == Decimal("1.50")
+    column = [stamp, None, 3, Decimal("2"), stamp.time(), "text"]
+    assert formatter.convert_column(column) == [formatter.convert(value) for value in column]
+    local = stamp.replace(tzinfo=datetime.timezone.utc).astimezone()
+    assert ValueFormatter.get("en", localtime=True).convert(stamp) == local.strftime(
+        formatter.datetime_format,
+    )
+
+
+def test_cached_choices_tell_apart_bound_sources():
+    from functools import partial
+
+    from codenerix.helpers import CachedChoices
+
+    def options(kind):
+        return lambda: [(kind, kind.upper())]
+
+    def numbered(size, prefix="#"):
+        return [(x, f"{prefix}{x}") for x in range(size)]
+
+    # Closures and partials made by the same code do not share the cache
+    keys = [
+        CachedChoices(options("a")).cache_key(),
+        CachedChoices(options("b")).cache_key(),
+        CachedChoices(partial(numbered, 2)).cache_key(),
+        CachedChoices(partial(numbered, 3)).cache_key(),
+        CachedChoices(partial(numbered, 3, prefix="-")).cache_key(),
+    ]
+    assert len(set(keys)) == len(keys)
+    assert CachedChoices(options("a")).cache_key() == keys[0]
+    assert list(CachedChoices(options("b"))) == [("b", "B")]
+
+    # Values that can not be told apart need an explicit key
+    with pytest.raises(ValueError):
+        CachedChoices(partial(numbered, object())).cache_key()
+    assert CachedChoices(partial(numbered, object()), key="numbered").cache_key()
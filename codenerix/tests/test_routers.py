@@ -0,0 +1,34 @@
+"""Tests for codenerix.routers."""
+
+from types import SimpleNamespace
+
+
+def test_replica_routing_sticks_to_primary_after_writes(settings):
+    from codenerix.models import Log
+    from codenerix.routers import (
+        ReplicaRouter,
+        choose_replica,
+        current_replica,
+        stick_to_primary,
+        use_replica,
+    )
+
+    settings.CODENERIX_READ_REPLICAS = ["replica"]
+    request = SimpleNamespace(session={})
+    router = ReplicaRouter()
+
+    assert choose_replica(request, False) is None
+    assert choose_replica(request, True) == "replica"
+    assert choose_replica(request, ["other"]) == "other"
+    with use_replica(choose_replica(request)):
+        assert current_replica() == "replica"
+        assert router.db_for_read(Log) == "replica"
+    assert router.db_for_read(Log) is None
+
+    # Registers read from the replica are written to the primary
+    log = Log()
+    log._state.db = "replica"
+    assert router.db_for_write(Log, instance=log) == "default"
+
+    stick_to_primary(request)
+    assert choose_replica(request) is None
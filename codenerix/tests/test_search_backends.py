@@ -0,0 +1,87 @@
+"""Tests for codenerix.contrib.search_backends."""
+
+import pytest
+
+
+@pytest.mark.django_db
+def test_sqlite_backend_matches_icontains_words():
+    from codenerix.contrib.search_backends import (
+        IcontainsSearchBackend,
+        SQLiteSearchBackend,
+        get_search_backend,
+    )
+    from codenerix.models import Log
+
+    fields = ["username", "object_repr"]
+    backend = get_search_backend("fulltext", Log, fields)
+    assert isinstance(backend, SQLiteSearchBackend)
+    backend.build_index()
+    Log.objects.create(username="alice", object_repr="Invoice 2024", action_flag=1)
+    Log.objects.create(username="bob", object_repr="Invoice 2025", action_flag=1)
+    Log.objects.create(username="alicia", object_repr="Order", action_flag=1)
+
+    icontains = IcontainsSearchBackend(Log, fields)
+    for words in (["ali"], ["invoice"], ["invoice", "-bob"], ["-invoice"], ["alice", "2025"]):
+        expected = set(icontains.filter(Log.objects.all(), words).values_list("pk", flat=True))
+        found = set(backend.filter(Log.objects.all(), words).values_list("pk", flat=True))
+        assert found == expected, words
+
+    backend.drop_index()
+
+
+@pytest.mark.django_db
+def test_sqlite_backend_needs_integer_keys_and_falls_back_without_index():
+    from django.contrib.sessions.models import Session
+    from django.core.exceptions import ImproperlyConfigured
+
+    from codenerix.contrib.search_backends import IcontainsSearchBackend, SQLiteSearchBackend
+    from codenerix.models import Log
+
+    # The rows of the index are the primary keys
+    with pytest.raises(ImproperlyConfigured):
+        SQLiteSearchBackend(Session, ["session_data"])
+
+    # Until 'search_index' builds the index the words are searched with icontains
+    Log.objects.create(username="alice", object_repr="Invoice", action_flag=1)
+    Log.objects.create(username="bob", object_repr="Order", action_flag=1)
+    fields = ["username", "object_repr"]
+    backend = SQLiteSearchBackend(Log, fields)
+    icontains = IcontainsSearchBackend(Log, fields)
+    for words in (["ali"], ["-invoice"]):
+        expected = set(icontains.filter(Log.objects.all(), words).values_list("pk", flat=True))
+        assert (
+            set(backend.filter(Log.objects.all(), words).values_list("pk", flat=True)) == expected
+        )
+
+
+@pytest.mark.django_db
+def test_views_without_search_fields_keep_searching_with_searchq(settings):
+    import json
+
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+
+    from codenerix.tests.benchmark import settings as benchmark_settings
+    from codenerix.tests.benchmark.runner import populate
+    from codenerix.tests.benchmark.views import BookList
+
+    settings.ROOT_URLCONF = benchmark_settings.ROOT_URLCONF
+    settings.MIDDLEWARE = benchmark_settings.MIDDLEWARE
+    settings.ALL_PAGESALLOWED = True
+    populate(30)
+    client = Client()
+    client.force_login(get_user_model().objects.create_superuser("search", "s@example.com"))
+
+    # A global backend (CODENERIX_SEARCH_BACKEND) on a list without 'search_fields'
+    BookList.search_backend = "fulltext"
+    try:
+        assert BookList().get_search_backend() is None
+        response = client.get(
+            reverse("benchmark_books"), {"json": json.dumps({"search": "garden"})}
+        )
+        assert response.status_code == 200
+        titles = [row["title"] for row in json.loads(response.content)["table"]["body"]]
+        assert titles and all("garden" in title for title in titles)
+    finally:
+        del BookList.search_backend
@@ -0,0 +1,105 @@
+"""Tests for codenerix.timing."""
+
+import pytest
+
+
+@pytest.mark.django_db
+def test_request_timing_phases_and_queries():
+    from codenerix.models import Log
+    from codenerix.timing import RequestTiming
+
+    timing = RequestTiming()
+    with timing.track_queries():
+        with timing.phase("queryset"):
+            with timing.phase("count"):
+                Log.objects.count()
+            list(Log.objects.all())
+    Log.objects.count()
+
+    assert timing.queries == 2
+    assert set(timing.phases) == {"queryset", "count"}
+    header = timing.header()
+    assert header.startswith("count;dur=")
+    assert 'sql;desc="2 queries"' in header
+    assert timing.as_dict()["queries"] == 2
+
+
+@pytest.mark.django_db
+def test_views_send_server_timing_and_keep_the_query_budget(settings, caplog):
+    import json
+
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+
+    from codenerix.exceptions import QueryBudgetExceeded
+    from codenerix.tests.benchmark import settings as benchmark_settings
+    from codenerix.tests.benchmark.runner import populate
+    from codenerix.tests.benchmark.views import BookList, BookStreamList
+
+    settings.ROOT_URLCONF = benchmark_settings.ROOT_URLCONF
+    settings.MIDDLEWARE = benchmark_settings.MIDDLEWARE
+    settings.ALL_PAGESALLOWED = True
+    populate(30)
+    client = Client()
+    client.force_login(get_user_model().objects.create_superuser("budget", "b@example.com"))
+    data = {"json": json.dumps({"rowsperpage": 10})}
+    ran = []
+
+    def record(execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        ran.append(sql)
+        return result
+
+    client.get(reverse("benchmark_books"), data)
+    BookList.timing = True
+    try:
+        with CaptureQueriesContext(connection) as ctx:
+            header = client.get(reverse("benchmark_books"), data)["Server-Timing"]
+        measured = len(ctx.captured_queries)
+    finally:
+        del BookList.timing
+    assert "queryset;dur=" in header and header.endswith(tuple("0123456789"))
+    queries = int(header.split('sql;desc="')[1].split(" ")[0])
+    assert queries > 1
+
+    # Over the budget it is logged
+    BookList.query_budget = queries - 1
+    try:
+        with caplog.at_level("WARNING", logger="codenerix"):
+            assert client.get(reverse("benchmark_books"), data).status_code == 200
+        assert f"ran {queries} SQL queries, its budget is {queries - 1}" in caplog.text
+
+        # Or the view stops before the query over the budget
+        BookList.query_budget_raise = True
+        with connection.execute_wrapper(record):
+            with pytest.raises(QueryBudgetExceeded, match=f"BookList ran {queries} SQL"):
+                client.get(reverse("benchmark_books"), data)
+        assert len(ran) == measured - 1
+    finally:
+        del BookList.query_budget
+        BookList.query_budget_raise = False
+        del BookList.query_budget_raise
+
+    # The queries of a stream are counted when it ends
+    caplog.clear()
+    data = {"json": json.dumps({}), "export": "csv"}
+    BookStreamList.timing = True
+    BookStreamList.stream_chunk_size = 5
+    try:
+        response = client.get(reverse("benchmark_books_stream"), data)
+        sent = int(response["Server-Timing"].split('sql;desc="')[1].split(" ")[0])
+        response.getvalue()
+        assert not caplog.text
+        BookStreamList.query_budget = sent
+        with caplog.at_level("WARNING", logger="codenerix"):
+            response = client.get(reverse("benchmark_books_stream"), data)
+            assert not caplog.text
+            response.getvalue()
+        assert "BookStreamList ran" in caplog.text
+    finally:
+        del BookStreamList.timing
+        del BookStreamList.stream_chunk_size
+        del BookStreamList.query_budget
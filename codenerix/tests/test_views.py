@@ -0,0 +1,883 @@
+"""Tests for the helpers used by the generic views."""
+
+import pytest
+
+
+@pytest.mark.django_db
+def test_keyset_filter_walks_the_ordering():
+    from codenerix.models import Log
+    from codenerix.views import keyset_filter
+
+    Log.objects.bulk_create(
+        [Log(object_id=None if i % 4 == 0 else f"obj{i % 3}", action_flag=1) for i in range(11)],
+    )
+    ordering = ["object_id", "-pk"]
+    # NULL values go at the end of the list
+    expected = sorted(
+        Log.objects.values_list("object_id", "pk"),
+        key=lambda x: (x[0] is None, x[0] or "", -x[1]),
+    )
+
+    # Walk forward one row at a time
+    walked = [expected[0]]
+    while len(walked) < len(expected):
+        after = set(Log.objects.filter(keyset_filter(ordering, walked[-1])).values_list("pk"))
+        assert after == {(pk,) for (_, pk) in expected[len(walked) :]}
+        walked.append(expected[len(walked)])
+
+    # Nothing is left after the last row and everything is before it
+    assert not Log.objects.filter(keyset_filter(ordering, expected[-1])).exists()
+    before = Log.objects.filter(keyset_filter(ordering, expected[-1], backwards=True))
+    assert before.count() == len(expected) - 1
+
+
+@pytest.mark.django_db
+def test_keyset_expand_follows_the_ordering_of_relations():
+    import datetime
+
+    from codenerix.tests.benchmark.models import Book, Publisher
+    from codenerix.views import keyset_expand, keyset_filter
+
+    publishers = [Publisher.objects.create(name=name, country="ES") for name in "cab"]
+    for i, publisher in enumerate(publishers * 2):
+        Book.objects.create(
+            code=f"B{i}",
+            title=f"Book {i}",
+            price=1,
+            stock=0,
+            available=True,
+            published=datetime.datetime(2024, 3, 1, tzinfo=datetime.timezone.utc),
+            publisher=publisher,
+        )
+
+    ordering = Publisher._meta.ordering
+    Publisher._meta.ordering = ["-name"]
+    try:
+        assert keyset_expand(Book, "publisher") == ["-publisher__name"]
+        assert keyset_expand(Book, "-publisher") == ["publisher__name"]
+        assert keyset_expand(Book, "publisher_id") == ["publisher_id"]
+        assert keyset_expand(Book, "title") == ["title"]
+
+        # Cursors walk the rows in the order offset pagination gives them
+        expected = list(Book.objects.order_by("publisher", "pk").values_list("pk", flat=True))
+        keyset = keyset_expand(Book, "publisher") + ["pk"]
+        walked = [expected[0]]
+        while len(walked) < len(expected):
+            last = Book.objects.values_list(*[name.lstrip("-") for name in keyset]).get(
+                pk=walked[-1],
+            )
+            after = Book.objects.filter(keyset_filter(keyset, last)).order_by("publisher", "pk")
+            walked.append(after.values_list("pk", flat=True)[0])
+        assert walked == expected
+    finally:
+        Publisher._meta.ordering = ordering
+
+
+def test_autosearchf_builds_the_filters_for_every_request():
+    from types import SimpleNamespace
+
+    from codenerix.models import Log
+    from codenerix.views import GenList
+
+    class LogList(GenList):
+        model = Log
+
+    field = Log._meta.get_field("username")
+    field.choices = [("a", "A"), ("b", "B")]
+    try:
+        modelinf = SimpleNamespace(fields=lambda: [("username", "User"), ("action_time", "Time")])
+        first = LogList().autoSearchF(modelinf)
+        assert set(first) == {"username", "action_time"}
+        assert first["username"][2] == [("a", "A"), ("b", "B")]
+        # Changing what a request got doesn't reach the next one
+        first["username"][2].append(("c", "C"))
+        second = LogList().autoSearchF(modelinf)
+        assert second["username"][2] == [("a", "A"), ("b", "B")]
+    finally:
+        field.choices = None
+
+
+def test_pages_from_range():
+    from codenerix.views import pages
+
+    assert pages(range(1, 2), 1) == [1]
+    listed = pages(range(1, 101), 50)
+    assert listed[0] == 1 and listed[-1] == 100
+    assert {49, 50, 51} <= set(listed)
+    assert listed == sorted(set(listed))
+
+
+@pytest.mark.django_db
+def test_foreignkey_choices_bring_the_selected_labels_only():
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from codenerix.models import Log
+    from codenerix.views import GenForeignKey
+
+    class LogForeignKey(GenForeignKey):
+        model = Log
+        label = "{object_repr} ({object_id})"
+
+    logs = Log.objects.bulk_create(
+        [Log(object_repr=f"r{i}", object_id=str(i), action_flag=1) for i in range(5)],
+    )
+    view = LogForeignKey()
+    view.language = "en"
+    with CaptureQueriesContext(connection) as ctx:
+        choices = view.get_choices([{"id": logs[1].pk}, {"id": logs[3].pk}])
+    assert sorted(choice["label"] for choice in choices) == ["r1 (1)", "r3 (3)"]
+    assert len(ctx.captured_queries) == 1
+    assert "change_txt" not in ctx.captured_queries[0]["sql"]
+
+
+@pytest.mark.django_db
+def test_bodybuilder_compiled_rules():
+    import datetime
+    from decimal import Decimal
+
+    from django.test import RequestFactory
+
+    from codenerix.tests.benchmark.models import Book, Publisher, Tag
+    from codenerix.tests.benchmark.views import BookList
+
+    publisher = Publisher.objects.create(name="Nova", country="ES")
+    book = Book.objects.create(
+        code="B1",
+        title="Garden",
+        price=Decimal("9.50"),
+        stock=0,
+        available=True,
+        published=datetime.datetime(2024, 3, 1, 10, tzinfo=datetime.timezone.utc),
+        publisher=publisher,
+    )
+    book.tags.set([Tag.objects.create(name="a"), Tag.objects.create(name="b")])
+
+    view = BookList()
+    view.language = "en"
+    view.codenerix_uuid = "uuid"
+    view.codenerix_request = RequestFactory().get("/")
+    rules = {
+        "pk": None,
+        "name:publisher__name": None,
+        "publisher": None,
+        "tags__name": None,
+        "tags": {"name": None},
+        "price": None,
+        "stock": None,
+        "lock_update": None,
+    }
+    (token,) = view.bodybuilder(Book.objects.order_by("pk"), rules)
+    assert token["name"] == "Nova" and token["publisher"] == "Nova"
+    assert sorted(token["tags__name"]) == ["a", "b"]
+    assert sorted(tag["name"] for tag in token["tags"]) == ["a", "b"]
+    assert token["price"] == 9.5 and token["stock"] == 0 and token["lock_update"] is None
+    # The same rules compile once and keep working for the next objects
+    assert view.bodybuilder([book], rules) == [token]
+    (row,) = view.bodybuilder(Book.objects.values("pk", "price", "published"), {})
+    assert row["price"] == 9.5 and isinstance(row["published"], str)
+
+
+@pytest.mark.django_db
+def test_bodybuilder_bulk_methods_run_once_per_page():
+    import datetime
+
+    from django.db import connection
+    from django.test import RequestFactory
+    from django.test.utils import CaptureQueriesContext
+
+    from codenerix.tests.benchmark.models import Book, Publisher, Tag
+    from codenerix.tests.benchmark.views import BookList
+
+    publisher = Publisher.objects.create(name="Nova", country="ES")
+    tags = [Tag.objects.create(name=f"t{i}") for i in range(3)]
+    for i in range(5):
+        book = Book.objects.create(
+            code=f"B{i}",
+            title=f"Book {i}",
+            price=1,
+            stock=0,
+            available=True,
+            published=datetime.datetime(2024, 3, 1, tzinfo=datetime.timezone.utc),
+            publisher=publisher,
+        )
+        book.tags.set(tags[: i % 4])
+
+    view = BookList()
+    view.language = "en"
+    view.codenerix_uuid = "uuid"
+    view.codenerix_request = RequestFactory().get("/")
+    books = list(Book.objects.order_by("pk").select_related("publisher"))
+    with CaptureQueriesContext(connection) as ctx:
+        body = view.bodybuilder(books, {"pk": None, "tag_count": None})
+    assert len(ctx.captured_queries) == 1
+    assert [token["tag_count"] for token in body] == [book.tag_count() for book in books]
+    # Through a relation the method is called for every row
+    (token,) = view.bodybuilder([publisher], {"counts:books__tag_count": None})
+    assert sorted(token["counts"]) == [0, 0, 1, 2, 3]
+
+
+def test_encode_body_layouts_and_negotiation():
+    import json
+
+    from django.test import RequestFactory
+
+    from codenerix.tests.benchmark.views import BookList
+    from codenerix.views import encode_body
+
+    body = [{"pk": 1, "name": "a"}, {"pk": 2, "name": "b", "extra": True}]
+    rows = encode_body(body, "rows")
+    assert rows == {
+        "format": "rows",
+        "columns": ["pk", "name", "extra"],
+        "rows": [[1, "a", None], [2, "b", True]],
+    }
+    columns = encode_body(body, "columns")
+    assert columns["data"] == [[1, 2], ["a", "b"], [None, True]]
+    assert encode_body(body) is body
+    assert encode_body([], "rows") == {"format": "rows", "columns": [], "rows": []}
+
+    def body_format(query=None, accept=None):
+        view = BookList()
+        headers = {"accept": accept} if accept else {}
+        view.request = RequestFactory().get("/", {"json": json.dumps(query or {})}, headers=headers)
+        return view.get_body_format()
+
+    assert body_format() == "dicts"
+    assert body_format({"body_format": "columns"}) == "columns"
+    assert body_format(accept="text/html, application/json; body=rows") == "rows"
+    assert body_format({"body_format": "unknown"}, "application/json; body=rows") == "rows"
+    assert body_format({"body_format": "unknown"}) == "dicts"
+
+
+@pytest.mark.django_db
+def test_streamed_csv_export_matches_the_buffered_one(settings):
+    import json
+
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+
+    from codenerix.tests.benchmark import settings as benchmark_settings
+    from codenerix.tests.benchmark.runner import populate
+    from codenerix.tests.benchmark.views import BookStreamList
+
+    settings.ROOT_URLCONF = benchmark_settings.ROOT_URLCONF
+    settings.MIDDLEWARE = benchmark_settings.MIDDLEWARE
+    settings.ALL_PAGESALLOWED = True
+    populate(30)
+    client = Client()
+    client.force_login(get_user_model().objects.create_superuser("csv", "csv@example.com"))
+    data = {"json": json.dumps({"year": 2024}), "export": "csv"}
+
+    buffered = client.get(reverse("benchmark_books"), data)
+    streamed = client.get(reverse("benchmark_books_stream"), data)
+    assert streamed.streaming and not buffered.streaming
+    assert streamed["Content-Disposition"] == buffered["Content-Disposition"]
+    assert streamed.getvalue() == buffered.getvalue()
+
+    # Too many rows for the budget
+    BookStreamList.export_max_rows = 5
+    try:
+        assert client.get(reverse("benchmark_books_stream"), data).status_code == 413
+    finally:
+        del BookStreamList.export_max_rows
+
+
+@pytest.mark.django_db
+def test_list_queries_do_not_grow_with_the_rows(settings):
+    import json
+
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+
+    from codenerix.tests.benchmark import settings as benchmark_settings
+    from codenerix.tests.benchmark.runner import populate
+
+    settings.ROOT_URLCONF = benchmark_settings.ROOT_URLCONF
+    settings.MIDDLEWARE = benchmark_settings.MIDDLEWARE
+    settings.ALL_PAGESALLOWED = True
+    populate(30)
+    client = Client()
+    client.force_login(get_user_model().objects.create_superuser("plan", "plan@example.com"))
+
+    # Foreign key columns come with select_related next to the prefetched tags
+    queries = {}
+    for name in ("benchmark_books", "benchmark_books_stream"):
+        for rows in (5, 30):
+            data = {"json": json.dumps({"rowsperpage": rows})}
+            client.get(reverse(name), data).getvalue()
+            with CaptureQueriesContext(connection) as ctx:
+                client.get(reverse(name), data).getvalue()
+            queries[(name, rows)] = len(ctx.captured_queries)
+    assert queries[("benchmark_books", 5)] == queries[("benchmark_books", 30)]
+    assert queries[("benchmark_books_stream", 5)] == queries[("benchmark_books_stream", 30)]
+
+
+@pytest.mark.django_db
+def test_response_cache_answers_authorized_users_only(settings):
+    import json
+
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import Permission
+    from django.core.cache import cache
+    from django.test import Client
+    from django.urls import reverse
+
+    from codenerix.tests.benchmark import settings as benchmark_settings
+    from codenerix.tests.benchmark.runner import populate
+    from codenerix.tests.benchmark.views import BookList
+
+    settings.ROOT_URLCONF = benchmark_settings.ROOT_URLCONF
+    settings.MIDDLEWARE = benchmark_settings.MIDDLEWARE
+    settings.ALL_PAGESALLOWED = False
+    settings.DEBUG = True
+    populate(10)
+    cache.clear()
+    user = get_user_model().objects.create_user("reader", "reader@example.com")
+    user.user_permissions.add(Permission.objects.get(codename="list_book"))
+    client = Client()
+    client.force_login(user)
+    data = {"json": json.dumps({"rowsperpage": 5})}
+
+    BookList.response_cache = True
+    try:
+        first = client.get(reverse("benchmark_books"), data)
+        assert first.status_code == 200
+        assert client.get(reverse("benchmark_books"), data).content == first.content
+
+        # Revoked permissions are not answered from the cache
+        user.user_permissions.clear()
+        assert client.get(reverse("benchmark_books"), data).status_code == 403
+
+        # Neither are anonymous users
+        client.logout()
+        assert client.get(reverse("benchmark_books"), data).status_code == 302
+    finally:
+        del BookList.response_cache
+        cache.clear()
+
+
+@pytest.mark.django_db
+def test_conditional_get_counts_the_registers_once(settings):
+    import json
+    import time
+
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+    from django.utils.http import http_date
+
+    from codenerix.tests.benchmark import settings as benchmark_settings
+    from codenerix.tests.benchmark.models import Book
+    from codenerix.tests.benchmark.runner import populate
+    from codenerix.tests.benchmark.views import BookList
+
+    settings.ROOT_URLCONF = benchmark_settings.ROOT_URLCONF
+    settings.MIDDLEWARE = benchmark_settings.MIDDLEWARE
+    settings.ALL_PAGESALLOWED = True
+    populate(10)
+    client = Client()
+    client.force_login(get_user_model().objects.create_superuser("etag", "etag@example.com"))
+    data = {"json": json.dumps({"rowsperpage": "All"})}
+
+    BookList.conditional_get = True
+    try:
+        # The validators reuse the count of the pagination
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(reverse("benchmark_books"), data)
+        assert response.status_code == 200
+        assert not [query for query in ctx.captured_queries if "codenerix_total" in query["sql"]]
+
+        # And they are the same ones the conditional GET checks
+        headers = {"if-none-match": response["ETag"]}
+        assert client.get(reverse("benchmark_books"), data, headers=headers).status_code == 304
+
+        # Lists have no Last-Modified, removing an old register doesn't change max('updated')
+        assert not response.has_header("Last-Modified")
+        Book.objects.order_by("updated").first().delete()
+        assert client.get(reverse("benchmark_books"), data, headers=headers).status_code == 200
+        headers = {"if-modified-since": http_date(time.time() + 3600)}
+        assert client.get(reverse("benchmark_books"), data, headers=headers).status_code == 200
+    finally:
+        del BookList.conditional_get
+
+
+@pytest.mark.django_db
+def test_streamed_json_matches_the_buffered_one(settings):
+    import json
+
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+
+    from codenerix.tests.benchmark import settings as benchmark_settings
+    from codenerix.tests.benchmark.runner import populate
+
+    settings.ROOT_URLCONF = benchmark_settings.ROOT_URLCONF
+    settings.MIDDLEWARE = benchmark_settings.MIDDLEWARE
+    settings.ALL_PAGESALLOWED = True
+    populate(30)
+    client = Client()
+    client.force_login(get_user_model().objects.create_superuser("stream", "stream@example.com"))
+
+    for query in (
+        {"rowsperpage": 10, "page": 2},
+        {"rowsperpage": 10, "body_format": "rows"},
+        {"year": 1900},
+        {"year": 1900, "body_format": "rows"},
+    ):
+        data = {"json": json.dumps(query)}
+        buffered = client.get(reverse("benchmark_books"), data)
+        streamed = client.get(reverse("benchmark_books_stream"), data)
+        assert streamed.streaming and not buffered.streaming
+        answer = json.loads(streamed.getvalue())
+        expected = json.loads(buffered.getvalue())
+        # Only the path of the request differs
+        assert answer["meta"].pop("request")["path_info"] == reverse("benchmark_books_stream")
+        expected["meta"].pop("request")
+        assert answer == expected, query
+        body = answer["table"]["body"]
+        if query.get("body_format") == "rows":
+            assert body["columns"] or "year" in query
+            body = body["rows"]
+        assert len(body) == (0 if "year" in query else 10)
+
+
+@pytest.mark.django_db
+def test_async_views_answer_like_the_synchronous_ones(settings):
+    import json
+
+    from asgiref.sync import async_to_sync
+    from django.contrib.auth import get_user_model
+    from django.test import AsyncClient, Client
+    from django.urls import reverse
+
+    from codenerix.tests.benchmark import settings as benchmark_settings
+    from codenerix.tests.benchmark.models import Book, Publisher
+    from codenerix.tests.benchmark.runner import populate
+
+    settings.ROOT_URLCONF = benchmark_settings.ROOT_URLCONF
+    settings.MIDDLEWARE = benchmark_settings.MIDDLEWARE
+    settings.ALL_PAGESALLOWED = True
+    populate(30)
+    user = get_user_model().objects.create_superuser("async", "async@example.com")
+    client = Client()
+    client.force_login(user)
+    book = Book.objects.order_by("pk").first()
+    queries = [{"rowsperpage": 10, "page": 2}, {"rowsperpage": 10, "page": 99}, {"year": 1900}]
+
+    async def fetch():
+        aclient = AsyncClient()
+        await aclient.aforce_login(user)
+        answers = []
+        for query in queries:
+            data = {"json": json.dumps(query)}
+            answers.append(await aclient.get(reverse("benchmark_books_async"), data))
+        detail = await aclient.get(reverse("benchmark_book_async", kwargs={"pk": book.pk}))
+        foreign = await aclient.get(
+            reverse("benchmark_publishers_foreign", kwargs={"search": "*"}),
+            {"def": "1"},
+        )
+        return (answers, detail, foreign)
+
+    (answers, detail, foreign) = async_to_sync(fetch)()
+
+    # AsyncGenList
+    for query, answer in zip(queries, answers, strict=True):
+        assert answer.status_code == 200
+        answer = json.loads(answer.content)
+        expected = client.get(reverse("benchmark_books"), {"json": json.dumps(query)})
+        expected = json.loads(expected.content)
+        answer["meta"].pop("request")
+        expected["meta"].pop("request")
+        assert answer == expected, query
+
+    # AsyncGenDetail
+    assert detail.status_code == 200
+    assert json.loads(detail.content)["body"] == {
+        "code": book.code,
+        "title": book.title,
+        "publisher": str(book.publisher),
+    }
+
+    # AsyncGenForeignKey
+    assert foreign.status_code == 200
+    rows = json.loads(foreign.content)["rows"]
+    assert rows[0] == {"id": None, "label": "---------"}
+    assert rows[1:] == [
+        {"id": publisher.pk, "label": f"{publisher.name} ({publisher.country})"}
+        for publisher in Publisher.objects.order_by("name")
+    ]
+
+
+@pytest.mark.django_db
+def test_haystack_lists_hydrate_the_rows(settings):
+    import json
+
+    from django.contrib.auth import get_user_model
+    from django.test import RequestFactory
+    from django.utils.translation import gettext_lazy as _
+
+    from codenerix.tests.benchmark.models import Book
+    from codenerix.tests.benchmark.runner import populate
+    from codenerix.views import GenList
+
+    settings.HAYSTACK_CONNECTIONS = {
+        "default": {"ENGINE": "haystack.backends.simple_backend.SimpleEngine"},
+    }
+    from haystack import connections, indexes
+
+    class BookIndex(indexes.SearchIndex, indexes.Indexable):
+        text = indexes.CharField(document=True)
+        code = indexes.CharField(model_attr="code")
+
+        def get_model(self):
+            return Book
+
+    class BookSearchList(GenList):
+        model = Book
+        haystack = True
+        default_ordering = "code"
+
+        def __fields__(self, info):
+            del info  # Unused
+            return [("code", _("Code")), ("title", _("Title")), ("publisher__name", _("Publisher"))]
+
+    settings.ALL_PAGESALLOWED = True
+    populate(10)
+    connections["default"].get_unified_index().build(indexes=[BookIndex()])
+    request = RequestFactory().get("/", {"json": json.dumps({"rowsperpage": 5})})
+    request.user = get_user_model().objects.create_superuser("hay", "hay@example.com")
+    response = BookSearchList.as_view()(request)
+    assert response.status_code == 200
+
+    # The publisher is not stored in the index, it comes with the registers
+    books = Book.objects.select_related("publisher").order_by("code")[:5]
+    assert [
+        (row["code"], row["title"], row["publisher__name"])
+        for row in json.loads(response.content)["table"]["body"]
+    ] == [(book.code, book.title, book.publisher.name) for book in books]
+
+
+@pytest.mark.django_db
+def test_response_cache_hits_negotiate_the_encoding(settings):
+    import gzip
+    import json
+
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache
+    from django.test import Client
+    from django.urls import reverse
+
+    from codenerix.tests.benchmark import settings as benchmark_settings
+    from codenerix.tests.benchmark.runner import populate
+    from codenerix.tests.benchmark.views import BookList
+
+    settings.ROOT_URLCONF = benchmark_settings.ROOT_URLCONF
+    settings.MIDDLEWARE = benchmark_settings.MIDDLEWARE
+    settings.ALL_PAGESALLOWED = True
+    populate(30)
+    cache.clear()
+    client = Client()
+    client.force_login(get_user_model().objects.create_superuser("gzip", "gzip@example.com"))
+    data = {"json": json.dumps({"rowsperpage": 30})}
+
+    BookList.response_cache = True
+    BookList.compress = True
+    try:
+        compressed = client.get(
+            reverse("benchmark_books"), data, headers={"accept-encoding": "gzip"}
+        )
+        plain = client.get(
+            reverse("benchmark_books"), data, headers={"accept-encoding": "identity"}
+        )
+        again = client.get(reverse("benchmark_books"), data, headers={"accept-encoding": "gzip"})
+    finally:
+        del BookList.response_cache
+        del BookList.compress
+        cache.clear()
+
+    # The cache keeps the answer as it is, every hit is compressed for its client
+    assert compressed["Content-Encoding"] == again["Content-Encoding"] == "gzip"
+    assert not plain.has_header("Content-Encoding")
+    for response in (compressed, plain, again):
+        assert "Accept-Encoding" in response["Vary"]
+    assert gzip.decompress(compressed.content) == plain.content == gzip.decompress(again.content)
+    assert json.loads(plain.content)["table"]["body"]
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+def test_streamed_answers_read_from_the_replica_of_the_request(settings):
+    import json
+
+    from django.contrib.auth import get_user_model
+    from django.db import connections
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+
+    from codenerix.tests.benchmark import settings as benchmark_settings
+    from codenerix.tests.benchmark.runner import populate
+    from codenerix.tests.benchmark.views import BookStreamList
+
+    settings.ROOT_URLCONF = benchmark_settings.ROOT_URLCONF
+    settings.MIDDLEWARE = benchmark_settings.MIDDLEWARE
+    settings.ALL_PAGESALLOWED = True
+    populate(10)
+    client = Client()
+    client.force_login(get_user_model().objects.create_superuser("replica", "replica@example.com"))
+    settings.DATABASE_ROUTERS = ["codenerix.routers.ReplicaRouter"]
+    settings.CODENERIX_READ_REPLICAS = ["replica"]
+
+    BookStreamList.read_replica = True
+    try:
+        for data in ({"json": json.dumps({"rowsperpage": 5})}, {"json": "{}", "export": "csv"}):
+            response = client.get(reverse("benchmark_books_stream"), data)
+            assert response.streaming
+            # The rows are read once the view returned, from the replica it chose
+            with CaptureQueriesContext(connections["replica"]) as replica:
+                with CaptureQueriesContext(connections["default"]) as primary:
+                    response.getvalue()
+            assert replica.captured_queries
+            assert not primary.captured_queries
+    finally:
+        del BookStreamList.read_replica
+
+
+@pytest.mark.django_db
+def test_keyset_pages_do_not_count_every_request(settings):
+    import json
+
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test import RequestFactory
+    from django.test.utils import CaptureQueriesContext
+
+    from codenerix.tests.benchmark.models import Book
+    from codenerix.tests.benchmark.runner import populate
+    from codenerix.tests.benchmark.views import BookList
+
+    class BookKeysetList(BookList):
+        keyset_pagination = True
+        datetime_filter = None
+
+    settings.ALL_PAGESALLOWED = True
+    populate(25)
+    cache.clear()
+    user = get_user_model().objects.create_superuser("keyset", "keyset@example.com")
+
+    def fetch(**query):
+        request = RequestFactory().get("/", {"json": json.dumps({"rowsperpage": 10, **query})})
+        request.user = user
+        with CaptureQueriesContext(connection) as ctx:
+            response = BookKeysetList.as_view()(request)
+        counts = [
+            q
+            for q in ctx.captured_queries
+            if q["sql"].startswith('SELECT COUNT(*) AS "__count" FROM "benchmark_book"')
+        ]
+        return (json.loads(response.content), counts)
+
+    expected = list(Book.objects.order_by("-published", "-pk").values_list("code", flat=True))
+    (first, counts) = fetch()
+    assert len(counts) == 1
+    (second, counts) = fetch(page=2, cursor=first["meta"]["cursor_next"])
+    assert not counts
+    assert [row["code"] for row in second["table"]["body"]] == expected[10:20]
+
+    # The count in the cache is stale, the last page is counted and read backwards
+    Book.objects.filter(code__in=expected[-3:]).delete()
+    (last, counts) = fetch(page="last")
+    assert len(counts) == 1
+    assert [row["code"] for row in last["table"]["body"]] == expected[20:22]
+    assert (last["meta"]["row_first"], last["meta"]["row_last"]) == (21, 22)
+    assert last["meta"]["row_total"] == 22
+
+
+@pytest.mark.django_db
+def test_estimated_counts_do_not_paginate_past_the_rows(settings, monkeypatch):
+    import json
+
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache
+    from django.test import RequestFactory
+
+    from codenerix.tests.benchmark.models import Book
+    from codenerix.tests.benchmark.runner import populate
+    from codenerix.tests.benchmark.views import BookList
+
+    class BookEstimatedList(BookList):
+        count_strategy = "estimated"
+        count_estimate_threshold = 0
+        datetime_filter = None
+
+    settings.ALL_PAGESALLOWED = True
+    populate(25)
+    cache.clear()
+    user = get_user_model().objects.create_superuser("estimate", "estimate@example.com")
+    expected = list(Book.objects.order_by("-published", "-pk").values_list("code", flat=True))
+
+    def fetch(estimate, **query):
+        monkeypatch.setattr("codenerix.helpers.queryset_estimate", lambda queryset: estimate)
+        request = RequestFactory().get("/", {"json": json.dumps({"rowsperpage": 10, **query})})
+        request.user = user
+        answer = json.loads(BookEstimatedList.as_view()(request).content)
+        return (answer["meta"], [row["code"] for row in answer["table"]["body"]])
+
+    # The planner believes there are more rows than there are
+    (meta, codes) = fetch(100, page=2)
+    assert codes == expected[10:20] and max(meta["pages"]) == 10
+    (meta, codes) = fetch(100, page=3)
+    assert codes == expected[20:] and max(meta["pages"]) == 3
+    (meta, codes) = fetch(100, page=7)
+    assert codes == expected[20:] and (meta["page"], meta["row_total"]) == (3, 25)
+    assert meta["row_total_exact"]
+    (meta, codes) = fetch(100, page="last")
+    assert codes == expected[20:] and meta["row_total_exact"]
+
+    # Or less than there are, the rows after the last page are reachable
+    (meta, codes) = fetch(12, page=2)
+    assert codes == expected[10:20] and max(meta["pages"]) == 3
+    (meta, codes) = fetch(12, page=3)
+    assert codes == expected[20:] and meta["page"] == 3
+
+
+@pytest.mark.django_db
+def test_queryset_plans_are_reused_by_view_and_rules(settings):
+    import json
+
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test import RequestFactory
+    from django.test.utils import CaptureQueriesContext
+    from django.utils.translation import gettext_lazy as _
+
+    from codenerix.tests.benchmark.models import Book
+    from codenerix.tests.benchmark.runner import populate
+    from codenerix.views import GenList
+
+    class BookPlanList(GenList):
+        model = Book
+        default_ordering = "code"
+
+        def __fields__(self, info):
+            del info  # Unused
+            return [("code", _("Code")), ("title", _("Title")), ("publisher__name", _("Publisher"))]
+
+    settings.ALL_PAGESALLOWED = True
+    populate(10)
+    user = get_user_model().objects.create_superuser("plan", "plan@example.com")
+    plans = GenList._GenList__queryset_plans
+
+    def fetch():
+        request = RequestFactory().get("/", {"json": json.dumps({"rowsperpage": 5})})
+        request.user = user
+        with CaptureQueriesContext(connection) as ctx:
+            response = BookPlanList.as_view()(request)
+        rows = [q["sql"] for q in ctx.captured_queries if 'FROM "benchmark_book"' in q["sql"]]
+        return (json.loads(response.content)["table"]["body"], rows[-1])
+
+    # The second request reuses the plan and runs the same values() projection
+    (body, sql) = fetch()
+    keys = [key for key in plans if key[0] is BookPlanList]
+    assert len(keys) == 1
+    plan = plans[keys[0]]
+    assert plan["found"] and plan["optimize"]
+    assert (body, sql) == fetch()
+    assert plans[keys[0]] is plan
+    assert '"benchmark_publisher"."name"' in sql and '"benchmark_book"."stock"' not in sql
+
+    # The cached plan is the one the rules give, other rules get their own plan
+    view = BookPlanList()
+    view.model = Book
+    plans.pop(keys[0])
+    assert view._GenList__queryset_plan(list(keys[0][3]), []) == plan
+    other = view._GenList__queryset_plan(["code"], [])
+    annotated = view._GenList__queryset_plan(list(keys[0][3]), ["total"])
+    assert other is not plan and other["optimizer"] != plan["optimizer"]
+    assert annotated is not plan and annotated is not plans[keys[0]]
+    assert len([key for key in plans if key[0] is BookPlanList]) == 3
+
+
+@pytest.mark.django_db
+def test_datefilter_buckets_match_the_python_ones():
+    import datetime
+
+    from django.core.cache import cache
+    from django.utils import timezone
+
+    from codenerix.tests.benchmark.models import Book
+    from codenerix.tests.benchmark.runner import populate
+    from codenerix.tests.benchmark.views import BookList
+
+    populate(40)
+    cache.clear()
+    view = BookList()
+
+    def buckets(index):
+        return view._GenList__datefilter_data(Book.objects.all(), "published", None, index)
+
+    # year, month, day, hour, minute, second and weekday (Monday is 0)
+    for index in range(7):
+        expected = {
+            timezone.localtime(value).timetuple()[index]
+            for value in Book.objects.values_list("published", flat=True)
+        }
+        assert buckets(index) == sorted(expected), index
+
+    # New registers show up although the buckets are in the cache
+    book = Book.objects.first()
+    book.pk = None
+    book.code = "NEW"
+    book.published = datetime.datetime(1999, 6, 1, tzinfo=datetime.timezone.utc)
+    book.save()
+    assert 1999 in buckets(0)
+    book.delete()
+    assert 1999 not in buckets(0)
+
+
+@pytest.mark.django_db
+def test_response_cache_hits_carry_their_own_timings(settings):
+    import json
+
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache
+    from django.test import Client
+    from django.urls import reverse
+
+    from codenerix.tests.benchmark import settings as benchmark_settings
+    from codenerix.tests.benchmark.runner import populate
+    from codenerix.tests.benchmark.views import BookList
+
+    settings.ROOT_URLCONF = benchmark_settings.ROOT_URLCONF
+    settings.MIDDLEWARE = benchmark_settings.MIDDLEWARE
+    settings.ALL_PAGESALLOWED = True
+    populate(10)
+    cache.clear()
+    client = Client()
+    client.force_login(get_user_model().objects.create_superuser("timing", "timing@example.com"))
+    data = {"json": json.dumps({"rowsperpage": 5})}
+
+    BookList.response_cache = True
+    BookList.timing = True
+    BookList.timing_meta = True
+    try:
+        built = json.loads(client.get(reverse("benchmark_books"), data).content)
+        hit = json.loads(client.get(reverse("benchmark_books"), data).content)
+    finally:
+        del BookList.response_cache
+        del BookList.timing
+        del BookList.timing_meta
+        cache.clear()
+
+    # The hit did not run the queryset, its timings say so
+    assert "queryset" in built["meta"]["timing"]["phases"]
+    assert "queryset" not in hit["meta"]["timing"]["phases"]
+    assert hit["table"] == built["table"]
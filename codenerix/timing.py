@@ -0,0 +1,120 @@
+#
+# django-codenerix
+#
+# Codenerix GNU
+#
+# Project URL : http://www.codenerix.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Timing of the phases of a request for the Gen* views
+
+    CODENERIX_TIMING = True         # Add a Server-Timing header to the answers of the views
+    CODENERIX_QUERY_BUDGET = 50     # Log a warning when a view runs more SQL queries
+
+Both can be set per view with the attributes 'timing' and 'query_budget'
+(see GenBase), 'timing_meta' adds the timings to 'meta' in JSON answers.
+
+With 'query_budget_raise' the query that goes over the budget is not run,
+QueryBudgetExceeded is raised instead, so the view stops as soon as it
+happens. The queries of a streamed answer (exports) are run while it is
+sent, they are counted and checked against the budget when the stream
+ends, but the Server-Timing header has already gone out with the queries
+run before the first chunk.
+"""
+
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+from codenerix.exceptions import QueryBudgetExceeded
+
+
+class RequestTiming:
+    """
+    Keep the time spent in every phase of a request (in milliseconds) and
+    the number and time of the SQL queries run meanwhile, when a 'budget' is
+    given the query that goes over it raises QueryBudgetExceeded (the
+    message starts with 'name')
+    """
+
+    def __init__(self, budget=None, name="Request"):
+        self.budget = budget
+        self.name = name
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.queries = 0
+        self.query_time = 0.0
+        self.__nested: list[float] = []
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Measure the block as phase 'name' (added up if it happens again),
+        the time of phases inside it is not counted twice
+        """
+        started = time.perf_counter()
+        self.__nested.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            nested = self.__nested.pop()
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed - nested
+            if self.__nested:
+                self.__nested[-1] += elapsed
+
+    @contextmanager
+    def track_queries(self):
+        """
+        Count the SQL queries run inside the block by this thread
+        """
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self.__execute))
+            yield self
+
+    def __execute(self, execute, sql, params, many, context):
+        if self.budget is not None and self.queries >= self.budget:
+            raise QueryBudgetExceeded(
+                f"{self.name} ran {self.queries + 1} SQL queries, its budget is {self.budget}"
+            )
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_time += (time.perf_counter() - started) * 1000
+
+    @property
+    def total(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def as_dict(self):
+        return {
+            "phases": {name: round(elapsed, 3) for (name, elapsed) in self.phases.items()},
+            "queries": self.queries,
+            "query_time": round(self.query_time, 3),
+            "total": round(self.total, 3),
+        }
+
+    def header(self):
+        """
+        Value for the Server-Timing header
+        """
+        metrics = [f"{name};dur={elapsed:.3f}" for (name, elapsed) in self.phases.items()]
+        metrics.append(f'sql;desc="{self.queries} queries";dur={self.query_time:.3f}')
+        metrics.append(f"total;dur={self.total:.3f}")
+        return ", ".join(metrics)
@@ -22,6 +22,7 @@
 Base library to handle CODENERIX system
 """
 
+import asyncio
 import base64
 import calendar
 import csv
@@ -37,8 +38,11 @@ import re
 import string
 import sys
 import time
+import uuid
+from contextlib import nullcontext
 from decimal import Decimal
 from io import BytesIO, StringIO
+from operator import itemgetter
 from typing import Any, Literal, cast, overload
 
 if sys.version_info >= (3, 11):
@@ -49,11 +53,12 @@ else:
 from zoneinfo import ZoneInfo
 
 import bson
-from dateutil import tz
+from asgiref.sync import sync_to_async
 from dateutil.parser import parse
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
+from django.core import signing
 from django.core.cache import cache
 from django.core.exceptions import (
     FieldDoesNotExist,
@@ -62,12 +67,12 @@ from django.core.exceptions import (
     PermissionDenied,
     ValidationError,
 )
-from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.core.serializers.json import DjangoJSONEncoder
 
 # Django
 from django.db import models
-from django.db.models import F, Q
+from django.db.models import F, Prefetch, Q
+from django.db.models.functions import Extract
 from django.forms.models import model_to_dict
 from django.http import (
     Http404,
@@ -75,13 +80,15 @@ from django.http import (
     HttpResponseForbidden,
     JsonResponse,
     QueryDict,
+    StreamingHttpResponse,
 )
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import resolve, reverse, reverse_lazy
-from django.utils import formats, timezone
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
 from django.utils.decorators import method_decorator
 from django.utils.encoding import smart_str
-from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+from django.utils.http import quote_etag, urlsafe_base64_decode, urlsafe_base64_encode
 from django.utils.text import format_lazy
 from django.utils.translation import get_language, gettext as __
 from django.views.generic import ListView, View
@@ -95,21 +102,36 @@ from openpyxl import Workbook
 from openpyxl.cell.cell import TYPE_NUMERIC
 from openpyxl.styles import Border, Color, Font, PatternFill, Side
 
+from codenerix.compress import compress_response
+from codenerix.contrib.search_backends import get_search_backend
+from codenerix.encoders import json_dumps
+from codenerix.exceptions import ExportBudgetExceeded
 from codenerix.helpers import (
     DateRangeFilter,
+    ValueFormatter,
+    answer_validators,
+    aqueryset_count,
     epochdate,
     get_class,
     get_profile,
     get_static,
     get_template,
+    get_view_class,
+    model_generation,
     model_inspect,
     monthname,
     qobject_builder_string_search,
+    queryset_count,
+    queryset_signature,
+    queryset_validators,
     remove_getdisplay,
+    set_validators,
     trace_json_error,
 )
 from codenerix.models import CodenerixModel
+from codenerix.routers import choose_replica, stick_to_primary, use_replica
 from codenerix.templatetags.codenerix_lists import unlist
+from codenerix.timing import RequestTiming
 
 logger = logging.getLogger(__name__)
 
@@ -149,8 +171,8 @@ def grv(struct, position):
 
 
 def pages(paginator, current):
-    # Get the range of pages
-    p = paginator.page_range
+    # Get the range of pages (from a paginator or straight from a range)
+    p = getattr(paginator, "page_range", paginator)
     # Get first and last
     first = p[0]
     last = p[-1]
@@ -220,6 +242,159 @@ def pages(paginator, current):
     return pages
 
 
+def keyset_value(value):
+    """
+    Convert a value read from the database to something that can be stored
+    inside a cursor and used back as a filter
+    """
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    elif isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    else:
+        return value
+
+
+def keyset_expand(model, name, seen=None):
+    """
+    Expand the field 'name' of an ordering the way order_by() does: a
+    relation is replaced by the ordering of the related model (its
+    Meta.ordering) so cursors follow the same order offset pagination
+    gives. Return None when that ordering can not be followed by cursors
+    """
+    desc = name.startswith("-")
+    path = name.lstrip("-")
+
+    # Find the field the path ends at
+    current = model
+    field = None
+    part = path
+    for part in path.split("__"):
+        try:
+            if part == "pk":
+                field = current._meta.pk
+            else:
+                field = current._meta.get_field(part)
+        except FieldDoesNotExist:
+            # Not a field (an annotation), keep it as it is
+            return [name]
+        if field.is_relation:
+            current = field.related_model
+
+    # Relations are ordered by the ordering of the related model
+    if field is None or not field.is_relation or part == getattr(field, "attname", None):
+        return [name]
+    related = field.related_model
+    seen = seen or set()
+    if not related._meta.ordering or related in seen:
+        return [name]
+    expanded = []
+    for item in related._meta.ordering:
+        if not isinstance(item, str) or item == "?":
+            return None
+        sign = "-" if item.startswith("-") != desc else ""
+        names = keyset_expand(model, f"{sign}{path}__{item.lstrip('-')}", seen | {related})
+        if names is None:
+            return None
+        expanded.extend(names)
+    return expanded
+
+
+def keyset_filter(ordering, values, backwards=False):
+    """
+    Build the Q-object that selects the rows placed after the row holding
+    'values' for the given ordering (or before it when 'backwards' is set).
+    The ordering is a list of field names prefixed with '-' when descendent,
+    NULL values are always considered to be at the end of the list
+    """
+    qfilter = None
+    qequal = Q()
+    for name, value in zip(ordering, values, strict=False):
+        desc = name.startswith("-")
+        field = name.lstrip("-")
+
+        # Rows strictly beyond the value for this field
+        if not backwards:
+            if value is None:
+                # Nothing comes after NULL
+                qbeyond = None
+            else:
+                lookup = "lt" if desc else "gt"
+                qbeyond = Q(**{f"{field}__{lookup}": value}) | Q(**{f"{field}__isnull": True})
+        else:
+            if value is None:
+                # Everything else comes before NULL
+                qbeyond = Q(**{f"{field}__isnull": False})
+            else:
+                lookup = "gt" if desc else "lt"
+                qbeyond = Q(**{f"{field}__{lookup}": value})
+
+        # Rows equal on all the previous fields and beyond on this one
+        if qbeyond is not None:
+            qbeyond = qequal & qbeyond
+            if qfilter is None:
+                qfilter = qbeyond
+            else:
+                qfilter |= qbeyond
+
+        # Rows equal on this field
+        if value is None:
+            qequal &= Q(**{f"{field}__isnull": True})
+        else:
+            qequal &= Q(**{field: value})
+
+    if qfilter is None:
+        # Nothing can be found beyond this row
+        qfilter = Q(pk__in=[])
+
+    return qfilter
+
+
+# Layouts of the body of GenList JSON answers (see encode_body())
+BODY_FORMATS = ("dicts", "rows", "columns")
+
+
+def body_columns(body):
+    """
+    Keys found in the rows of a body, in the order they are found
+    """
+    return list(dict.fromkeys(key for token in body for key in token))
+
+
+def encode_body(body, body_format="dicts", columns=None):
+    """
+    Encode the list of dictionaries built by bodybuilder() with one of the
+    BODY_FORMATS, 'dicts' keeps the list as it is and the others send the
+    keys only once:
+
+        rows:    {"format": "rows", "columns": ["pk", "name"], "rows": [[1, "a"], [2, "b"]]}
+        columns: {"format": "columns", "columns": ["pk", "name"], "data": [[1, 2], ["a", "b"]]}
+
+    Missing keys are sent as null, 'columns' can be given to keep the same
+    columns for several pieces of a body
+    """
+    if body_format == "dicts":
+        return body
+    elif body_format not in BODY_FORMATS:
+        raise ValueError(f"Unknown body format '{body_format}'")
+
+    if columns is None:
+        columns = body_columns(body)
+    if body_format == "rows":
+        if len(columns) > 1:
+            getter = itemgetter(*columns)
+            try:
+                rows = [list(getter(token)) for token in body]
+            except KeyError:
+                rows = [[token.get(key) for key in columns] for token in body]
+        else:
+            rows = [[token.get(key) for key in columns] for token in body]
+        return {"format": "rows", "columns": columns, "rows": rows}
+    else:
+        data = [[token.get(key) for token in body] for key in columns]
+        return {"format": "columns", "columns": columns, "data": data}
+
+
 class SearchFilters:  # noqa: N801
     @staticmethod
     def number(fieldname):
@@ -295,6 +470,8 @@ class MODELINFO:
                 (_('Name'),<function wich returns a Q-object>,[('key1',_('Text 1')),('key2',_('Text 2')),...])
                 it can be as well:
                 (_('Content'), <function 1>, <function 2>)
+                the options of 'select'/'multiselect' filters can be kept in the cache with CachedChoices (see codenerix.helpers):
+                (_('Provider'), lambda x: Q(provider__pk=x), 'multiselect', CachedChoices(Provider.objects.all()))
         # Example:
         tf={}
         tf['title']=(_('Title'), lambda x: Q(title__startswith=x),[('h',_('Starts with h')),('S',_('Starts with S'))])
@@ -658,10 +835,27 @@ def gen_auth_permission(
 
 class GenBase(ContextMixin):
     """
-    public = False   # Will not perform permission controls
-    """
+    public = False              # Will not perform permission controls
+    read_replica = True         # Send the reads to a replica (True, an alias or a list of them, see codenerix.routers)
+    timing = True               # Add a Server-Timing header with the time of every phase and the SQL queries (see codenerix.timing)
+    timing_meta = True          # Add the timings to 'meta' in JSON answers
+    query_budget = 50           # Log a warning when the request runs more SQL queries
+    query_budget_raise = True   # Raise QueryBudgetExceeded at the query over the budget instead of logging
+    compress = True             # Compress JSON answers and exports when the client accepts it (see codenerix.compress)
+    compress_level = 6          # Level of compression, a number or a dictionary by encoding ({"gzip": 6, "br": 4, "zstd": 3})
+    compress_min_size = 1024    # Answers smaller than this (bytes) are not compressed
+    """  # noqa: E501
 
     json = False
+    read_replica = getattr(settings, "CODENERIX_READ_REPLICA", False)
+    timing = getattr(settings, "CODENERIX_TIMING", False)
+    timing_meta = False
+    query_budget = getattr(settings, "CODENERIX_QUERY_BUDGET", None)
+    query_budget_raise = False
+    compress = getattr(settings, "CODENERIX_COMPRESS", False)
+    compress_level = getattr(settings, "CODENERIX_COMPRESS_LEVEL", None)
+    compress_min_size = getattr(settings, "CODENERIX_COMPRESS_MIN_SIZE", 1024)
+    __timing = None
     search_filter_button = False
     extra_context: dict[str, Any] | None = {}  # pyright: ignore[reportIncompatibleVariableOverride]
     is_modal = False
@@ -746,13 +940,112 @@ class GenBase(ContextMixin):
         # Save arguments in the environment
         self.__kwargs = kwargs
 
-        # Prepare
-        if getattr(self, "public", False):
-            # Django's original dispatch
-            return super().dispatch(*args, **kwargs)
+        # Measure the request
+        if self.timing or self.query_budget is not None:
+            self.__timing = RequestTiming(
+                self.query_budget if self.query_budget_raise else None,
+                f"View {self.__class__.__module__}.{self.__class__.__qualname__}",
+            )
+            with self.__timing.track_queries():
+                response = self.__dispatch(*args, **kwargs)
+                if not asyncio.iscoroutine(response):
+                    self.__timing_render(response)
+                    response = self.response_compress(response)
+            if asyncio.iscoroutine(response):
+                return self.__timing_afinish(response)
+            return self.__timing_finish(response)
+
+        response = self.__dispatch(*args, **kwargs)
+        if asyncio.iscoroutine(response):
+            return self.__acompress(response)
+        return self.response_compress(response)
+
+    def __dispatch(self, *args, **kwargs):
+        # Reads from this view may go to a replica
+        with use_replica(choose_replica(self.request, self.read_replica)):
+            # Prepare
+            if getattr(self, "public", False):
+                # Django's original dispatch
+                return super().dispatch(*args, **kwargs)
+            else:
+                # Authenticated dispatch
+                return login_required(self.dispatch_auth)(*args, **kwargs)
+
+    def __timing_render(self, response):
+        # Render templates now so their time and queries are measured
+        if getattr(response, "is_rendered", True) is False:
+            with self.timing_phase("render"):
+                response.render()
+
+    def __timing_finish(self, response):
+        timing = self.__timing
+        assert timing is not None  # set in dispatch()
+        if getattr(response, "streaming", False) and not response.is_async:
+            # The queries of a stream are run while it is sent (async ones are not counted)
+            response.streaming_content = self.__timing_stream(response.streaming_content)
         else:
-            # Authenticated dispatch
-            return login_required(self.dispatch_auth)(*args, **kwargs)
+            self.__timing_budget()
+        if self.timing:
+            response.headers["Server-Timing"] = timing.header()
+        return response
+
+    def __timing_stream(self, content):
+        timing = self.__timing
+        assert timing is not None  # set in dispatch()
+        with timing.track_queries():
+            yield from content
+        self.__timing_budget()
+
+    def __timing_budget(self):
+        # With query_budget_raise RequestTiming stops the view before it gets here
+        timing = self.__timing
+        assert timing is not None  # set in dispatch()
+        if self.query_budget is not None and timing.queries > self.query_budget:
+            logger.warning(
+                f"{timing.name} ran {timing.queries} SQL queries, its budget is {self.query_budget}"
+            )
+
+    async def __timing_afinish(self, response):
+        # Queries run by the async ORM happen in other threads, they are not counted
+        response = await response
+        self.__timing_render(response)
+        response = self.response_compress(response)
+        return self.__timing_finish(response)
+
+    async def __acompress(self, response):
+        return self.response_compress(await response)
+
+    def response_compress(self, response):
+        """
+        Compress the answer with the encoding the client prefers when it is
+        a JSON answer or an export (see codenerix.compress)
+        """
+        if not self.compress:
+            return response
+        with self.timing_phase("compress"):
+            return compress_response(
+                self.request,
+                response,
+                self.compress_level,
+                self.compress_min_size,
+            )
+
+    def timing_phase(self, name):
+        """
+        Measure the block as phase 'name' of the request (nothing is done
+        when the request is not being measured)
+        """
+        if self.__timing is None:
+            return nullcontext()
+        return self.__timing.phase(name)
+
+    def timing_info(self):
+        """
+        Timings of the request so far, None when it is not being measured
+        """
+        if self.__timing is None:
+            return None
+        return self.__timing.as_dict()
 
     @method_decorator(login_required)
     def dispatch_auth(self, *args, **kwargs):
@@ -780,10 +1073,11 @@ class GenBase(ContextMixin):
                 else:
                     return redirect("not_authorized")
 
-        authorized, reason = self.auth_permission(
-            self.action_permission,
-            explained=True,
-        )
+        with self.timing_phase("auth"):
+            authorized, reason = self.auth_permission(
+                self.action_permission,
+                explained=True,
+            )
         if not authorized:
             if getattr(settings, "DEBUG", False):
                 logger.error(reason)
@@ -953,6 +1247,7 @@ class GenBase(ContextMixin):
 
             # Build the answer
             answer = {}
+            formatter = ValueFormatter.get(self.language, decimals=False)
             for fieldname in fields:
                 # Get value
                 value = getattr(obj, fieldname)
@@ -960,30 +1255,10 @@ class GenBase(ContextMixin):
                 # Only add non-reversed relationships
                 if fieldname not in related:
                     # Analize data type
-                    if isinstance(value, datetime.datetime):
-                        # Convert datetime to string
-                        value = value.strftime(
-                            formats.get_format(
-                                "DATETIME_INPUT_FORMATS",
-                                lang=self.language,
-                            )[0],
-                        )
-                    elif isinstance(value, datetime.date):
-                        # Convert datetime to string
-                        value = value.strftime(
-                            formats.get_format(
-                                "DATE_INPUT_FORMATS",
-                                lang=self.language,
-                            )[0],
-                        )
-                    elif isinstance(value, datetime.time):
-                        # Convert datetime to string
-                        value = value.strftime(
-                            formats.get_format(
-                                "TIME_INPUT_FORMATS",
-                                lang=self.language,
-                            )[0],
-                        )
+                    converter = formatter.converter(type(value))
+                    if converter is not None:
+                        # Convert datetime, date and time to string
+                        value = converter(value)
                     else:
                         # Analize if is related with another field but
                         # it is not a reverse relationship
@@ -1448,6 +1723,33 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
         show_details = True                         # With 'True' it will show the details panel before editing the register (by default this is disabled, 'False')
         show_modal = True                           # With 'True' it will push the system to render the result in a modal window
         vtable = False                              # With 'True' it will use one-page-only lists with scroll detection for autoloading rows
+        keyset_pagination = True                    # With 'True' pages are fetched with cursors built from the ordering + pk instead of OFFSET/LIMIT, the client
+                                                    # moves using the opaque 'cursor_next'/'cursor_prev' from the meta structure inside the 'cursor' json key
+                                                    # (the 'exact' count strategy counts as 'cached' here, only the jumps to the last page force a COUNT(*))
+        count_strategy = 'exact'                    # How 'row_total' is calculated: 'exact' (COUNT(*) on every request), 'cached' (the COUNT(*) is kept in the
+                                                    # cache for 'count_cache_timeout' seconds for each filter/search) or 'estimated' (use the statistics of the
+                                                    # database planner when they are over 'count_estimate_threshold' rows, PostgreSQL only, otherwise 'cached'),
+                                                    # the meta structure says in 'row_total_exact' if the number is exact
+        count_cache_timeout = 60                    # Seconds to keep counters in the cache with 'cached' and 'estimated' count strategies
+        count_estimate_threshold = 100000           # Use the estimation only when the planner expects more rows than this number
+        datefilter_cache_timeout = 60               # Seconds to keep in the cache the values shown by the datetime filter for each filter/search
+        search_backend = 'fulltext'                 # Delegate the words of the search to a backend from codenerix.contrib.search_backends: 'icontains',
+                                                    # 'postgresql' (SearchVector + GIN index), 'sqlite' (FTS5), 'fulltext' (the one for the database engine)
+                                                    # or a class/dotted path, indexes are built with 'manage.py search_index'
+        search_fields = ['name', 'email']           # Fields used by the search backend (local columns for 'postgresql' and 'sqlite' backends)
+        response_cache = True                       # Keep JSON answers in the cache (per user, language and query) until a register of the model (or
+                                                    # any model in 'response_cache_models') is saved/deleted or 'response_cache_timeout' seconds pass
+        response_cache_models = [Author, Book]      # Other models shown in the list, changes on them will refresh the response cache
+        conditional_get = True                      # Answer JSON requests with an ETag built from max('updated') and count() of the filtered queryset,
+                                                    # when the client already has the answer a 304 is returned without building it (changes on related
+                                                    # models are not detected). Requests without If-None-Match reuse the count of the pagination
+        stream_json = True                          # Stream the JSON answer: meta/filter/head go first and the body rows follow in chunks of
+        stream_chunk_size = 2000                    # 'stream_chunk_size' registers read with queryset.iterator() (memory does not grow with the rows)
+        stream_csv = True                           # Stream the CSV export in chunks of 'stream_chunk_size' registers, FILE_DOWNLOAD_SIZE_MAX doesn't apply
+        export_max_rows = 1000000                   # Streamed CSV exports with more rows are answered with 413 (None for no limit)
+        export_max_seconds = 600                    # Streamed CSV exports taking longer are cut raising ExportBudgetExceeded (None for no limit)
+        body_format = 'dicts'                       # Layout of the JSON body when the client doesn't ask for one with 'body_format' in the json query
+                                                    # or 'Accept: application/json; body=rows': 'dicts', 'rows' or 'columns' (see encode_body())
         ngincludes = {'name':'path_to_partial'}     # Keep trace for ngincludes extra partials
         export_excel = True                         # Show button 'Export to excel' in the list
         export_csv = True                           # Show button 'Export to csv' in the list
@@ -1564,6 +1866,38 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
     extends_base = "base/base.html"
     autofiltering = True
     haystack = False
+    keyset_pagination = False
+    count_strategy = getattr(settings, "CODENERIX_COUNT_STRATEGY", "exact")
+    count_cache_timeout = getattr(settings, "CODENERIX_COUNT_CACHE_TIMEOUT", 60)
+    count_estimate_threshold = getattr(settings, "CODENERIX_COUNT_ESTIMATE_THRESHOLD", 100000)
+
+    datefilter_cache_timeout = getattr(settings, "CODENERIX_DATEFILTER_CACHE_TIMEOUT", 60)
+    search_backend = getattr(settings, "CODENERIX_SEARCH_BACKEND", None)
+    search_fields: list[str] = []
+    response_cache = False
+    response_cache_timeout = getattr(settings, "CODENERIX_RESPONSE_CACHE_TIMEOUT", 300)
+    response_cache_models: list[Any] = []
+    conditional_get = getattr(settings, "CODENERIX_CONDITIONAL_GET", False)
+    __validators = None
+    __validators_later = None
+    __not_modified = None
+    __paginate_later = False
+    __paginate_pending = None
+    __compiled_rules = None
+    stream_json = getattr(settings, "CODENERIX_STREAM_JSON", False)
+    stream_chunk_size = getattr(settings, "CODENERIX_STREAM_CHUNK_SIZE", 2000)
+    stream_csv = getattr(settings, "CODENERIX_STREAM_CSV", False)
+    export_max_rows = getattr(settings, "CODENERIX_EXPORT_MAX_ROWS", None)
+    export_max_seconds = getattr(settings, "CODENERIX_EXPORT_MAX_SECONDS", None)
+    body_format = getattr(settings, "CODENERIX_BODY_FORMAT", "dicts")
+    __body_format = None
+
+    # Queryset optimization plans shared by all the views in this process
+    __queryset_plans: dict[Any, dict[str, Any]] = {}
+
+    # Autofiltering structures shared by all the views in this process
+    __autosearchq_cache: dict[Any, list[str]] = {}
+    __autosearchf_cache: dict[Any, list[tuple[Any, str]]] = {}
 
     xls_style = {
         "head": {
@@ -1804,9 +2138,8 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
                 if getattr(self, "show_details", False):
                     tabs = self.get_tabs_js()
                     extra_context["tabs_js_obj"] = tabs
-                    extra_context["tabs_js"] = json.dumps(
+                    extra_context["tabs_js"] = json_dumps(
                         tabs,
-                        cls=DjangoJSONEncoder,
                     )
 
                 # Silence the normal execution from this class
@@ -1828,7 +2161,7 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
                 ),
             }
             return HttpResponse(
-                json.dumps(json_answer, cls=DjangoJSONEncoder),
+                json_dumps(json_answer),
                 content_type="application/json",
             )
 
@@ -1849,72 +2182,283 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
         # Call the base implementation
         return super().dispatch(*args, **kwargs)
 
+    def get(self, request, *args, **kwargs):
+        # Answer from the response cache
+        (cache_key, response) = self.get_cached_response()
+        if response is not None:
+            return response
+
+        with self.timing_phase("queryset"):
+            self.object_list = self.get_queryset()
+        response = self.build_response()
+
+        # Save the answer in the response cache
+        self.cache_response(cache_key, response)
+        return response
+
+    def get_cached_response(self):
+        """
+        Return (cache_key, response) with the answer from the response cache
+        for this request (the response is None when it is not there and the
+        key is None when the answer can not be cached). It is called once
+        the user is authorized, the answer is compressed afterwards like any
+        other and conditional GET is answered with the validators saved
+        with it
+        """
+        cache_key = self.__response_cache_key()
+        if not cache_key:
+            return (None, None)
+        cached = cache.get(cache_key)
+        if cached is None:
+            return (cache_key, None)
+        (content, validators) = cached
+        if validators:
+            (etag, last_modified) = validators
+            not_modified = get_conditional_response(
+                self.request,
+                etag=quote_etag(etag),
+                last_modified=last_modified,
+            )
+            if not_modified is not None:
+                return (cache_key, not_modified)
+        if self.timing_meta:
+            # The timings saved are the ones from the request that built it
+            answer = json.loads(content)
+            if isinstance(answer.get("meta", None), dict):
+                answer["meta"]["timing"] = self.timing_info()
+                content = json_dumps(answer)
+        response = HttpResponse(content, content_type="application/json")
+        if validators:
+            set_validators(response, *validators)
+        return (cache_key, response)
+
+    def cache_response(self, cache_key, response):
+        """
+        Save the answer (before it gets compressed) in the response cache
+        """
+        if cache_key and response.status_code == 200 and not response.streaming:
+            cache.set(
+                cache_key,
+                (response.content, self.__validators),
+                self.response_cache_timeout,
+            )
+
+    def build_response(self):
+        """
+        Build the answer for the registers in 'object_list'
+        """
+        # The client already has the last answer
+        if self.__not_modified is not None:
+            return self.__not_modified
+
+        if not self.get_allow_empty() and not self.object_list:
+            raise Http404(
+                __("Empty list and “%(class_name)s.allow_empty” is False.")
+                % {
+                    "class_name": self.__class__.__name__,
+                }
+            )
+        context = self.get_context_data()
+        response = self.render_to_response(context)
+
+        # Build the validators reusing the count of the pagination
+        if self.__validators_later and response.status_code == 200:
+            total = None
+            if context.get("total_registers_exact", False):
+                total = context.get("total_registers", None)
+            (queryset, signature) = self.__validators_later
+            self.__validators = queryset_validators(queryset, *signature, total=total)
+
+        # Attach the validators for the next conditional GET
+        if self.__validators and response.status_code == 200:
+            set_validators(response, *self.__validators)
+
+        return response
+
+    def __response_cache_key(self):
+        """
+        Key for the response cache of this request (None when the answer
+        can not be cached). It changes with the view, the user and their
+        permissions, the language, the query and the generation of the
+        models the list depends on
+        """
+        if not self.response_cache or self.export or not self.json_worker:
+            return None
+        if getattr(self.user, "is_superuser", False):
+            permissions = ["*"]
+        elif hasattr(self.user, "get_all_permissions"):
+            permissions = sorted(self.user.get_all_permissions())
+        else:
+            permissions = []
+        jsonquerytxt = self.request.GET.get(
+            "json",
+            self.request.POST.get("json", None),
+        )
+        if jsonquerytxt is None:
+            return None
+        try:
+            jsonquery = json.loads(jsonquerytxt)
+        except json.JSONDecodeError:
+            return None
+
+        models = [self.model, *self.response_cache_models]
+        signature = json.dumps(
+            [
+                f"{self.__class__.__module__}.{self.__class__.__qualname__}",
+                self.__kwargs,
+                getattr(self.user, "pk", None),
+                permissions,
+                get_language(),
+                jsonquery,
+                self.get_body_format(),
+                {
+                    key: self.request.GET.getlist(key)
+                    for key in sorted(self.request.GET.keys())
+                    if key != "json"
+                },
+                [model_generation(model) for model in models],
+            ],
+            sort_keys=True,
+            cls=DjangoJSONEncoder,
+        )
+        signature = hashlib.sha1(signature.encode(), usedforsecurity=False).hexdigest()
+        return f"codenerix_response_{signature}"
+
+    def get_body_format(self):
+        """
+        Layout of the body of the JSON answer (one of BODY_FORMATS) asked by
+        the client with 'body_format' in the json query or with a 'body'
+        parameter in the Accept header ('application/json; body=rows'),
+        'body_format' of the view when it doesn't ask for a known one
+        """
+        if self.__body_format is None:
+            body_format = None
+            jsonquerytxt = self.request.GET.get(
+                "json",
+                self.request.POST.get("json", None),
+            )
+            if jsonquerytxt:
+                try:
+                    jsonquery = json.loads(jsonquerytxt)
+                except json.JSONDecodeError:
+                    jsonquery = None
+                if isinstance(jsonquery, dict):
+                    body_format = jsonquery.get("body_format", None)
+            if body_format not in BODY_FORMATS:
+                for media_type in self.request.accepted_types:
+                    if media_type.match("application/json") and "body" in media_type.params:
+                        body_format = media_type.params["body"]
+                        break
+            if body_format not in BODY_FORMATS:
+                body_format = self.body_format
+            self.__body_format = body_format
+        return self.__body_format
+
+    def get_search_backend(self, using="default"):
+        """
+        Return the search backend that will look for the words written by
+        the user in 'search_fields', None when the view has no backend or no
+        'search_fields' (the words go to autoSearchQ/__searchQ__ as always)
+        """
+        if not self.search_backend or not self.search_fields:
+            return None
+        return get_search_backend(
+            self.search_backend,
+            self.model,
+            self.search_fields,
+            using,
+        )
+
     def autoSearchF(self, MODELINF) -> dict:  # noqa: N802, N803
         fields_show = [x[0] for x in MODELINF.fields()]
-        fields: dict[str, tuple] = {}
+
+        # Look for the searchable fields in the cache
+        key = (self.model, tuple(fields_show))
+        searchable = GenList.__autosearchf_cache.get(key, None)
+        if searchable is None:
+            searchable = self.__autosearchf_fields(fields_show)
+            GenList.__autosearchf_cache[key] = searchable
+
+        # Filters are built for every request (labels and choices are translated)
+        return {field.name: self.__autosearchf_filter(field, kind) for (field, kind) in searchable}
+
+    def __autosearchf_fields(self, fields_show):
+        """
+        Return the list of (field, kind) of the fields shown that get a
+        filter from autoSearchF()
+        """
+        fields: list[tuple[Any, str]] = []
         for field in self.model._meta.get_fields():  # type: ignore[union-attr]  # pyright: ignore[reportOptionalMemberAccess]
             if field.name in fields_show:
                 if type(field) in [models.CharField, models.TextField]:
                     if field.choices:
-                        fields[field.name] = (
-                            field.name,
-                            lambda x, fieldname=field.name: Q(
-                                **{f"{fieldname}": x},
-                            ),
-                            list(field.choices),
-                        )
+                        fields.append((field, "choices"))
                     else:
-                        fields[field.name] = (
-                            field.verbose_name,
-                            lambda x, fieldname=field.name: Q(
-                                **{f"{fieldname}__icontains": x},
-                            ),
-                            "input",
-                        )
+                        fields.append((field, "text"))
                 elif type(field) in [
                     models.BooleanField,
                 ]:
-                    fields[field.name] = (
-                        field.verbose_name,
-                        lambda x, fieldname=field.name: Q(
-                            **{f"{fieldname}": x},
-                        ),
-                        [(True, __("Yes")), (False, __("No"))],
-                    )
+                    fields.append((field, "boolean"))
                 elif type(field) in [
                     models.DateField,
                     models.DateTimeField,
                 ]:
-                    fields[field.name] = DateRangeFilter.factory(
-                        field.name,
-                        field.verbose_name,
-                    )
+                    fields.append((field, "date"))
                 elif type(field) in [
                     models.IntegerField,
                     models.SmallIntegerField,
                     models.PositiveIntegerField,
                     models.FloatField,
                 ]:
-                    fields[field.name] = (
-                        field.verbose_name,
-                        SearchFilters.number(field.name),
-                        "input",
-                    )
+                    fields.append((field, "number"))
         return fields
 
+    def __autosearchf_filter(self, field, kind):
+        if kind == "choices":
+            return (
+                field.name,
+                lambda x, fieldname=field.name: Q(
+                    **{f"{fieldname}": x},
+                ),
+                list(field.choices),
+            )
+        elif kind == "text":
+            return (
+                field.verbose_name,
+                lambda x, fieldname=field.name: Q(
+                    **{f"{fieldname}__icontains": x},
+                ),
+                "input",
+            )
+        elif kind == "boolean":
+            return (
+                field.verbose_name,
+                lambda x, fieldname=field.name: Q(
+                    **{f"{fieldname}": x},
+                ),
+                [(True, __("Yes")), (False, __("No"))],
+            )
+        elif kind == "date":
+            return DateRangeFilter.factory(
+                field.name,
+                field.verbose_name,
+            )
+        else:
+            return (
+                field.verbose_name,
+                SearchFilters.number(field.name),
+                "input",
+            )
+
     def autoSearchQ(self, MODELINF, text):  # noqa: N802, N803
         fields_show = [x[0] for x in MODELINF.fields()]
-        valid_fields = []
-        for field in fields_show:
-            try:
-                _ = self.model.objects.filter(  # pyright: ignore[reportOptionalMemberAccess]
-                    **{f"{field}__icontains": ""},
-                ).query
-                valid_fields.append(field)
-            except FieldError:
-                pass
-            except TypeError:
-                pass
+
+        # Look for the fields that accept 'icontains' in the cache
+        key = (self.model, tuple(fields_show))
+        valid_fields = GenList.__autosearchq_cache.get(key, None)
+        if valid_fields is None:
+            valid_fields = [x for x in fields_show if self.__icontains_field(x)]
+            GenList.__autosearchq_cache[key] = valid_fields
 
         fields = qobject_builder_string_search(valid_fields, text)
         if fields:
@@ -1923,6 +2467,40 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
             result = {}
         return result
 
+    def __icontains_field(self, name):
+        """
+        Check using the model's _meta if the field (or path to a field) can
+        be searched with 'icontains'
+        """
+        model = self.model
+        names = name.split("__")
+        for idx, fieldname in enumerate(names):
+            if fieldname == "pk":
+                field = model._meta.pk  # pyright: ignore[reportOptionalMemberAccess]
+            else:
+                try:
+                    field = model._meta.get_field(fieldname)  # pyright: ignore[reportOptionalMemberAccess]
+                except FieldDoesNotExist:
+                    return False
+            if idx + 1 == len(names):
+                # Final field, relations can not be searched as text
+                if field.is_relation or not hasattr(field, "get_lookup"):
+                    return False
+                return field.get_lookup("icontains") is not None
+            elif field.is_relation and field.related_model:
+                model = field.related_model
+            else:
+                # The path continues with transforms, let Django decide
+                break
+
+        try:
+            _ = self.model.objects.filter(  # pyright: ignore[reportOptionalMemberAccess]
+                **{f"{name}__icontains": ""},
+            ).query
+        except (FieldError, TypeError):
+            return False
+        return True
+
     def get_type_field(self, name, obj=None):
         names = remove_getdisplay(name).split("__")
         if obj is None:
@@ -2149,18 +2727,25 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
             # Spaces on front and behind
             search = search.strip()
 
+            # Full-text search backend (takes care of the words)
+            search_backend = None
+            if not self.haystack:
+                search_backend = self.get_search_backend(queryset.db)
+
             # Prepare searchs
             searchs = {}
             # Autofilter system
-            if self.autofiltering:
+            if self.autofiltering and not search_backend:
                 searchs.update(self.autoSearchQ(MODELINF, search))
 
             # Fields to search in from the MODELINF
             tmp_search = MODELINF.searchQ(search)
             if isinstance(tmp_search, dict):
                 searchs.update(tmp_search)
-            else:
+            elif "autoSearchQ" in searchs:
                 searchs["autoSearchQ"] &= tmp_search
+            else:
+                searchs["autoSearchQ"] = tmp_search
             qobjects = {}
             qobjectsCustom = {}  # noqa: N806
             for name in searchs:
@@ -2172,6 +2757,10 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
                         datetimeQ = name  # noqa: N806
                         continue
                 elif isinstance(qtoken, (str, list)):
+                    if search_backend:
+                        # The search backend will look for the words
+                        continue
+
                     # Prepare query
                     if isinstance(qtoken, tuple):
                         query, func = qtoken
@@ -2249,6 +2838,15 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
                 searchq_objects = searchq_objects & qdata
             queryset = queryset.filter(searchq_objects)
 
+            # Let the search backend look for the words
+            if search_backend and search:
+                words = [
+                    word
+                    for word in search.split(" ")
+                    if word and word.split(":")[0] not in ["id", "pk"]
+                ]
+                queryset = search_backend.filter(queryset, words)
+
         # Prepare searchF
         listfilters = {}
         # Autofilter system
@@ -2325,7 +2923,7 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
                 filters_struct[key] = value
 
         # Rewrite filters_json updated
-        filters_json = json.dumps(filters_struct, cls=DjangoJSONEncoder)
+        filters_json = json_dumps(filters_struct)
 
         # Build the clean get for filters
         get = context["get"]
@@ -2482,23 +3080,6 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
                 else:
                     break
 
-            # Get results from dates to set the new order
-            exclusion = {}
-            exclusion[datetimeQ] = None
-            date_results = queryset.exclude(**exclusion).values_list(
-                datetimeQ,
-                flat=True,
-            )
-            # Remove empty results (usefull when the date is allowed to
-            # be empty)
-            if f["day"][0] != f["day"][1]:
-                if f["month"][0] == f["month"][1]:
-                    date_results = date_results.datetimes(datetimeQ, "day")
-                elif f["year"][0] == f["year"][1]:
-                    date_results = date_results.datetimes(datetimeQ, "month")
-                else:
-                    date_results = date_results.datetimes(datetimeQ, "year")
-
             get = context["get"]
             context["datefilter"] = {}
             # Save the deepness
@@ -2521,16 +3102,12 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
                     struct["value"] = element["value"]
                     context["datefilter"]["deepnessback"].append(struct)
             # Build the list of elements
-            context["datefilter"]["data"] = []
-            for element in date_results:
-                # Save the data
-                context["datefilter"]["data"].append(
-                    timezone.localtime(element).timetuple()[deepness_index],
-                )
-            context["datefilter"]["data"] = list(
-                set(context["datefilter"]["data"]),
+            context["datefilter"]["data"] = self.__datefilter_data(
+                queryset,
+                datetimeQ,
+                f,
+                deepness_index,
             )
-            context["datefilter"]["data"].sort()
 
             # Prepare the rightnow result
             if self.json_worker:
@@ -2710,9 +3287,8 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
                 sort[order_key]["size"] = size
                 sort[order_key]["class"] = sort_class
                 if order_key and order_key[0] != "*":
-                    sort[order_key]["ordering"] = json.dumps(
+                    sort[order_key]["ordering"] = json_dumps(
                         ordering,
-                        cls=DjangoJSONEncoder,
                     ).replace(
                         '"',
                         '\\"',
@@ -2739,108 +3315,526 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
                 # selector
                 context["columns"].append(sort[field])
 
-        # Auto build rules
-        # self.__autorules = self.autorules()
-
-        # Columns
-        self.__columns = ["pk"]
-        # self.__columns = ['id']
-        self.__foreignkeys = []
-        for column in self.model._meta.fields:  # pyright: ignore[reportOptionalMemberAccess]
-            self.__columns.append(column.name)
-            if column.is_relation:
-                self.__foreignkeys.append(column.name)
-
-        # Localfields
-        self.__related_objects = []
-        for f in self.model._meta.related_objects:  # pyright: ignore[reportOptionalMemberAccess]
-            self.__related_objects.append(f.name)
-
-        # Model properties
-        model_properties = self.__columns + self.__related_objects
-
-        # === Queryset optimization ===
         # Get autorules ordered
         autorules_keys = sorted(self.__autorules.keys())
-        #
-        query_renamed = {}
-        query_optimizer = []
-        query_verifier = []
-        query_select_related = []
-        fields_related_model = []
 
-        found = False
-        for rule in autorules_keys:
-            found = False
-            # name rule origin
-            rule_org = rule
-            # If rule is an alias
-            rulesp = rule.split(":")
-            if len(rulesp) == 2:
-                alias, rule = rulesp
+        # Get the names of the annotations
+        annotation_keys = []
+        if autorules_keys and hasattr(self, "annotations"):
+            if callable(self.annotations):
+                anot = self.annotations(MODELINF)
             else:
-                alias = rule
-
-            # If rule has a foreign key path (check first level attributes
-            # only, nfrule = no foreign rule)
-            nfrule = rule.split("__")
-            do_select_related = False
-            model = self.model
-            if len(nfrule) > 1:
-                ruletmp = []
-                field_related_model = []
-                for n in nfrule:
-                    if model:
-                        for fi in model._meta.fields:
-                            if fi.name == n:
-                                found = True
-                                ruletmp.append(n)
-                                if fi.is_relation:
-                                    model = fi.related_model
-                                    field_related_model.append(fi.name)
-                                else:
-                                    do_select_related = True
-                                    model = None
-                                break
-                    if not found or model is None:
-                        break
-                if field_related_model:
-                    fields_related_model.append("__".join(field_related_model))
-
-                if ruletmp != nfrule:
-                    do_select_related = False
-            elif nfrule[0] in [x.name for x in self.model._meta.fields] or nfrule[0] == "pk":  # pyright: ignore[reportOptionalMemberAccess]
-                found = True
-                for fi in model._meta.fields:  # pyright: ignore[reportOptionalMemberAccess]
-                    if fi.name == nfrule[0] and fi.is_relation:
-                        fields_related_model.append(nfrule[0])
+                anot = self.annotations
+            annotation_keys = list(cast(dict, anot))
 
-            if not self.haystack and (do_select_related or rule in self.__foreignkeys):
-                # Compatibility with Django 1.10
-                if "__" in rule:
-                    query_select_related.append(
-                        "__".join(rule.split("__")[0:-1]),
-                    )
+        # === Queryset optimization ===
+        plan = self.__queryset_plan(autorules_keys, annotation_keys)
+        self.__columns = list(plan["columns"])
+        self.__foreignkeys = list(plan["foreignkeys"])
+        self.__related_objects = list(plan["related_objects"])
+        found = plan["found"]
+        query_renamed = {alias: F(rule) for (alias, rule) in plan["renamed"].items()}
+        query_optimizer = plan["optimizer"]
+
+        # Follow foreign keys and prefetch to-many relations when working with objects
+        if not self.haystack and not (found and plan["optimize"]):
+            if plan["select_related"]:
+                queryset = queryset.select_related(*plan["select_related"])
+            for path, (model, columns) in plan["prefetch_related"].items():
+                if columns is None:
+                    queryset = queryset.prefetch_related(path)
                 else:
-                    query_select_related.append(rule)
-
-            nfrule = nfrule[0]
+                    queryset = queryset.prefetch_related(
+                        Prefetch(path, queryset=model._default_manager.only(*columns)),
+                    )
 
-            if nfrule in self.__columns:
-                ############################
-                # dejo comentada la restriccion, si se deja y hay una FK
-                # "nunca" usaria .extra ni .value
-                # no la elimino del todo por si hubiera algun fallo mas
-                # adelante,
-                # y se tuviera que parametrizarse de algun otro modo
-                ############################
+        # If we got the query_optimizer to optimize everything, use it (search
+        # results are hydrated with the registers of the model, they stay objects)
+        # use_extra = False
+        if found and plan["optimize"] and not self.haystack:
+            # use_extra = True
+            if query_renamed:
+                # queryset=queryset.extra(select=query_renamed).values(*query_optimizer)
+                queryset = queryset.annotate(**query_renamed).values(
+                    *query_optimizer,
+                )
+            else:
+                queryset = queryset.values(*query_optimizer)
 
-                # if nfrule not in self.__foreignkeys:
-                if rule not in fields_related_model:
-                    # Save verifier name
-                    query_verifier.append(rule_org)
+        # Custom queryset
+        if hasattr(self, "custom_queryset"):
+            queryset = self.custom_queryset(queryset, MODELINF)
 
-                # Save renamed field
+        # Internal Codenerix DEBUG for Querysets
+        # pylint: disable=pointless-string-statement
+        """
+        raise Exception("FOUND: {} -- __foreignkeys: {} -- __columns: {} -- autorules_keys: {} -- \
+            query_select_related: {} -- query_renamed: {} -- query_optimizer: {} | use_extra: {}| -- \
+            query: {} -- meta.fields: {} -- fields_related_model: {} -- query_verifier: {}\
+            -- ??? {} == {}".format(
+                found,
+                self.__foreignkeys, self.__columns, autorules_keys,
+            query_select_related, query_renamed, query_optimizer,use_extra,
+            queryset.query,
+            [x.name for x in self.model._meta.fields],
+            fields_related_model, query_verifier,
+            query_verifier.sort(),autorules_keys.sort()
+            ))
+        #"""  # noqa: E501
+        # pylint: enable=pointless-string-statement
+
+        # Conditional GET (the answer is not built if the client has it)
+        if (
+            not raw_query
+            and self.conditional_get
+            and not self.export
+            and not self.haystack
+            and self.request.method in ("GET", "HEAD")
+        ):
+            signature = (
+                f"{self.__class__.__module__}.{self.__class__.__qualname__}",
+                self.__kwargs,
+                getattr(self.user, "pk", None),
+                get_language(),
+                jsonquery,
+                self.get_body_format(),
+            )
+            if not self.request.META.get("HTTP_IF_NONE_MATCH"):
+                # Nothing to check, the validators are built with the answer
+                self.__validators_later = (queryset, signature)
+            else:
+                self.__validators = queryset_validators(queryset, *signature)
+            if self.__validators:
+                (etag, last_modified) = self.__validators
+                self.__not_modified = get_conditional_response(
+                    self.request,
+                    etag=quote_etag(etag),
+                    last_modified=last_modified,
+                )
+                if self.__not_modified is not None:
+                    return []
+
+        # Check if the user requested to return a raw queryset
+        if raw_query:
+            return queryset
+        elif (
+            self.keyset_pagination
+            and not self.export
+            and not self.haystack
+            and jsondata.get("rowsperpage", self.default_rows_per_page) != "All"
+            and self.__keyset_ordering(queryset)
+        ):
+            # Paginate with cursors
+            return self.__keyset_paginate(queryset, jsondata, context)
+        else:
+            # Count and bring the registers later with the async ORM (see aget_queryset())
+            if self.__paginate_later and not self.haystack:
+                self.__paginate_pending = (queryset, jsondata, context)
+                return []
+
+            # Count the registers and bring the pages requested
+            return self.__paginate(queryset, jsondata, context)
+
+    def __paginate_all(self, jsondata):
+        """
+        Tell if all the registers will be delivered (so they must be counted)
+        """
+        rowsperpage = jsondata.get("rowsperpage", self.default_rows_per_page)
+        return bool(self.export) or rowsperpage == "All"
+
+    def __paginate(self, queryset, jsondata, context):
+        """
+        Count the registers, fill the pagination of the context and bring all
+        the pages requested with one query
+        """
+        with self.timing_phase("count"):
+            (total_registers, total_exact) = self.count_registers(
+                queryset,
+                exact=self.__paginate_all(jsondata) or jsondata.get("page", 1) == "last",
+            )
+        window = self.__pagination(jsondata, context, total_registers, total_exact)
+        if window and not total_exact and window[1] is not None and not self.haystack:
+            # Check the pagination against the rows that really are there
+            probes = self.__pagination_probes(queryset, window)
+            first = not window[0] or probes[0].exists()
+            more = probes[1].exists()
+            if self.__pagination_wrong(window, context, first, more):
+                (total_registers, total_exact) = self.count_registers(queryset, exact=True)
+                window = self.__pagination(jsondata, context, total_registers, total_exact)
+        if not window:
+            return []
+        elif self.__streaming() and not self.haystack:
+            # Rows will be read while streaming the answer
+            return queryset[window[0] : window[1]]
+        with self.timing_phase("page"):
+            if self.haystack:
+                return self.__haystack_hydrate(list(queryset[window[0] : window[1]]))
+            else:
+                return list(queryset[window[0] : window[1]])
+
+    def __pagination_probes(self, queryset, window):
+        """
+        Querysets telling if there is a row at the start of 'window' and
+        after its end
+        """
+        (start, stop) = window
+        return (queryset[start : start + 1], queryset[stop : stop + 1])
+
+    def __pagination_wrong(self, window, context, first, more):
+        """
+        Tell if a pagination made from a count that is not exact does not
+        match the rows ('first' there is a row at the start of the window,
+        'more' there are rows after it), when it does the pages after the
+        window are only announced if there are rows after it
+        """
+        if (window[0] and not first) or (more and context["page_after"] is None):
+            # The page is past the rows or the rows go on past the last page
+            return True
+        if not more:
+            last_page = context["pagenumber"] + context["pages_to_bring"] - 1
+            context["page_after"] = None
+            context["pages"] = [page for page in context["pages"] if page <= last_page]
+        return False
+
+    def __haystack_hydrate(self, results):
+        """
+        Replace the results from the search engine with the registers of the
+        model when the rules need columns that are not stored in the index,
+        all of them are brought with one query (results missing in the
+        database are kept as they are)
+        """
+        if not results:
+            return results
+
+        # Check if the index is enough to build the body
+        stored = {"pk"}
+        for name, field in results[0].searchindex.fields.items():
+            if field.stored:
+                stored.add(name)
+        rules = [rule.split(":")[-1] for rule in self.__autorules]
+        if all(rule in stored for rule in rules):
+            return results
+
+        # Bring the registers with the optimization from the queryset plan
+        plan = self.__queryset_plan(
+            sorted(self.__autorules.keys()),
+            [],
+        )
+        queryset = self.model._default_manager.all()  # pyright: ignore[reportOptionalMemberAccess]
+        if plan["select_related"]:
+            queryset = queryset.select_related(*plan["select_related"])
+        for path, (model, columns) in plan["prefetch_related"].items():
+            if columns is None:
+                queryset = queryset.prefetch_related(path)
+            else:
+                queryset = queryset.prefetch_related(
+                    Prefetch(path, queryset=model._default_manager.only(*columns)),
+                )
+        objects = {str(pk): obj for (pk, obj) in queryset.in_bulk([r.pk for r in results]).items()}
+        return [objects.get(str(r.pk), r) for r in results]
+
+    def __pagination(self, jsondata, context, total_registers, total_exact):
+        """
+        Fill the pagination of the context for 'total_registers' and return
+        the window (start, stop) of registers to bring, None if there is none
+        """
+        total_rows_per_page = jsondata.get(
+            "rowsperpage",
+            self.default_rows_per_page,
+        )
+        pages_to_bring = jsondata.get("pages_to_bring", 1)
+        if self.export:
+            # Bring all pages overriding any other action
+            total_rows_per_page = total_registers
+        elif total_rows_per_page is None:
+            # Bring default pages
+            total_rows_per_page = self.default_rows_per_page
+        elif total_rows_per_page == "All":
+            # Bring all pages
+            total_rows_per_page = total_registers
+
+        # Rows per page
+        if total_rows_per_page:
+            try:
+                total_rows_per_page = int(total_rows_per_page)
+            except Exception:
+                total_rows_per_page = "All"
+        else:
+            total_rows_per_page = self.default_rows_per_page
+        if total_rows_per_page == "All":
+            page_number = 1
+            total_rows_per_page = total_registers
+            total_rows_per_page_out = __("All")
+            total_pages = 1
+        else:
+            total_rows_per_page = int(
+                total_rows_per_page,
+            )  # By default 10 rows per page
+            total_rows_per_page_out = total_rows_per_page
+            total_pages = int(total_registers / total_rows_per_page)
+            if total_registers % total_rows_per_page:
+                total_pages += 1
+            page_number = jsondata.get(
+                "page",
+                1,
+            )  # If no page specified use first page
+            if page_number == "last":
+                page_number = total_pages
+            else:
+                try:
+                    page_number = int(page_number)
+                except Exception:
+                    page_number = 1
+                page_number = max(page_number, 1)
+                page_number = min(page_number, total_pages)
+
+        # Save the pagination in the structure
+        context["rowsperpageallowed"] = self.__rowsperpage_allowed(total_registers)
+        context["rowsperpage"] = total_rows_per_page_out
+        context["pages_to_bring"] = pages_to_bring
+        context["pagenumber"] = page_number
+
+        # Get the full number of registers and save it to context
+        context["total_registers"] = total_registers
+        context["total_registers_exact"] = total_exact
+        if total_rows_per_page == "All":
+            # Remove total_rows_per_page if is all
+            total_rows_per_page = None
+            context["page_before"] = None
+            context["page_after"] = None
+            context["start_register"] = 1
+            context["showing_registers"] = total_registers
+        else:
+            # Page before
+            if page_number <= 1:
+                context["page_before"] = None
+            else:
+                context["page_before"] = page_number - 1
+            # Page after
+            if page_number >= total_pages:
+                context["page_after"] = None
+            else:
+                context["page_after"] = page_number + 1
+            # Starting on register number
+            context["start_register"] = (page_number - 1) * total_rows_per_page + 1
+            context["showing_registers"] = total_rows_per_page
+
+        # Calculate end
+        context["end_register"] = min(
+            context["start_register"] + context["showing_registers"] - 1,
+            total_registers,
+        )
+
+        # Window of registers to bring (all the pages requested)
+        window = None
+        if total_registers and page_number:
+            offset = context["start_register"] - 1
+            if self.__paginate_all(jsondata):
+                window = (offset, None)
+            else:
+                window = (offset, offset + context["showing_registers"] * pages_to_bring)
+
+        # Fill pages
+        if total_registers:
+            context["pages"] = pages(range(1, total_pages + 1), page_number)
+            # Make sure all the pages we are delivering are in the list
+            last_page = min(page_number + pages_to_bring - 1, total_pages)
+            for page in range(page_number + 1, last_page + 1):
+                if page not in context["pages"]:
+                    context["pages"].append(page)
+            context["pages"].sort()
+        else:
+            context["pages"] = []
+
+        # Return the window
+        return window
+
+    async def __afetch(self, queryset, window):
+        return [obj async for obj in queryset[window[0] : window[1]]]
+
+    async def __apaginate(self, queryset, jsondata, context):
+        """
+        Asynchronous __paginate(), the async ORM runs the queries one after
+        the other in the thread of the connection (as the synchronous views
+        do), the event loop is free meanwhile
+        """
+        (total_registers, total_exact) = await self.acount_registers(
+            queryset,
+            self.__paginate_all(jsondata) or jsondata.get("page", 1) == "last",
+        )
+        window = self.__pagination(jsondata, context, total_registers, total_exact)
+        if window and not total_exact and window[1] is not None:
+            # Check the pagination against the rows that really are there
+            probes = self.__pagination_probes(queryset, window)
+            first = not window[0] or await probes[0].aexists()
+            more = await probes[1].aexists()
+            if self.__pagination_wrong(window, context, first, more):
+                (total_registers, total_exact) = await self.acount_registers(queryset, True)
+                window = self.__pagination(jsondata, context, total_registers, total_exact)
+        if not window:
+            return []
+        elif self.__streaming():
+            # Rows will be read while streaming the answer
+            return queryset[window[0] : window[1]]
+        return await self.__afetch(queryset, window)
+
+    def __datefilter_data(self, queryset, datetimeQ, f, deepness_index):  # noqa: N803
+        """
+        Get the sorted list of values available for the next element of the
+        date filter (years, months of a year, days of a month...), the
+        bucketing is done by the database and the result is cached for the
+        filter of the queryset
+        """
+        # Remove empty results (usefull when the date is allowed to be empty)
+        queryset = queryset.exclude(**{datetimeQ: None})
+
+        if self.haystack:
+            # Search engines can not group, work out the list by hand
+            date_results = queryset.values_list(datetimeQ, flat=True)
+            if f["day"][0] != f["day"][1]:
+                if f["month"][0] == f["month"][1]:
+                    date_results = date_results.datetimes(datetimeQ, "day")
+                elif f["year"][0] == f["year"][1]:
+                    date_results = date_results.datetimes(datetimeQ, "month")
+                else:
+                    date_results = date_results.datetimes(datetimeQ, "year")
+            data = set()
+            for element in date_results:
+                data.add(timezone.localtime(element).timetuple()[deepness_index])
+            return sorted(data)
+
+        # Let the database extract the element (weekday when everything is set)
+        lookups = ["year", "month", "day", "hour", "minute", "second", "iso_week_day"]
+        lookup = lookups[deepness_index]
+        if settings.USE_TZ:
+            tzinfo = timezone.get_current_timezone()
+        else:
+            tzinfo = None
+        date_results = (
+            queryset.annotate(
+                codenerix_datefilter=Extract(datetimeQ, lookup, tzinfo=tzinfo),
+            )
+            .order_by("codenerix_datefilter")
+            .values_list("codenerix_datefilter", flat=True)
+            .distinct()
+        )
+
+        # Look for it in the cache
+        signature = queryset_signature(date_results)
+        if signature is not None:
+            # New or removed registers must show up right away
+            cache_key = f"codenerix_datefilter_{signature}_{model_generation(self.model)}"
+            data = cache.get(cache_key)
+            if data is not None:
+                return data
+        data = list(date_results)
+        if lookup == "iso_week_day":
+            # Keep the numbering from timetuple() (Monday is 0)
+            data = [x - 1 for x in data]
+        if signature is not None:
+            cache.set(cache_key, data, self.datefilter_cache_timeout)
+
+        return data
+
+    def __queryset_plan(self, autorules_keys, annotation_keys):
+        """
+        Analyze the model and the rules of the view to decide which
+        select_related(), annotate() and values() will optimize the queryset.
+        The result only depends on the view, its rules and annotations so it
+        is calculated once per process and kept in GenList.__queryset_plans
+        """
+        key = (
+            self.__class__,
+            self.model,
+            self.haystack,
+            tuple(autorules_keys),
+            tuple(annotation_keys),
+        )
+        plan = GenList.__queryset_plans.get(key, None)
+        if plan is not None:
+            return plan
+
+        # Columns
+        columns = ["pk"]
+        # columns = ['id']
+        foreignkeys = []
+        for column in self.model._meta.fields:  # pyright: ignore[reportOptionalMemberAccess]
+            columns.append(column.name)
+            if column.is_relation:
+                foreignkeys.append(column.name)
+
+        # Localfields
+        related_objects = []
+        for f in self.model._meta.related_objects:  # pyright: ignore[reportOptionalMemberAccess]
+            related_objects.append(f.name)
+
+        # Model properties
+        model_properties = columns + related_objects
+
+        #
+        query_renamed = {}
+        query_optimizer = []
+        query_verifier = []
+        fields_related_model = []
+
+        found = False
+        for rule in autorules_keys:
+            found = False
+            # name rule origin
+            rule_org = rule
+            # If rule is an alias
+            rulesp = rule.split(":")
+            if len(rulesp) == 2:
+                alias, rule = rulesp
+            else:
+                alias = rule
+
+            # If rule has a foreign key path (check first level attributes
+            # only, nfrule = no foreign rule)
+            nfrule = rule.split("__")
+            model = self.model
+            if len(nfrule) > 1:
+                ruletmp = []
+                field_related_model = []
+                for n in nfrule:
+                    if model:
+                        for fi in model._meta.fields:
+                            if fi.name == n:
+                                found = True
+                                ruletmp.append(n)
+                                if fi.is_relation:
+                                    model = fi.related_model
+                                    field_related_model.append(fi.name)
+                                else:
+                                    model = None
+                                break
+                    if not found or model is None:
+                        break
+                if field_related_model:
+                    fields_related_model.append("__".join(field_related_model))
+            elif nfrule[0] in [x.name for x in self.model._meta.fields] or nfrule[0] == "pk":  # pyright: ignore[reportOptionalMemberAccess]
+                found = True
+                for fi in model._meta.fields:  # pyright: ignore[reportOptionalMemberAccess]
+                    if fi.name == nfrule[0] and fi.is_relation:
+                        fields_related_model.append(nfrule[0])
+
+            nfrule = nfrule[0]
+
+            if nfrule in columns:
+                ############################
+                # dejo comentada la restriccion, si se deja y hay una FK
+                # "nunca" usaria .extra ni .value
+                # no la elimino del todo por si hubiera algun fallo mas
+                # adelante,
+                # y se tuviera que parametrizarse de algun otro modo
+                ############################
+
+                # if nfrule not in foreignkeys:
+                if rule not in fields_related_model:
+                    # Save verifier name
+                    query_verifier.append(rule_org)
+
+                # Save renamed field
                 if alias != rule:
                     query_renamed[alias] = F(rule)
                     query_optimizer.append(alias)
@@ -2849,14 +3843,8 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
                     query_optimizer.append(rule)
 
             if hasattr(self, "annotations"):
-                # Prepare annotations
-                if callable(self.annotations):
-                    anot = self.annotations(MODELINF)
-                else:
-                    anot = self.annotations
-
                 # Process annotations
-                for xnfrule in cast(dict, anot):
+                for xnfrule in annotation_keys:
                     found = True
                     if xnfrule not in query_verifier:
                         query_verifier.append(xnfrule)
@@ -2866,21 +3854,20 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
                 query_renamed = {}
                 query_optimizer = []
                 query_verifier = []
-                query_select_related = []
                 break
 
         for rename in query_renamed:
             if rename in model_properties:
-                if rename in self.__foreignkeys:
+                if rename in foreignkeys:
                     msg = (
                         "Invalid alias. The alias '{}' is a foreign key "
                         " from model '{}' inside app '{}'"
                     )
-                elif rename in self.__columns:
+                elif rename in columns:
                     msg = (
                         "Invalid alias. The alias '{}' is a columns from model '{}' inside app '{}'"
                     )
-                elif rename in self.__related_objects:
+                elif rename in related_objects:
                     msg = (
                         "Invalid alias. The alias '{}' is a related "
                         "object from model '{}' inside app '{}'"
@@ -2893,197 +3880,369 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
                     msg.format(rename, self._modelname, self._appname),
                 )
 
-        if found and query_select_related:
-            queryset = queryset.select_related(*query_select_related)
-
-        # If we got the query_optimizer to optimize everything, use it
-        # use_extra = False
+        # Check if the query_optimizer will optimize everything (to-many
+        # relations can not be optimized, values() would repeat the rows)
         query_verifier.sort()
-        autorules_keys.sort()
-        if found and query_verifier == autorules_keys:
-            # use_extra = True
-            if query_renamed:
-                # queryset=queryset.extra(select=query_renamed).values(*query_optimizer)
-                queryset = queryset.annotate(**query_renamed).values(
-                    *query_optimizer,
-                )
+        prefetch_related = self.__prefetch_plan(autorules_keys)
+        plan = {
+            "columns": columns,
+            "foreignkeys": foreignkeys,
+            "related_objects": related_objects,
+            "found": found,
+            "select_related": self.__select_related_plan(autorules_keys),
+            "renamed": {alias: rule.name for (alias, rule) in query_renamed.items()},
+            "optimizer": query_optimizer,
+            "optimize": query_verifier == sorted(autorules_keys) and not prefetch_related,
+            "prefetch_related": prefetch_related,
+        }
+        GenList.__queryset_plans[key] = plan
+        return plan
+
+    def __select_related_plan(self, autorules_keys):
+        """
+        Find the foreign keys (and one to one relations) followed by the
+        rules, they are brought with select_related() whenever the body is
+        built from objects so bodybuilder() doesn't query them for every row
+        """
+        paths = []
+        for rule_org in autorules_keys:
+            rule = rule_org.split(":")[-1]
+
+            # Walk the forward relations of the rule
+            model = self.model
+            path = []
+            for name in rule.split("__"):
+                field = None
+                if model is not None:
+                    for fi in model._meta.fields:
+                        if fi.name == name:
+                            field = fi
+                            break
+                if field is None or not field.is_relation:
+                    break
+                path.append(name)
+                model = field.related_model
+            if path:
+                related = "__".join(path)
+                if related not in paths:
+                    paths.append(related)
+        return paths
+
+    def __prefetch_plan(self, autorules_keys):
+        """
+        Find the to-many relations reached by the rules (bodybuilder() reads
+        them with .all() for every row) and the columns needed from the
+        related model. Returns a dictionary {path: (model, columns)} where
+        columns is None when the whole related object is needed
+        """
+        prefetch = {}
+        for rule_org in autorules_keys:
+            rulesp = rule_org.split(":")
+            if len(rulesp) == 2:
+                rule = rulesp[1]
             else:
-                queryset = queryset.values(*query_optimizer)
+                rule = rule_org
 
-        # Custom queryset
-        if hasattr(self, "custom_queryset"):
-            queryset = self.custom_queryset(queryset, MODELINF)
+            # Walk the relations of the rule
+            names = rule.split("__")
+            model = self.model
+            path = []
+            last = None
+            tomany = False
+            for name in names:
+                try:
+                    field = model._meta.get_field(name)  # pyright: ignore[reportOptionalMemberAccess]
+                except FieldDoesNotExist:
+                    break
+                if not field.is_relation or field.related_model is None:
+                    break
+                path.append(name)
+                tomany = tomany or field.many_to_many or field.one_to_many
+                model = field.related_model
+                last = field
+            if not tomany:
+                continue
+
+            # Decide which columns are needed from the related model
+            columns = None
+            tail = names[len(path) :]
+            if len(tail) == 1 and not isinstance(self.__autorules.get(rule_org), dict):
+                try:
+                    field = model._meta.get_field(tail[0])  # pyright: ignore[reportOptionalMemberAccess]
+                except FieldDoesNotExist:
+                    field = None
+                if field is not None and field.concrete and not field.is_relation:
+                    columns = [field.attname]
+                    if last.one_to_many:  # pyright: ignore[reportOptionalMemberAccess]
+                        # The prefetch needs the foreign key to link the rows
+                        columns.append(last.field.attname)  # pyright: ignore[reportOptionalMemberAccess]
+
+            # Join with other rules using the same path
+            path = "__".join(path)
+            if path in prefetch:
+                if prefetch[path][1] is None or columns is None:
+                    columns = None
+                else:
+                    columns = sorted(set(prefetch[path][1] + columns))
+            prefetch[path] = (model, columns)
 
-        # Internal Codenerix DEBUG for Querysets
-        # pylint: disable=pointless-string-statement
+        # Relations prefetched through a deeper path need their full objects
+        for path, (model, _) in prefetch.items():
+            if [x for x in prefetch if x.startswith(f"{path}__")]:
+                prefetch[path] = (model, None)
+
+        return dict(sorted(prefetch.items()))
+
+    def count_registers(self, queryset, exact=False):
         """
-        raise Exception("FOUND: {} -- __foreignkeys: {} -- __columns: {} -- autorules_keys: {} -- \
-            query_select_related: {} -- query_renamed: {} -- query_optimizer: {} | use_extra: {}| -- \
-            query: {} -- meta.fields: {} -- fields_related_model: {} -- query_verifier: {}\
-            -- ??? {} == {}".format(
-                found,
-                self.__foreignkeys, self.__columns, autorules_keys,
-            query_select_related, query_renamed, query_optimizer,use_extra,
-            queryset.query,
-            [x.name for x in self.model._meta.fields],
-            fields_related_model, query_verifier,
-            query_verifier.sort(),autorules_keys.sort()
-            ))
-        #"""  # noqa: E501
-        # pylint: enable=pointless-string-statement
+        Count the registers of the queryset following 'count_strategy' and
+        return a tuple (total, exact), with 'exact' set a COUNT(*) is forced
+        """
+        if exact:
+            strategy = "exact"
+        else:
+            strategy = self.count_strategy
+        return queryset_count(
+            queryset,
+            strategy,
+            self.count_cache_timeout,
+            self.count_estimate_threshold,
+        )
 
-        # Check if the user requested to return a raw queryset
-        if raw_query:
-            return queryset
+    async def acount_registers(self, queryset, exact=False):
+        """
+        Asynchronous count_registers()
+        """
+        if exact:
+            strategy = "exact"
         else:
-            # Check the total count of registers + rows per page
-            total_rows_per_page = jsondata.get(
-                "rowsperpage",
-                self.default_rows_per_page,
-            )
-            pages_to_bring = jsondata.get("pages_to_bring", 1)
-            if self.export:
-                # Bring all pages overriding any other action
-                total_rows_per_page = queryset.count()
-            elif total_rows_per_page is None:
-                # Bring default pages
-                total_rows_per_page = self.default_rows_per_page
-            elif total_rows_per_page == "All":
-                # Bring all pages
-                total_rows_per_page = queryset.count()
-            paginator = Paginator(queryset, total_rows_per_page)
-            total_registers = paginator.count
-
-            # Rows per page
-            if total_rows_per_page:
-                try:
-                    total_rows_per_page = int(total_rows_per_page)
-                except Exception:
-                    total_rows_per_page = "All"
-            else:
-                total_rows_per_page = self.default_rows_per_page
-            if total_rows_per_page == "All":
+            strategy = self.count_strategy
+        return await aqueryset_count(
+            queryset,
+            strategy,
+            self.count_cache_timeout,
+            self.count_estimate_threshold,
+        )
+
+    async def aget_queryset(self):
+        """
+        Asynchronous get_queryset(), the queryset is built by get_queryset()
+        (the hooks may use the database) and the registers are counted and
+        brought with the async ORM
+        """
+        self.__paginate_later = True
+        self.__paginate_pending = None
+        try:
+            object_list = await sync_to_async(self.get_queryset)()
+        finally:
+            self.__paginate_later = False
+        if self.__paginate_pending:
+            (queryset, jsondata, context) = self.__paginate_pending
+            self.__paginate_pending = None
+            object_list = await self.__apaginate(queryset, jsondata, context)
+        return object_list
+
+    def __rowsperpage_allowed(self, total_registers):
+        # Build the list of page counters allowed
+        choice = {}
+        c = self.default_rows_per_page
+        chk = 1
+        while total_registers >= c:
+            choice[c] = c
+            if chk == 1:
+                # From 5 to 10
+                c = c * 2
+                # Next level
+                chk = 2
+            elif chk == 2:
+                # From 10 to 25 (10*2+10/2)
+                c = c * 2 + int(c / 2)
+                # Next level
+                chk = 3
+            elif chk == 3:
+                # From 25 to 50
+                c *= 2
+                chk = 1
+            # Don't give a too long choice
+            if c > 2000:
+                break
+
+        # Add all choice in any case
+        if settings.ALL_PAGESALLOWED:
+            choice["All"] = __("All")
+
+        return choice
+
+    def __keyset_ordering(self, queryset):
+        """
+        Return the ordering used by keyset pagination (the ordering of the
+        queryset finished with the primary key so it is stable) or None when
+        the queryset can not be paginated with cursors
+        """
+        ordering = []
+        for name in queryset.query.order_by:
+            if not isinstance(name, str) or name == "?":
+                return None
+            # Relations follow the ordering of the related model like order_by() does
+            names = keyset_expand(self.model, name)
+            if names is None:
+                return None
+            ordering.extend(names)
+
+        # Make sure the ordering is unique
+        pkname = self.model._meta.pk.name
+        if not [name for name in ordering if name.lstrip("-") in ("pk", pkname)]:
+            ordering.append("pk")
+
+        return ordering
+
+    def __keyset_paginate(self, queryset, jsondata, context):
+        """
+        Paginate the queryset using cursors: the client sends the cursor
+        received in 'cursor_next' or 'cursor_prev' and the rows are selected
+        with a WHERE on the ordering columns instead of an OFFSET. Requests
+        without a valid cursor (first load, jumps between pages) fall back
+        to a plain slice, the last page is read backwards from the end
+        """
+        ordering = self.__keyset_ordering(queryset)
+        keys = [f"codenerix_cursor_{idx}" for idx in range(len(ordering))]
+
+        # Rows per page
+        total_rows_per_page = jsondata.get("rowsperpage", self.default_rows_per_page)
+        try:
+            total_rows_per_page = int(total_rows_per_page)
+        except Exception:
+            total_rows_per_page = self.default_rows_per_page
+        if total_rows_per_page <= 0:
+            total_rows_per_page = self.default_rows_per_page
+        pages_to_bring = jsondata.get("pages_to_bring", 1)
+        size = total_rows_per_page * pages_to_bring
+
+        # Get the number of registers (a COUNT(*) on every page would make
+        # the latency grow with the table, it is kept in the cache)
+        strategy = self.count_strategy
+        if strategy == "exact":
+            strategy = "cached"
+        (total_registers, total_exact) = queryset_count(
+            queryset,
+            strategy,
+            self.count_cache_timeout,
+            self.count_estimate_threshold,
+        )
+        if jsondata.get("page", 1) == "last" and not total_exact:
+            # The size of the last page must be known to read it backwards
+            (total_registers, total_exact) = self.count_registers(queryset, exact=True)
+        total_pages = int(total_registers / total_rows_per_page)
+        if total_registers % total_rows_per_page:
+            total_pages += 1
+
+        # Page number
+        page_number = jsondata.get("page", 1)
+        if page_number == "last":
+            page_number = total_pages
+        else:
+            try:
+                page_number = int(page_number)
+            except Exception:
                 page_number = 1
-                total_rows_per_page = total_registers
-                total_rows_per_page_out = __("All")
-                total_pages = 1
-            else:
-                total_rows_per_page = int(
-                    total_rows_per_page,
-                )  # By default 10 rows per page
-                total_rows_per_page_out = total_rows_per_page
-                total_pages = int(total_registers / total_rows_per_page)
-                if total_registers % total_rows_per_page:
-                    total_pages += 1
-                page_number = jsondata.get(
-                    "page",
-                    1,
-                )  # If no page specified use first page
-                if page_number == "last":
-                    page_number = total_pages
-                else:
-                    try:
-                        page_number = int(page_number)
-                    except Exception:
-                        page_number = 1
-                    page_number = max(page_number, 1)
-                    page_number = min(page_number, total_pages)
-
-            # Build the list of page counters allowed
-            choice = {}
-            c = self.default_rows_per_page
-            chk = 1
-            while total_registers >= c:
-                choice[c] = c
-                if chk == 1:
-                    # From 5 to 10
-                    c = c * 2
-                    # Next level
-                    chk = 2
-                elif chk == 2:
-                    # From 10 to 25 (10*2+10/2)
-                    c = c * 2 + int(c / 2)
-                    # Next level
-                    chk = 3
-                elif chk == 3:
-                    # From 25 to 50
-                    c *= 2
-                    chk = 1
-                # Don't give a too long choice
-                if c > 2000:
-                    break
+            page_number = max(page_number, 1)
+            page_number = min(page_number, total_pages)
 
-            # Add all choice in any case
-            if settings.ALL_PAGESALLOWED:
-                choice["All"] = __("All")
-
-            # Save the pagination in the structure
-            context["rowsperpageallowed"] = choice
-            context["rowsperpage"] = total_rows_per_page_out
-            context["pages_to_bring"] = pages_to_bring
-            context["pagenumber"] = page_number
-
-            # Get the full number of registers and save it to context
-            context["total_registers"] = total_registers
-            if total_rows_per_page == "All":
-                # Remove total_rows_per_page if is all
-                total_rows_per_page = None
-                context["page_before"] = None
-                context["page_after"] = None
-                context["start_register"] = 1
-                context["showing_registers"] = total_registers
+        # Get the cursor (ignore it if it is broken or from another ordering)
+        cursor = None
+        if jsondata.get("cursor", None):
+            try:
+                cursor = signing.loads(jsondata["cursor"], salt="codenerix.keyset")
+            except signing.BadSignature:
+                cursor = None
+            if not isinstance(cursor, dict) or cursor.get("o") != ordering:
+                cursor = None
+
+        # Decide how to reach the page
+        offset = 0
+        if cursor:
+            backwards = cursor["d"] == "p"
+        elif total_pages > 1 and page_number == total_pages and total_exact:
+            # Read the last page backwards
+            backwards = True
+            size = total_registers - (total_pages - 1) * total_rows_per_page
+        else:
+            backwards = False
+            offset = max(page_number - 1, 0) * total_rows_per_page
+
+        # Build the ordering (reversed when going backwards)
+        if backwards:
+            nulls = {"nulls_first": True}
+        else:
+            nulls = {"nulls_last": True}
+        expressions = []
+        for name in ordering:
+            expression = F(name.lstrip("-"))
+            if name.startswith("-") != backwards:
+                expressions.append(expression.desc(**nulls))
             else:
-                # Page before
-                if page_number <= 1:
-                    context["page_before"] = None
-                else:
-                    context["page_before"] = page_number - 1
-                # Page after
-                if page_number >= total_pages:
-                    context["page_after"] = None
-                else:
-                    context["page_after"] = page_number + 1
-                # Starting on register number
-                context["start_register"] = (page_number - 1) * total_rows_per_page + 1
-                context["showing_registers"] = total_rows_per_page
-
-            # Calculate end
-            context["end_register"] = min(
-                context["start_register"] + context["showing_registers"] - 1,
-                total_registers,
+                expressions.append(expression.asc(**nulls))
+        queryset = queryset.annotate(
+            **{key: F(name.lstrip("-")) for (key, name) in zip(keys, ordering, strict=True)},
+        ).order_by(*expressions)
+        if cursor:
+            queryset = queryset.filter(keyset_filter(ordering, cursor["v"], backwards))
+
+        # Get the registers
+        regs = list(queryset[offset : offset + size])
+        if backwards:
+            regs.reverse()
+
+        # Get the cursor values (remove them from optimized answers)
+        values = []
+        for reg in regs:
+            if isinstance(reg, dict):
+                values.append([reg.pop(key) for key in keys])
+            else:
+                values.append([getattr(reg, key) for key in keys])
+
+        # Save the pagination in the structure
+        context["rowsperpageallowed"] = self.__rowsperpage_allowed(total_registers)
+        context["rowsperpage"] = total_rows_per_page
+        context["pages_to_bring"] = pages_to_bring
+        context["pagenumber"] = page_number
+        context["total_registers"] = total_registers
+        context["total_registers_exact"] = total_exact
+        if page_number <= 1:
+            context["page_before"] = None
+        else:
+            context["page_before"] = page_number - 1
+        if page_number + pages_to_bring - 1 >= total_pages or (len(regs) < size and not backwards):
+            # There are no more rows after the ones read
+            context["page_after"] = None
+        else:
+            context["page_after"] = page_number + pages_to_bring
+        context["start_register"] = (page_number - 1) * total_rows_per_page + 1
+        context["showing_registers"] = total_rows_per_page
+        context["end_register"] = (
+            context["start_register"] + min(len(regs), total_rows_per_page) - 1
+        )
+
+        # Build the cursors
+        if values and context["page_before"]:
+            context["cursor_prev"] = signing.dumps(
+                {"o": ordering, "d": "p", "v": [keyset_value(x) for x in values[0]]},
+                salt="codenerix.keyset",
+            )
+        if values and context["page_after"]:
+            context["cursor_next"] = signing.dumps(
+                {"o": ordering, "d": "n", "v": [keyset_value(x) for x in values[-1]]},
+                salt="codenerix.keyset",
             )
 
-            # Add pagination
-            regs = []
-            if paginator.count:
-                desired_page_number = page_number
-                for _ in range(pages_to_bring):
-                    try:
-                        regs += paginator.page(desired_page_number)
-                        desired_page_number += 1
-                    except PageNotAnInteger:
-                        # If page is not an integer, deliver first page.
-                        regs += paginator.page(1)
-                        desired_page_number = 2
-                    except EmptyPage:
-                        # If page is out of range (e.g. 9999), deliver
-                        # last page of results.
-                        if pages_to_bring == 1:
-                            regs += paginator.page(paginator.num_pages)
-                        # Leave bucle
-                        break
-
-            # Fill pages
-            if total_registers:
-                context["pages"] = pages(paginator, page_number)
-                for _ in range(pages_to_bring - 1):
-                    page_number += 1
-                    context["pages"] += pages(paginator, page_number)
-            else:
-                context["pages"] = []
+        # Fill pages
+        if total_registers:
+            context["pages"] = pages(range(1, total_pages + 1), page_number)
+        else:
+            context["pages"] = []
 
-            # Return queryset
-            return regs
+        # Return the registers
+        return regs
 
     def get_context_data(self, **kwargs):
         """
@@ -3201,6 +4360,7 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
                 "month",
                 "filters",
                 "page",
+                "cursor",
                 "pages_to_bring",
                 "rowsperpage",
                 "year",
@@ -3261,10 +4421,17 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
             a["rowsperpage"] = __(context["rowsperpage"])
         a["rowsperpageallowed"] = context["rowsperpageallowed"]
         a["row_total"] = context["total_registers"]
+        a["row_total_exact"] = context.get("total_registers_exact", True)
         if a["row_total"]:
             a["row_first"] = context["start_register"]
             a["row_last"] = context["end_register"]
 
+        # Cursors for keyset pagination
+        for key, page in [("cursor_next", "page_after"), ("cursor_prev", "page_before")]:
+            if context.get(key, None):
+                a[key] = context[key]
+                a[page] = context[page]
+
         # Adapter
         if settings.ALL_PAGESALLOWED:
             translate_key = list(a["rowsperpageallowed"].keys())[-1]
@@ -3325,9 +4492,14 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
                 token["choicedynamic"] = argument
                 token["choosen"] = value
 
-                func = resolve(argument[1] + "*").func
-                clss = get_class(func)
-                token["choices"] = clss().get_choices(value)  # pyright: ignore[reportOptionalCall]
+                # Labels of the selected values only
+                if value:
+                    clss = get_view_class(argument[1] + "*")
+                    view = clss()  # pyright: ignore[reportOptionalCall]
+                    view.language = self.language  # pyright: ignore[reportAttributeAccessIssue]
+                    token["choices"] = view.get_choices(value)  # pyright: ignore[reportAttributeAccessIssue]
+                else:
+                    token["choices"] = []
 
             elif typekind in ["daterange", "input", "checkbox"]:
                 # Decide kind
@@ -3443,6 +4615,7 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
             "search",
             "search_filter_button",
             "page",
+            "cursor",
             "pages_to_bring",
             "rowsperpage",
             "filters",
@@ -3500,51 +4673,27 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
         return a
 
     def bodybuilder(self, object_list, rules):
+        # Compile the rules once per request
+        columns = self.__compile_rules(rules)
+        converter = ValueFormatter.get(self.language, localtime=True).converter
+
+        # Methods with a bulk version are computed once for the whole page
+        object_list = list(object_list)
+        columns = self.__bulk_columns(columns, object_list)
+
         # Initialize answer
         body = []
 
         # Process all the list
         for obj in object_list:
-            # Initialize our token
-            token = {}
-
             # Check if we got a dict (optimized answer)
             if isinstance(obj, dict):
                 # Check all items if they need conversion
+                token = {}
                 for key, value in obj.items():
-                    # Rewrite values if required
-                    if isinstance(value, datetime.datetime):
-                        # Convert datetime to string
-                        value = (
-                            value.replace(tzinfo=ZoneInfo("UTC"))
-                            .astimezone(tz.tzlocal())
-                            .strftime(
-                                formats.get_format(
-                                    "DATETIME_INPUT_FORMATS",
-                                    lang=self.language,
-                                )[0],
-                            )
-                        )
-                    elif isinstance(value, datetime.date):
-                        # Convert datetime to string
-                        value = value.strftime(
-                            formats.get_format(
-                                "DATE_INPUT_FORMATS",
-                                lang=self.language,
-                            )[0],
-                        )
-                    elif isinstance(value, datetime.time):
-                        # Convert datetime to string
-                        value = value.strftime(
-                            formats.get_format(
-                                "TIME_INPUT_FORMATS",
-                                lang=self.language,
-                            )[0],
-                        )
-                    elif isinstance(value, Decimal):
-                        # Convert Decimal to float
-                        value = float(value)
-                    # Save token
+                    convert = converter(type(value))
+                    if convert is not None:
+                        value = convert(value)
                     token[key] = value
 
             else:
@@ -3553,105 +4702,7 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
                 obj.codenerix_request = self.codenerix_request
 
                 # Process all rules
-                for rktemp in rules:
-                    # Get the value
-                    rkval = rules[rktemp]
-                    # Check if as an alias
-                    rktempsp = rktemp.split(":")
-                    if len(rktempsp) == 1:
-                        alias = rktemp
-                        rk = rktemp
-                    else:
-                        alias = rktempsp[0]
-                        rk = rktempsp[1]
-
-                    # Get actual value
-                    rksp = rk.split("__")
-                    head = rksp[0]
-                    if len(rksp) > 1:
-                        tail = "__".join(rksp[1:])
-                    else:
-                        tail = None
-                    # value=getattr(o,head,None)  # 2016.02.24 Quitamos None
-                    # para que aparezca la exception
-                    value = getattr(obj, head)
-
-                    # If value is None or a basic type, return as is
-                    if (value is not None) and (type(value) not in [int, bool, float]):
-                        # Analize if is related
-                        related = getattr(value, "all", None) is not None
-                        # Analize data type
-                        if isinstance(rkval, dict):
-                            # This is a recursive call to go through foreign
-                            # keys
-                            value = self.bodybuilder(value.all(), rkval)
-                        elif isinstance(value, datetime.datetime):
-                            # Convert datetime to string
-                            value = (
-                                value.replace(tzinfo=ZoneInfo("UTC"))
-                                .astimezone(tz.tzlocal())
-                                .strftime(
-                                    formats.get_format(
-                                        "DATETIME_INPUT_FORMATS",
-                                        lang=self.language,
-                                    )[0],
-                                )
-                            )
-                        elif isinstance(value, datetime.date):
-                            # Convert datetime to string
-                            value = value.strftime(
-                                formats.get_format(
-                                    "DATE_INPUT_FORMATS",
-                                    lang=self.language,
-                                )[0],
-                            )
-                        elif isinstance(value, datetime.time):
-                            # Convert datetime to string
-                            value = value.strftime(
-                                formats.get_format(
-                                    "TIME_INPUT_FORMATS",
-                                    lang=self.language,
-                                )[0],
-                            )
-                        elif isinstance(value, Decimal):
-                            # Convert Decimal to float
-                            value = float(value)
-                        elif related:
-                            # If the object is related but nobody is taking
-                            # care of it
-                            values = []
-                            for v in value.all():
-                                # This is a recursive call to go through
-                                # foreign keys
-                                if tail is None:
-                                    values.append(smart_str(v))
-                                else:
-                                    values.append(
-                                        self.bodybuilder([v], {tail: rkval})[0][tail],
-                                    )
-                            # Save the list in value
-                            value = values
-                        elif "__" in rk:
-                            # This is a foreignkey, resolve with a recursive
-                            # call to go through foreign keys
-                            value = self.bodybuilder([value], {tail: rkval})[0][tail]
-                        elif callable(value):
-                            # Build the list of arguments
-                            args = {}
-                            # if 'request' in value.__code__.co_varnames:
-                            if (
-                                hasattr(value, "__code__")
-                                and "request" in value.__code__.co_varnames
-                            ):
-                                args["request"] = self.codenerix_request
-                            # Call the method
-                            value = value(**args)
-                        else:
-                            # This is an attribute
-                            value = smart_str(value)
-
-                    # Save the value
-                    token[alias] = value
+                token = {alias: accessor(obj) for (alias, accessor) in columns}
 
             # Save token
             body.append(token)
@@ -3659,6 +4710,143 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
         # Return the body
         return body
 
+    def __bulk_columns(self, columns, object_list):
+        """
+        Return the (alias, accessor) of the columns for the objects in
+        'object_list', the ones showing a method decorated with
+        bulk_method() read their values from what its bulk version returns
+        for the whole list
+        """
+        if not object_list or isinstance(object_list[0], dict):
+            return [(alias, accessor) for (alias, accessor, _) in columns]
+
+        model = type(object_list[0])
+        result = []
+        for alias, accessor, attribute in columns:
+            bulk = None
+            if attribute is not None:
+                name = getattr(getattr(model, attribute, None), "codenerix_bulk", None)
+                if name is not None:
+                    bulk = getattr(model, name)
+            if bulk is not None:
+                values = bulk(object_list, self.codenerix_request)
+                result.append((alias, lambda obj, values=values: values.get(obj.pk, None)))
+            else:
+                result.append((alias, accessor))
+        return result
+
+    def __compile_rules(self, rules):
+        """
+        Compile the rules of bodybuilder() into a list of (alias, accessor,
+        attribute) where the accessor returns the value of the column for an
+        object and attribute is the one it reads when the column shows it
+        directly (None when it follows a relation), they are compiled once
+        per request for each rules dictionary
+        """
+        if self.__compiled_rules is None:
+            self.__compiled_rules = {}
+        compiled = self.__compiled_rules.get(id(rules), None)
+        # Keep the rules alive so their id() is not reused
+        if compiled is None or compiled[0] is not rules:
+            columns = [self.__compile_rule(key, rkval) for (key, rkval) in rules.items()]
+            compiled = (rules, columns)
+            self.__compiled_rules[id(rules)] = compiled
+        return compiled[1]
+
+    def __compile_rule(self, key, rkval):
+        """
+        Compile the rule 'key' ('alias:field__path') into (alias, accessor,
+        attribute), how every kind of value is converted (nested rules, dates and
+        decimals with the ValueFormatter of the language, to-many relations,
+        foreign keys, methods or strings) is decided the first time a value
+        of that type is seen
+        """
+        # Check if as an alias
+        keysp = key.split(":")
+        if len(keysp) == 1:
+            alias = key
+            rk = key
+        else:
+            alias = keysp[0]
+            rk = keysp[1]
+
+        # Attribute to read and the path to follow from it
+        (head, _, tail) = rk.partition("__")
+        nested = isinstance(rkval, dict)
+        formatter = ValueFormatter.get(self.language, localtime=True)
+        if tail and not nested:
+            follow = self.__compile_rule(tail, rkval)[1]
+        else:
+            follow = None
+        attribute = None if (tail or nested) else head
+
+        def step(value):
+            # Go through the foreign key
+            value.codenerix_uuid = self.codenerix_uuid
+            value.codenerix_request = self.codenerix_request
+            return follow(value)
+
+        def nested_rules(value):
+            return self.bodybuilder(value.all(), rkval)
+
+        def related(value):
+            # The object is related but nobody is taking care of it
+            if follow is None:
+                return [smart_str(v) for v in value.all()]
+            else:
+                return [step(v) for v in value.all()]
+
+        # Arguments of the methods depending on their code
+        calls = {}
+
+        def call(value):
+            code = getattr(value, "__code__", None)
+            request = calls.get(code, None)
+            if request is None:
+                request = code is not None and "request" in code.co_varnames
+                calls[code] = request
+            if request:
+                return value(request=self.codenerix_request)
+            else:
+                return value()
+
+        def classify(value):
+            # None keeps the value as it is
+            if type(value) in [int, bool, float]:
+                return None
+            elif nested:
+                return nested_rules
+            converter = formatter.converter(type(value))
+            if converter is not None:
+                return converter
+            elif getattr(value, "all", None) is not None:
+                return related
+            elif follow is not None:
+                return step
+            elif callable(value):
+                return call
+            else:
+                return smart_str
+
+        kinds = {}
+
+        def accessor(obj):
+            # value=getattr(o,head,None)  # 2016.02.24 Quitamos None
+            # para que aparezca la exception
+            value = getattr(obj, head)
+            if value is None:
+                return None
+            kind = type(value)
+            try:
+                convert = kinds[kind]
+            except KeyError:
+                convert = kinds[kind] = classify(value)
+            if convert is None:
+                return value
+            return convert(value)
+
+        return (alias, accessor, attribute)
+
     def render_to_response(self, context, **response_kwargs):
         if self.json_worker:
             # Get json ready context
@@ -3680,45 +4868,81 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
                 and ("body" in answer["table"])
                 and (answer["table"]["body"] is None)
             ):
+                # Stream the body
+                if self.__streaming() and self.export:
+                    answer["meta"]["content_type"] = "text/csv"
+                    return self.__response_streaming_csv(
+                        answer,
+                        context["object_list"],
+                        **response_kwargs,
+                    )
+                elif self.__streaming():
+                    answer["meta"]["content_type"] = None
+                    if self.timing_meta:
+                        answer["meta"]["timing"] = self.timing_info()
+                    return self.__response_streaming(
+                        answer,
+                        context["object_list"],
+                        **response_kwargs,
+                    )
+
                 # Call bodybuilder
-                answer["table"]["body"] = self.bodybuilder(
-                    context["object_list"],
-                    self.__autorules,
-                )
+                with self.timing_phase("body"):
+                    answer["table"]["body"] = self.bodybuilder(
+                        context["object_list"],
+                        self.__autorules,
+                    )
 
             if self.export:
-                if self.export == "xlsx":
-                    answer["meta"]["content_type"] = (
-                        "application/vnd.openxmlformats-officedocument."
-                        "spreadsheetml.sheet;charset=utf-8;"
-                    )
-                    # return_xls = self.response_to_xls(answer)
-                    return self.response_to_xls(answer, **response_kwargs)
-                elif self.export == "csv":
-                    answer["meta"]["content_type"] = "text/csv"
-                    # return_xls = self.response_to_xls(answer)
-                    return self.response_to_csv(answer, **response_kwargs)
-                elif self.export == "json":
-                    answer["meta"]["content_type"] = "application/json"
-                    # return_xls = self.response_to_xls(answer)
-                    return self.response_to_json(answer, **response_kwargs)
-                elif self.export == "jsonl":
-                    answer["meta"]["content_type"] = "application/jsonl"
-                    # return_xls = self.response_to_xls(answer)
-                    return self.response_to_jsonl(answer, **response_kwargs)
-                elif self.export == "bson":
-                    answer["meta"]["content_type"] = "application/bson"
-                    # return_xls = self.response_to_xls(answer)
-                    return self.response_to_bson(answer, **response_kwargs)
+                with self.timing_phase("export"):
+                    if self.export == "xlsx":
+                        answer["meta"]["content_type"] = (
+                            "application/vnd.openxmlformats-officedocument."
+                            "spreadsheetml.sheet;charset=utf-8;"
+                        )
+                        # return_xls = self.response_to_xls(answer)
+                        return self.response_to_xls(answer, **response_kwargs)
+                    elif self.export == "csv":
+                        answer["meta"]["content_type"] = "text/csv"
+                        # return_xls = self.response_to_xls(answer)
+                        return self.response_to_csv(answer, **response_kwargs)
+                    elif self.export == "json":
+                        answer["meta"]["content_type"] = "application/json"
+                        # return_xls = self.response_to_xls(answer)
+                        return self.response_to_json(answer, **response_kwargs)
+                    elif self.export == "jsonl":
+                        answer["meta"]["content_type"] = "application/jsonl"
+                        # return_xls = self.response_to_xls(answer)
+                        return self.response_to_jsonl(answer, **response_kwargs)
+                    elif self.export == "bson":
+                        answer["meta"]["content_type"] = "application/bson"
+                        # return_xls = self.response_to_xls(answer)
+                        return self.response_to_bson(answer, **response_kwargs)
 
-                else:
-                    raise Exception(f"Export to {self.export} invalid")
+                    else:
+                        raise Exception(f"Export to {self.export} invalid")
             else:
                 answer["meta"]["content_type"] = None
 
+                # Send the body with the layout asked by the client
+                body_format = self.get_body_format()
+                table = answer.get("table", None)
+                if (
+                    body_format != "dicts"
+                    and isinstance(table, dict)
+                    and isinstance(table.get("body", None), list)
+                ):
+                    table["body"] = encode_body(table["body"], body_format)
+                    answer["meta"]["body_format"] = body_format
+
+            # Add the timings so far
+            if self.timing_meta and isinstance(answer.get("meta", None), dict):
+                answer["meta"]["timing"] = self.timing_info()
+
             # Try to serialize it as a JSON string
             try:
-                json_answer = json.dumps(answer, cls=DjangoJSONEncoder)
+                with self.timing_phase("json"):
+                    json_answer = json_dumps(answer)
             except TypeError as e:
                 # Try to locate where the problem is happening
                 try:
@@ -3756,6 +4980,98 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
                 **response_kwargs,
             )
 
+    def __streaming(self):
+        """
+        Tell if the body of the JSON answer or the CSV export will be streamed
+        """
+        if not self.json_worker:
+            return False
+        elif self.export:
+            return self.stream_csv and self.export == "csv"
+        return self.stream_json
+
+    def __stream_chunks(self, object_list):
+        """
+        Read the registers of 'object_list' in lists of 'stream_chunk_size'
+        """
+        chunk_size = self.stream_chunk_size
+        if isinstance(object_list, models.QuerySet):
+            object_list = object_list.iterator(chunk_size=chunk_size)
+
+        chunk = []
+        for obj in object_list:
+            chunk.append(obj)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def __stream_bind(self, object_list):
+        """
+        Bind 'object_list' to the database the view is reading from, its
+        rows are read once the view returned (out of use_replica())
+        """
+        if isinstance(object_list, models.QuerySet):
+            object_list = object_list.using(object_list.db)
+        return object_list
+
+    def __response_streaming(self, answer, object_list, **response_kwargs):
+        """
+        Send the answer with meta/filter/head first and the body rows after
+        it, the rows are read and built in chunks of 'stream_chunk_size'.
+        The 'columns' layout needs the whole body so it is streamed as 'rows'
+        """
+        object_list = self.__stream_bind(object_list)
+        body_format = self.get_body_format()
+        if body_format == "columns":
+            body_format = "rows"
+        if body_format != "dicts":
+            answer["meta"]["body_format"] = body_format
+
+        # Split the answer where the body goes
+        marker = f"codenerix-body-{uuid.uuid4().hex}"
+        answer["table"]["body"] = marker
+        try:
+            json_answer = json_dumps(answer)
+        except TypeError as e:
+            raise TypeError(
+                f"The answer from model '{self._modelname}' inside app '{self._appname}' "
+                f"is not a JSON serializable object. Error was: {e}",
+            ) from e
+        (head, tail) = json_answer.split(json.dumps(marker), 1)
+
+        def opening(columns):
+            # The columns of the 'rows' layout are known with the first chunk
+            if body_format == "dicts":
+                return f"{head}["
+            return f'{head}{{"format": "rows", "columns": {json.dumps(columns)}, "rows": ['
+
+        def content():
+            columns = None
+            separator = ""
+            for chunk in self.__stream_chunks(object_list):
+                body = self.bodybuilder(chunk, self.__autorules)
+                if columns is None:
+                    columns = body_columns(body) if body_format == "rows" else []
+                    yield opening(columns)
+                if body_format == "rows":
+                    body = encode_body(body, "rows", columns)["rows"]
+                yield separator + json_dumps(body)[1:-1]
+                separator = ","
+            if columns is None:
+                yield opening([])
+            if body_format == "dicts":
+                yield f"]{tail}"
+            else:
+                yield f"]}}{tail}"
+
+        return StreamingHttpResponse(
+            content(),
+            content_type="application/json",
+            **response_kwargs,
+        )
+
     def __cell_format(self, key_column, row, fmt=None):
         string = ""
         while key_column > 0:
@@ -3957,6 +5273,26 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
             **response_kwargs,
         )
 
+    def __export_body(self, body, columns):
+        """
+        Rows of the body with the values of 'columns' ready to be exported:
+        lists joined with new lines, dictionaries as JSON and dates, times
+        and decimals converted column by column with the ValueFormatter of
+        the language
+        """
+        formatter = ValueFormatter.get(self.language)
+        data = []
+        for cid in columns:
+            values = []
+            for value in formatter.convert_column([row[cid] for row in body]):
+                if isinstance(value, list):
+                    value = "\n".join(value)
+                elif isinstance(value, dict):
+                    value = json.dumps(value)
+                values.append(value)
+            data.append(values)
+        return [list(row) for row in zip(*data, strict=True)] if data else [[] for _ in body]
+
     def response_to_csv(self, answer, **response_kwargs):
         with StringIO() as tmpfile:
             # Prepare writer
@@ -3970,51 +5306,8 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
                 columns.append(col["id"])
             writer.writerow(header)
 
-            for _, row in enumerate(answer["table"]["body"]):
-                tmp = []
-                for _, cid in enumerate(columns):
-                    # print(key_row, key_col)
-                    if isinstance(row[cid], list):
-                        tmp.append("\n".join(row[cid]))
-                    elif isinstance(row[cid], dict):
-                        tmp.append(json.dumps(row[cid]))
-                    else:
-                        if row[cid] and not isinstance(row[cid], float):
-                            # Rewrite row[cid] if required
-                            if isinstance(row[cid], datetime.datetime):
-                                # Convert datetime to string
-                                t = row[cid].strftime(
-                                    formats.get_format(
-                                        "DATETIME_INPUT_FORMATS",
-                                        lang=self.language,
-                                    )[0],
-                                )
-                            elif isinstance(row[cid], datetime.date):
-                                # Convert datetime to string
-                                t = row[cid].strftime(
-                                    formats.get_format(
-                                        "DATE_INPUT_FORMATS",
-                                        lang=self.language,
-                                    )[0],
-                                )
-                            elif isinstance(row[cid], datetime.time):
-                                # Convert datetime to string
-                                t = row[cid].strftime(
-                                    formats.get_format(
-                                        "TIME_INPUT_FORMATS",
-                                        lang=self.language,
-                                    )[0],
-                                )
-                            elif isinstance(row[cid], Decimal):
-                                # Convert Decimal to float
-                                t = float(row[cid])
-                            else:
-                                t = row[cid]
-
-                        else:
-                            t = row[cid]
-                        tmp.append(t)
-                writer.writerow(tmp)
+            for row in self.__export_body(answer["table"]["body"], columns):
+                writer.writerow(row)
 
             # Get content
             data_output = tmpfile.getvalue()
@@ -4027,6 +5320,69 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
             **response_kwargs,
         )
 
+    def __response_streaming_csv(self, answer, object_list, **response_kwargs):
+        """
+        Send the CSV export while its rows are read and built in chunks of
+        'stream_chunk_size', nothing is kept in memory so instead of
+        FILE_DOWNLOAD_SIZE_MAX the export is limited by 'export_max_rows'
+        (answered with 413 when there are more rows) and
+        'export_max_seconds' (the download is cut when it takes longer)
+        """
+        max_rows = self.export_max_rows
+        total = answer["meta"].get("row_total", 0)
+        if max_rows is not None and total > max_rows:
+            msg = __(
+                f"The file is very big ({total} rows). Change the parameter "
+                "export_max_rows (CODENERIX_EXPORT_MAX_ROWS) of the view",
+            )
+            logger.error(f"Download failed (Rows Limit): {msg}")
+            return JsonResponse(
+                {"message": msg, "file": "", "filename": ""},
+                status=413,
+                encoder=DjangoJSONEncoder,
+            )
+        max_seconds = self.export_max_seconds
+        object_list = self.__stream_bind(object_list)
+
+        def content():
+            started = time.monotonic()
+            columns = None
+            with StringIO() as tmpfile:
+                writer = csv.writer(tmpfile, delimiter=";")
+                for chunk in self.__stream_chunks(object_list):
+                    body = self.bodybuilder(chunk, self.__autorules)
+                    if columns is None:
+                        # The header comes with the first chunk (needed by 'export_raw')
+                        answer["table"]["body"] = body
+                        columns = self.response_get_columns(answer)
+                        writer.writerow([col["name"] for col in columns])
+                        columns = [col["id"] for col in columns]
+                    writer.writerows(self.__export_body(body, columns))
+
+                    # Send the chunk
+                    yield tmpfile.getvalue()
+                    tmpfile.seek(0)
+                    tmpfile.truncate()
+
+                    # Cut the download so the client doesn't take it as complete
+                    elapsed = time.monotonic() - started
+                    if max_seconds is not None and elapsed > max_seconds:
+                        raise ExportBudgetExceeded(
+                            f"CSV export from model '{self._modelname}' inside app "
+                            f"'{self._appname}' took more than {max_seconds} seconds "
+                            "(export_max_seconds)",
+                        )
+                if columns is None:
+                    answer["table"]["body"] = []
+                    writer.writerow([col["name"] for col in self.response_get_columns(answer)])
+                    yield tmpfile.getvalue()
+
+        response = StreamingHttpResponse(content(), content_type="text/csv", **response_kwargs)
+        response["Content-Disposition"] = "attachment; filename={}.csv".format(
+            answer["meta"]["export_name"],
+        )
+        return response
+
     def response_to_json(self, answer, **response_kwargs):
         # Write header
         header = []
@@ -4038,55 +5394,10 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
         # Prepare answer
         janswer = {}
         janswer["head"] = header
-        janswer["body"] = []
-
-        for _, row in enumerate(answer["table"]["body"]):
-            tmp = []
-            for _, cid in enumerate(columns):
-                # print(key_row, key_col)
-                if isinstance(row[cid], list):
-                    tmp.append("\n".join(row[cid]))
-                elif isinstance(row[cid], dict):
-                    tmp.append(json.dumps(row[cid]))
-                else:
-                    if row[cid] and not isinstance(row[cid], float):
-                        # Rewrite row[cid] if required
-                        if isinstance(row[cid], datetime.datetime):
-                            # Convert datetime to string
-                            t = row[cid].strftime(
-                                formats.get_format(
-                                    "DATETIME_INPUT_FORMATS",
-                                    lang=self.language,
-                                )[0],
-                            )
-                        elif isinstance(row[cid], datetime.date):
-                            # Convert datetime to string
-                            t = row[cid].strftime(
-                                formats.get_format(
-                                    "DATE_INPUT_FORMATS",
-                                    lang=self.language,
-                                )[0],
-                            )
-                        elif isinstance(row[cid], datetime.time):
-                            # Convert datetime to string
-                            t = row[cid].strftime(
-                                formats.get_format(
-                                    "TIME_INPUT_FORMATS",
-                                    lang=self.language,
-                                )[0],
-                            )
-                        elif isinstance(row[cid], Decimal):
-                            # Convert Decimal to float
-                            t = float(row[cid])
-                        else:
-                            t = row[cid]
-                    else:
-                        t = row[cid]
-                    tmp.append(t)
-            janswer["body"].append(tmp)
+        janswer["body"] = self.__export_body(answer["table"]["body"], columns)
 
         # Get content
-        data_output = json.dumps(janswer, cls=DjangoJSONEncoder)
+        data_output = json_dumps(janswer)
 
         return self.response_export(
             answer,
@@ -4105,53 +5416,12 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
                 header.append(col["name"])
                 columns.append(col["id"])
 
-            for _, row in enumerate(answer["table"]["body"]):
-                tmp = {}
-                for _, cid in enumerate(columns):
-                    # print(key_row, key_col)
-                    if isinstance(row[cid], list):
-                        tmp[cid] = "\n".join(row[cid])
-                    elif isinstance(row[cid], dict):
-                        tmp[cid] = json.dumps(row[cid])
-                    else:
-                        if row[cid] and not isinstance(row[cid], float):
-                            # Rewrite row[cid] if required
-                            if isinstance(row[cid], datetime.datetime):
-                                # Convert datetime to string
-                                t = row[cid].strftime(
-                                    formats.get_format(
-                                        "DATETIME_INPUT_FORMATS",
-                                        lang=self.language,
-                                    )[0],
-                                )
-                            elif isinstance(row[cid], datetime.date):
-                                # Convert datetime to string
-                                t = row[cid].strftime(
-                                    formats.get_format(
-                                        "DATE_INPUT_FORMATS",
-                                        lang=self.language,
-                                    )[0],
-                                )
-                            elif isinstance(row[cid], datetime.time):
-                                # Convert datetime to string
-                                t = row[cid].strftime(
-                                    formats.get_format(
-                                        "TIME_INPUT_FORMATS",
-                                        lang=self.language,
-                                    )[0],
-                                )
-                            elif isinstance(row[cid], Decimal):
-                                # Convert Decimal to float
-                                t = float(row[cid])
-                            else:
-                                t = row[cid]
-                        else:
-                            t = row[cid]
-                        tmp[cid] = t
+            for row in self.__export_body(answer["table"]["body"], columns):
+                tmp = dict(zip(columns, row, strict=True))
 
                 # Get content
                 tmpfile.write(
-                    f"{json.dumps(tmp, cls=DjangoJSONEncoder)}\n",
+                    f"{json_dumps(tmp)}\n",
                 )
 
             # Get content
@@ -4176,52 +5446,7 @@ class GenList(GenBase, ListView):  # pyright: ignore[reportIncompatibleVariableO
         # Prepare answer
         janswer = {}
         janswer["head"] = header
-        janswer["body"] = []
-
-        for _, row in enumerate(answer["table"]["body"]):
-            tmp = []
-            for _, cid in enumerate(columns):
-                # print(key_row, key_col)
-                if isinstance(row[cid], list):
-                    tmp.append("\n".join(row[cid]))
-                elif isinstance(row[cid], dict):
-                    tmp.append(json.dumps(row[cid]))
-                else:
-                    if row[cid] and not isinstance(row[cid], float):
-                        # Rewrite row[cid] if required
-                        if isinstance(row[cid], datetime.datetime):
-                            # Convert datetime to string
-                            t = row[cid].strftime(
-                                formats.get_format(
-                                    "DATETIME_INPUT_FORMATS",
-                                    lang=self.language,
-                                )[0],
-                            )
-                        elif isinstance(row[cid], datetime.date):
-                            # Convert datetime to string
-                            t = row[cid].strftime(
-                                formats.get_format(
-                                    "DATE_INPUT_FORMATS",
-                                    lang=self.language,
-                                )[0],
-                            )
-                        elif isinstance(row[cid], datetime.time):
-                            # Convert datetime to string
-                            t = row[cid].strftime(
-                                formats.get_format(
-                                    "TIME_INPUT_FORMATS",
-                                    lang=self.language,
-                                )[0],
-                            )
-                        elif isinstance(row[cid], Decimal):
-                            # Convert Decimal to float
-                            t = float(row[cid])
-                        else:
-                            t = row[cid]
-                    else:
-                        t = row[cid]
-                    tmp.append(t)
-            janswer["body"].append(tmp)
+        janswer["body"] = self.__export_body(answer["table"]["body"], columns)
 
         # Get content
         data_output = bson.encode(janswer)
@@ -4286,6 +5511,9 @@ class GenModify:
 
     """  # noqa: E501
 
+    # Forms always read from the primary
+    read_replica = False
+
     def dispatch(self, *args, **kwargs):
         """
         Entry point for this class, here we decide basic stuff
@@ -4314,9 +5542,8 @@ class GenModify:
             post = json.loads(body)
             for key in post:
                 if isinstance(post[key], dict) and "__JSON_DATA__" in post[key]:
-                    post[key] = json.dumps(
+                    post[key] = json_dumps(
                         post[key]["__JSON_DATA__"],
-                        cls=DjangoJSONEncoder,
                     )
 
             request.POST.update(post)
@@ -4324,6 +5551,10 @@ class GenModify:
         # Set class internal variables
         self._setup(request)
 
+        # The session will read from the primary for a while after writing
+        if request.method not in ("GET", "HEAD", "OPTIONS"):
+            stick_to_primary(request)
+
         # Call the base implementation
         return super().dispatch(request, **kwargs)
 
@@ -4395,12 +5626,12 @@ class GenModify:
         try:
             # Try using decode first
             self.success_url.__dict__[success_key]["kwargs"]["answer"] = urlsafe_base64_encode(
-                str.encode(json.dumps(attr, cls=DjangoJSONEncoder)),
+                str.encode(json_dumps(attr)),
             ).decode()
         except AttributeError:
             # Try without decode
             self.success_url.__dict__[success_key]["kwargs"]["answer"] = urlsafe_base64_encode(
-                str.encode(json.dumps(attr, cls=DjangoJSONEncoder)),
+                str.encode(json_dumps(attr)),
             )
 
         return super().get_success_url()
@@ -4481,9 +5712,8 @@ class GenModify:
 
         # Subscribers
         context["subscriptions"] = base64.b64encode(
-            json.dumps(
+            json_dumps(
                 getattr(self.form_class.Meta, "subscriptions", None),
-                cls=DjangoJSONEncoder,
             ).encode("utf-8"),
         ).decode()
 
@@ -4573,6 +5803,7 @@ class GenModify:
         # Forms
         generrors = {}
         fields = {}
+        formatter = ValueFormatter.get(self.language)
 
         if formlist:
             for formobj in formlist:
@@ -4616,34 +5847,9 @@ class GenModify:
                             else:
                                 inpvalue = ""
 
-                            # Rewrite inpvalues if required
-                            if isinstance(inpvalue, datetime.datetime):
-                                # Convert datetime to string
-                                inpvalue = inpvalue.strftime(
-                                    formats.get_format(
-                                        "DATETIME_INPUT_FORMATS",
-                                        lang=self.language,
-                                    )[0],
-                                )
-                            elif isinstance(inpvalue, datetime.date):
-                                # Convert datetime to string
-                                inpvalue = inpvalue.strftime(
-                                    formats.get_format(
-                                        "DATE_INPUT_FORMATS",
-                                        lang=self.language,
-                                    )[0],
-                                )
-                            elif isinstance(inpvalue, datetime.time):
-                                # Convert datetime to string
-                                inpvalue = inpvalue.strftime(
-                                    formats.get_format(
-                                        "TIME_INPUT_FORMATS",
-                                        lang=self.language,
-                                    )[0],
-                                )
-                            elif isinstance(inpvalue, Decimal):
-                                # Convert Decimal to float
-                                inpvalue = float(inpvalue)
+                            # Rewrite inpvalues if required (dates and
+                            # times to string, Decimal to float)
+                            inpvalue = formatter.convert(inpvalue)
 
                             if not json_details:
                                 fields[inp.html_name] = inpvalue
@@ -4764,7 +5970,7 @@ class GenModify:
 
             # Try to serialize it as a JSON string
             try:
-                json_answer = json.dumps(answer, cls=DjangoJSONEncoder)
+                json_answer = json_dumps(answer)
             except TypeError as e:
                 raise TypeError(
                     f"The method get_context_json() from model '{self._modelname}' "
@@ -4869,14 +6075,13 @@ class GenDelete(GenModify, GenBase, DeleteView):  # pyright: ignore[reportIncomp
             # Call the base implementation
             return super().dispatch(request, **kwargs)
         else:
-            json_answer = json.dumps(
+            json_answer = json_dumps(
                 {
                     "error": True,
                     "errortxt": __(
                         "Method not allowed, use POST to delete or DELETE on the detail url",
                     ),
                 },
-                cls=DjangoJSONEncoder,
             )
             return HttpResponse(json_answer, content_type="application/json")
 
@@ -4910,7 +6115,7 @@ class GenDelete(GenModify, GenBase, DeleteView):  # pyright: ignore[reportIncomp
                 json_struct = {"error": lock, "__pk__": obj.pk}
                 if self.__authtoken and api_obj is not None:
                     json_struct["__obj__"] = api_obj
-                json_answer = json.dumps(json_struct, cls=DjangoJSONEncoder)
+                json_answer = json_dumps(json_struct)
                 return HttpResponse(
                     json_answer,
                     content_type="application/json",
@@ -4925,9 +6130,8 @@ class GenDelete(GenModify, GenBase, DeleteView):  # pyright: ignore[reportIncomp
                     json_struct = {"error": e, "__pk__": obj.pk}
                     if self.__authtoken and api_obj is not None:
                         json_struct["__obj__"] = api_obj
-                    json_answer = json.dumps(
+                    json_answer = json_dumps(
                         json_struct,
-                        cls=DjangoJSONEncoder,
                     )
                     return HttpResponse(
                         json_answer,
@@ -4944,6 +6148,9 @@ class GenDetail(GenBase, DetailView):  # pyright: ignore[reportIncompatibleVaria
     # by default value of a necesary attribute
     groups: list[Any] = []
 
+    # Answer JSON requests with ETag/Last-Modified built from the 'updated' field of the object
+    conditional_get = getattr(settings, "CODENERIX_CONDITIONAL_GET", False)
+
     def dispatch(self, request, **kwargs):
         """
         Entry point for this class, here we decide basic stuff
@@ -5006,6 +6213,7 @@ class GenDetail(GenBase, DetailView):  # pyright: ignore[reportIncompatibleVaria
         """  # noqa: E501
         # initilize the result structure
         result = []
+        formatter = ValueFormatter.get(self.language, localtime=True)
 
         # the object corresponding model content is taken into a dictionary
         object_content = model_to_dict(self.object)
@@ -5136,37 +6344,9 @@ class GenDetail(GenBase, DetailView):  # pyright: ignore[reportIncompatibleVaria
                                 # for get_XXXX_display() mostly
                                 value = value()
 
-                    if isinstance(value, datetime.datetime):
-                        # Convert datetime to string
-                        value = (
-                            value.replace(tzinfo=ZoneInfo("UTC"))
-                            .astimezone(tz.tzlocal())
-                            .strftime(
-                                formats.get_format(
-                                    "DATETIME_INPUT_FORMATS",
-                                    lang=self.language,
-                                )[0],
-                            )
-                        )
-                    elif isinstance(value, datetime.date):
-                        # Convert datetime to string
-                        value = value.strftime(
-                            formats.get_format(
-                                "DATE_INPUT_FORMATS",
-                                lang=self.language,
-                            )[0],
-                        )
-                    elif isinstance(value, datetime.time):
-                        # Convert datetime to string
-                        value = value.strftime(
-                            formats.get_format(
-                                "TIME_INPUT_FORMATS",
-                                lang=self.language,
-                            )[0],
-                        )
-                    elif isinstance(value, Decimal):
-                        # Convert Decimal to float
-                        value = float(value)
+                    # Convert dates and times to string (datetimes in the
+                    # local time of the system) and Decimal to float
+                    value = formatter.convert(value)
 
                     # Show if cols
                     if cols is not None:
@@ -5289,7 +6469,7 @@ class GenDetail(GenBase, DetailView):  # pyright: ignore[reportIncompatibleVaria
         info = self.get_filled_structure()
 
         body = json.loads(
-            json.dumps(self.get_fields_structure(info), cls=DjangoJSONEncoder),
+            json_dumps(self.get_fields_structure(info)),
         )
 
         meta = {}
@@ -5378,6 +6558,39 @@ class GenDetail(GenBase, DetailView):  # pyright: ignore[reportIncompatibleVaria
         # Return context
         return ncontext
 
+    def get(self, request, *args, **kwargs):
+        with self.timing_phase("queryset"):
+            self.object = self.get_object()
+
+        # Conditional GET (the answer is not built if the client has it)
+        validators = None
+        if self.conditional_get and self.json_worker and hasattr(self.object, "updated"):
+            validators = answer_validators(
+                self.object.updated,
+                1,
+                f"{self.__class__.__module__}.{self.__class__.__qualname__}",
+                self.object.pk,
+                getattr(self.request.user, "pk", None),
+                get_language(),
+            )
+            (etag, last_modified) = validators
+            not_modified = get_conditional_response(
+                request,
+                etag=quote_etag(etag),
+                last_modified=last_modified,
+            )
+            if not_modified is not None:
+                return not_modified
+
+        context = self.get_context_data(object=self.object)
+        response = self.render_to_response(context)
+
+        # Attach the validators for the next conditional GET
+        if validators and response.status_code == 200:
+            set_validators(response, *validators)
+
+        return response
+
     def get_context_data(self, **kwargs):
         object_property = dir(self.object)
         if self.json_worker:
@@ -5389,7 +6602,8 @@ class GenDetail(GenBase, DetailView):  # pyright: ignore[reportIncompatibleVaria
         if self.json_worker:
             # Try to serialize it as a JSON string
             try:
-                json_answer = json.dumps(context, cls=DjangoJSONEncoder)
+                with self.timing_phase("json"):
+                    json_answer = json_dumps(context)
             except TypeError as e:
                 raise TypeError(
                     f"Couldn't serialize response from model '{self._modelname}' "
@@ -5447,7 +6661,10 @@ class GenForeignKey(GenBase, View):
         # Call the base implementation
         return super().dispatch(request, **kwargs)
 
-    def build_label(self, obj):
+    def label_format(self):
+        """
+        Return a tuple (fmt, keys) with the label compiled
+        """
         # Compile label and save it
         if not self.label_cached:
             # Replace language
@@ -5466,8 +6683,36 @@ class GenForeignKey(GenBase, View):
                 )
                 keys.append(key.replace("{", "").replace("}", ""))
             self.label_cached = (fmt, keys)
-        else:
-            fmt, keys = self.label_cached
+        return self.label_cached
+
+    def label_queryset(self, queryset):
+        """
+        Limit the queryset to the columns used by the label (only when all of
+        them are fields reached through foreign keys)
+        """
+        (_, keys) = self.label_format()
+        select_related = set()
+        for key in keys:
+            model = self.model  # pyright: ignore[reportAttributeAccessIssue]
+            names = key.split("__")
+            for idx, name in enumerate(names):
+                try:
+                    field = model._meta.get_field(name)
+                except FieldDoesNotExist:
+                    return queryset
+                if idx < len(names) - 1:
+                    if not (field.many_to_one or field.one_to_one) or not field.concrete:
+                        return queryset
+                    select_related.add("__".join(names[: idx + 1]))
+                    model = field.related_model
+                elif not field.concrete or field.is_relation:
+                    return queryset
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        return queryset.only("pk", *keys)
+
+    def build_label(self, obj):
+        (fmt, keys) = self.label_format()
 
         # Process label
         args = []
@@ -5504,7 +6749,8 @@ class GenForeignKey(GenBase, View):
         if choices:
             if isinstance(choices[0], dict):
                 choices = [x["id"] for x in choices]
-            qs = qs.filter(pk__in=choices)
+            # Bring only the selected registers and the columns of the label
+            qs = self.label_queryset(qs.filter(pk__in=choices))
         answer = []
         for e in qs.all():
             answer.append({"id": e.pk, "label": self.build_label(e)})
@@ -5521,6 +6767,30 @@ class GenForeignKey(GenBase, View):
 
     def get(self, request, *args, **kwargs):
         del args  # Unused variable
+        # Get the queryset requested by the user
+        (qs, limit) = self.get_foreign_queryset(request, **kwargs)
+
+        if isinstance(qs, list):
+            qstotal = len(qs)
+        else:
+            qstotal = qs.count()
+
+        # Process limit and limit result itself
+        if limit is None:
+            qslimited = qs
+            tail = False
+        else:
+            qslimited = qs[0:limit]
+            tail = qstotal > limit
+
+        # Send the answer
+        return self.build_response(qslimited, tail)
+
+    def get_foreign_queryset(self, request, **kwargs):
+        """
+        Return a tuple (queryset, limit) with the registers the user is
+        looking for and how many of them must be shown
+        """
         # Set class internal variables
         self._setup(request)
 
@@ -5540,24 +6810,17 @@ class GenForeignKey(GenBase, View):
             limit = self.limit_all
 
         # Get the queryset requested by the user
-        qs = self.get_foreign(self.get_queryset(), search, filters)
+        return (self.get_foreign(self.get_queryset(), search, filters), limit)
 
+    def build_response(self, qslimited, tail):
+        """
+        Build the answer with the registers to show, 'tail' tells if there
+        are more registers than the ones shown
+        """
         # Build answer
         answer = []
         if self.request.GET.get("def", "0") == "1":
             answer.append({"id": None, "label": "---------"})
-        if isinstance(qs, list):
-            qstotal = len(qs)
-        else:
-            qstotal = qs.count()
-
-        # Process limit and limit result itself
-        if limit is None:
-            qslimited = qs
-            tail = False
-        else:
-            qslimited = qs[0:limit]
-            tail = qstotal > limit
 
         # Show elements
         for e in qslimited:
@@ -5583,7 +6846,7 @@ class GenForeignKey(GenBase, View):
         custom_answer = self.custom_answer(final_answer)
 
         # Convert the answer to JSON
-        json_answer = json.dumps(custom_answer, cls=DjangoJSONEncoder)
+        json_answer = json_dumps(custom_answer)
 
         # Send it
         return HttpResponse(json_answer, content_type="application/json")
@@ -5593,6 +6856,114 @@ class GenForeignKey(GenBase, View):
         return queryset.all()
 
 
+class GenAsync:
+    """
+    Run a Gen* view as an async view: the user and its permissions are
+    loaded with the async ORM, the checks and hooks of the synchronous view
+    (__limitQ__, __searchQ__, get_foreign()...) run as they are and the
+    registers are brought by the handler with the async ORM
+    """
+
+    view_is_async = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        # Load the user and its permissions with the async ORM
+        if hasattr(request, "auser"):
+            request.user = await request.auser()
+            if request.user.is_authenticated:
+                await request.user.aget_all_permissions()
+
+        # Reads from this view may go to a replica (the handler too)
+        with use_replica(choose_replica(request, self.read_replica)):  # pyright: ignore[reportAttributeAccessIssue]
+            # Run the synchronous dispatch, it gives back the handler to await
+            response = await sync_to_async(super().dispatch)(request, *args, **kwargs)  # pyright: ignore[reportAttributeAccessIssue]
+            if asyncio.iscoroutine(response):
+                response = await response
+        return response
+
+
+class AsyncGenList(GenAsync, GenList):
+    """
+    GenList where the registers are counted and brought with the async ORM
+    """
+
+    async def get(self, request, *args, **kwargs):
+        (cache_key, response) = await sync_to_async(self.get_cached_response)()
+        if response is not None:
+            return response
+        self.object_list = await self.aget_queryset()
+        response = await sync_to_async(self.build_response)()
+        await sync_to_async(self.cache_response)(cache_key, response)
+        return response
+
+
+class AsyncGenDetail(GenAsync, GenDetail):
+    """
+    GenDetail where the object is brought with the async ORM
+    """
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return await sync_to_async(super().get)(request, *args, **kwargs)
+
+    async def aget_object(self, queryset=None):
+        """
+        Asynchronous get_object()
+        """
+        if queryset is None:
+            queryset = self.get_queryset()
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        slug = self.kwargs.get(self.slug_url_kwarg)
+        if pk is not None:
+            queryset = queryset.filter(pk=pk)
+        if slug is not None and (pk is None or self.query_pk_and_slug):
+            queryset = queryset.filter(**{self.get_slug_field(): slug})
+        if pk is None and slug is None:
+            raise AttributeError(
+                f"Generic detail view {self.__class__.__name__} must be called with "
+                "either an object pk or a slug in the URLconf.",
+            )
+        try:
+            return await queryset.aget()
+        except queryset.model.DoesNotExist as e:
+            raise Http404(
+                __("No %(verbose_name)s found matching the query")
+                % {"verbose_name": queryset.model._meta.verbose_name},
+            ) from e
+
+    def get_object(self, queryset=None):
+        # The object was already brought by get()
+        if queryset is None and getattr(self, "object", None) is not None:
+            return self.object
+        return super().get_object(queryset)
+
+
+class AsyncGenForeignKey(GenAsync, GenForeignKey):
+    """
+    GenForeignKey where the registers are brought with the async ORM
+    """
+
+    async def get(self, request, *args, **kwargs):
+        del args  # Unused variable
+        # Get the queryset requested by the user
+        (qs, limit) = await sync_to_async(self.get_foreign_queryset)(request, **kwargs)
+
+        if isinstance(qs, list):
+            qslimited = qs if limit is None else qs[0:limit]
+            tail = limit is not None and len(qs) > limit
+        elif limit is None:
+            qslimited = [e async for e in qs]
+            tail = False
+        else:
+            # Bring one more register to know if there are more (no count required)
+            qslimited = [e async for e in qs[0 : limit + 1]]
+            tail = len(qslimited) > limit
+            qslimited = qslimited[0:limit]
+
+        # Send the answer
+        return await sync_to_async(self.build_response)(qslimited, tail)
+
+
 # === FORMS ===
 # We don't use log system when PQPRO_CASSANDRA == TRUE
 if not getattr(settings, "PQPRO_CASSANDRA", False):
@@ -5678,6 +7049,6 @@ if not getattr(settings, "PQPRO_CASSANDRA", False):
             obj.save()
             # Return an answer
             return HttpResponse(
-                json.dumps({"pk": obj.pk}, cls=DjangoJSONEncoder),
+                json_dumps({"pk": obj.pk}),
                 content_type="application/json",
             )
@@ -33,7 +33,7 @@ from django import forms
 from django.conf import settings
 from django.core.files.base import File
 from django.core.serializers.json import DjangoJSONEncoder
-from django.urls import resolve, reverse
+from django.urls import reverse
 from django.utils import formats
 from django.utils.choices import BlankChoiceIterator
 from django.utils.encoding import smart_str
@@ -42,7 +42,7 @@ from django.utils.safestring import mark_safe
 from django.utils.translation import get_language, gettext as _
 from PIL import Image, UnidentifiedImageError
 
-from codenerix.helpers import get_class
+from codenerix.helpers import get_view_class
 
 
 def _is_image_file(path):
@@ -126,8 +126,7 @@ class StaticSelectMulti(forms.widgets.SelectMultiple):
             # Get access to the get_label() method and request for the
             # label of the bound input
             if value:
-                func = resolve(vurl + "*").func
-                clss = get_class(func)
+                clss = get_view_class(vurl + "*")
                 if clss and self.__language:
                     clss.language = self.__language  # pyright: ignore[reportAttributeAccessIssue]
                 # label = clss().get_label(value)
@@ -523,8 +522,7 @@ class DynamicSelect(DynamicSelectInputWidget, forms.widgets.Select):
         # Get access to the get_label() method and request for the label of
         # the bound input
         if value:
-            func = resolve(vurl + "*").func
-            clss = get_class(func)
+            clss = get_view_class(vurl + "*")
             if clss:
                 if self.language:
                     clss.language = self.language  # pyright: ignore[reportAttributeAccessIssue]